@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Backend Benchmark - Insert, cancel and fire throughput of the timer queues.
+
+For each backend, delay distribution and timer count, schedules that many
+timers, cancels half of them and fires the rest, timing each phase on the
+timer queue alone (no scheduler thread or locking). Time is simulated: the
+fire phase steps a virtual clock from one next_fire_time() to the next, the
+way the scheduler thread wakes up.
+
+Distributions:
+- ladder: the default escalation ladder, 60s and 3600s per escalation
+- uniform: delays uniform in [1s, 2h]
+- short: delays uniform in [0.1s, 10s]
+
+Usage:
+    python3 bench_backends.py [--counts 1000,10000,100000] [--backends heap,wheel]
+                              [--distributions ladder,uniform,short]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Service modules are plain top-level modules (the service runs as a script)
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "service"))
+
+from escalation_timers import CANCELLED, SCHEDULER_BACKENDS, ScheduledEvent
+
+START = 1_700_000_000.0  # Virtual clock origin
+
+DISTRIBUTIONS = {
+    "ladder": lambda rng, i: (60, 3600)[i % 2],
+    "uniform": lambda rng, i: rng.uniform(1, 7200),
+    "short": lambda rng, i: rng.uniform(0.1, 10),
+}
+
+
+def rate(count: int, start: float) -> float:
+    """Operations per second since start."""
+    return count / (time.perf_counter() - start)
+
+
+def bench(backend: str, distribution: str, count: int, seed: int = 0) -> dict:
+    """Insert, cancel and fire throughput for one configuration."""
+    rng = random.Random(seed)
+    delay_of = DISTRIBUTIONS[distribution]
+    events = [
+        ScheduledEvent(fire_time=START + delay_of(rng, i), escalation_id=f"id-{i}", message="", priority=0)
+        for i in range(count)
+    ]
+    cancelled = rng.sample(events, count // 2)
+    queue = SCHEDULER_BACKENDS[backend](START)
+
+    start = time.perf_counter()
+    for event in events:
+        queue.push(event)
+    insert = rate(count, start)
+
+    start = time.perf_counter()
+    for event in cancelled:
+        event.state = CANCELLED
+        queue.discard(event)
+    cancel = rate(len(cancelled), start)
+
+    fired = 0
+    wakeups = 0
+    start = time.perf_counter()
+    while True:
+        now = queue.next_fire_time()
+        if now is None:
+            break
+        wakeups += 1
+        while queue.pop_due(now) is not None:
+            fired += 1
+    fire = rate(fired, start)
+    assert fired == count - len(cancelled), f"{backend} fired {fired} of {count - len(cancelled)}"
+    return {"insert": insert, "cancel": cancel, "fire": fire, "wakeups": wakeups}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare timer queue backends")
+    parser.add_argument(
+        "--counts",
+        type=lambda s: [int(x) for x in s.split(",")],
+        default=[1000, 10000, 100000],
+        help="Comma-separated timer counts (default: 1000,10000,100000)",
+    )
+    parser.add_argument(
+        "--backends",
+        type=lambda s: s.split(","),
+        default=sorted(SCHEDULER_BACKENDS),
+        help="Comma-separated backends (default: all)",
+    )
+    parser.add_argument(
+        "--distributions",
+        type=lambda s: s.split(","),
+        default=list(DISTRIBUTIONS),
+        help="Comma-separated delay distributions (default: ladder,uniform,short)",
+    )
+    args = parser.parse_args()
+
+    print(f"{'distribution':<12} {'timers':>8} {'backend':<7} {'insert/s':>11} {'cancel/s':>11} {'fire/s':>11} {'wakeups':>8}")
+    for distribution in args.distributions:
+        for count in args.counts:
+            for backend in args.backends:
+                r = bench(backend, distribution, count)
+                print(
+                    f"{distribution:<12} {count:>8} {backend:<7} {r['insert']:>11,.0f} "
+                    f"{r['cancel']:>11,.0f} {r['fire']:>11,.0f} {r['wakeups']:>8}"
+                )
+
+
+if __name__ == "__main__":
+    main()
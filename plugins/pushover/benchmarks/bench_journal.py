@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Journal Benchmark - Startup replay cost of the escalation journal.
+
+Writes N journal records (adds, fires and cancels over a rotating set of
+escalation IDs) through EscalationJournal, then times load(), which is what
+the service runs at startup before restoring timers. Replaying 100k records
+should take well under a second.
+
+Usage:
+    python3 bench_journal.py [--records 10000,100000,1000000] [--ids 1000]
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Service modules are plain top-level modules (the service runs as a script)
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "service"))
+
+from escalation_journal import EscalationJournal
+
+
+def bench(records: int, ids: int) -> dict:
+    """Write records journal entries over ids escalations, then time replay."""
+    logger = logging.getLogger("bench")
+    with tempfile.TemporaryDirectory() as tmp:
+        path, snapshot = Path(tmp) / "bench.journal", Path(tmp) / "bench.snapshot"
+        journal = EscalationJournal(path, snapshot, logger, snapshot_records=records + 1)
+        now = time.time()
+        start = time.perf_counter()
+        for i in range(records):
+            escalation_id = f"session-{i % ids}"
+            if i % 10 == 9:
+                journal.record("cancel", escalation_id, [])
+            else:
+                events = [[now + 60, 0, 60, "Waiting for input"], [now + 3600, 1, 3600, "Waiting for input"]]
+                journal.record("add" if i % 2 else "fire", escalation_id, events[i % 2:])
+        write = time.perf_counter() - start
+        journal.close()
+
+        size = path.stat().st_size
+        journal = EscalationJournal(path, snapshot, logger)
+        start = time.perf_counter()
+        state = journal.load()
+        replay = time.perf_counter() - start
+        journal.close()
+    return {"records": records, "size": size, "write": write, "replay": replay, "pending": len(state)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark escalation journal replay")
+    parser.add_argument(
+        "--records",
+        type=lambda s: [int(x) for x in s.split(",")],
+        default=[10000, 100000, 1000000],
+        help="Comma-separated journal lengths (default: 10000,100000,1000000)",
+    )
+    parser.add_argument("--ids", type=int, default=1000, help="Distinct escalation IDs (default: 1000)")
+    args = parser.parse_args()
+
+    print(f"{'records':>10} {'size KB':>9} {'write us':>9} {'replay ms':>10} {'pending':>8}")
+    for n in args.records:
+        r = bench(n, args.ids)
+        print(
+            f"{r['records']:>10} {r['size'] / 1024:>9.0f} {r['write'] / n * 1e6:>9.2f} "
+            f"{r['replay'] * 1000:>10.1f} {r['pending']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
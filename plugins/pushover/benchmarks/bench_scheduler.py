@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Scheduler Benchmark - Per-operation cost of EscalationScheduler bookkeeping.
+
+Fills the scheduler with N pending escalations, then times add, cancel,
+fire and single-ID status operations against that backlog. With O(1)/O(log n)
+bookkeeping the per-operation cost should stay flat as N grows.
+
+The scheduler thread is stopped first and events are fired by calling
+_pop_due() directly, so the numbers measure bookkeeping rather than sleeps
+or notification delivery.
+
+Usage:
+    python3 bench_scheduler.py [--sizes 10,1000,100000,1000000] [--ops 2000] [--backend heap|wheel]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Service modules are plain top-level modules (the service runs as a script)
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "service"))
+
+from escalation_service import EscalationScheduler
+from escalation_timers import SCHEDULER_BACKENDS
+
+
+def per_op_us(start: float, ops: int) -> float:
+    """Microseconds per operation since start."""
+    return (time.perf_counter() - start) / ops * 1e6
+
+
+def bench(size: int, ops: int, backend: str = "heap") -> dict:
+    """Time each operation against a backlog of size pending escalations."""
+    scheduler = EscalationScheduler(lambda *_: None, lambda *_: None, backend=backend)
+    scheduler.shutdown()  # Drive the scheduler from this thread only
+
+    scheduler.batch([("add", f"backlog-{i}", "pending", [60, 3600]) for i in range(size)])
+    results = {"size": size}
+
+    start = time.perf_counter()
+    for i in range(ops):
+        scheduler.add(f"new-{i}", "message", [60, 3600])
+    results["add"] = per_op_us(start, ops)
+
+    start = time.perf_counter()
+    for i in range(ops):
+        scheduler.status(f"backlog-{i % size}")
+    results["status"] = per_op_us(start, ops)
+
+    start = time.perf_counter()
+    for i in range(ops):
+        scheduler.cancel(f"new-{i}")
+    results["cancel"] = per_op_us(start, ops)
+
+    # Due events sit at the top of the heap, above the whole backlog
+    for i in range(ops):
+        scheduler.add(f"due-{i}", "message", [0])
+    now = time.time() + 1
+    start = time.perf_counter()
+    with scheduler.lock:
+        for _ in range(ops):
+            scheduler._pop_due(now)
+    results["fire"] = per_op_us(start, ops)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark EscalationScheduler bookkeeping")
+    parser.add_argument(
+        "--sizes",
+        type=lambda s: [int(x) for x in s.split(",")],
+        default=[10, 1000, 100000, 1000000],
+        help="Comma-separated backlog sizes (default: 10,1000,100000,1000000)",
+    )
+    parser.add_argument("--ops", type=int, default=2000, help="Operations timed per size (default: 2000)")
+    parser.add_argument("--backend", choices=sorted(SCHEDULER_BACKENDS), default="heap", help="Timer queue backend")
+    args = parser.parse_args()
+
+    print(f"{'pending':>10} {'add us':>9} {'cancel us':>10} {'fire us':>9} {'status us':>10}")
+    for size in args.sizes:
+        r = bench(size, args.ops, args.backend)
+        print(f"{r['size']:>10} {r['add']:>9.2f} {r['cancel']:>10.2f} {r['fire']:>9.2f} {r['status']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
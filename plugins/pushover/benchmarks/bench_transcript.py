@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Transcript Benchmark - Finding the last assistant text in a long transcript.
+
+Writes a synthetic transcript of the given size (user prompts, assistant
+text, tool calls and large tool results, with a multi-MB tool result near
+the end) and compares the Stop hook's old approach, parsing every line from
+the start, with the reverse tail reader, and with the service's incremental
+index answering after one more turn was appended. Peak memory is measured
+with tracemalloc.
+
+Usage:
+    python3 bench_transcript.py [--sizes 10,100] [--huge-line-mb 4]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Service modules are plain top-level modules (the service runs as a script)
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "service"))
+
+from escalation_transcript import TranscriptIndex, assistant_text, last_assistant_text
+
+
+def entry(role: str, content: list) -> str:
+    return json.dumps({"type": role, "message": {"role": role, "content": content}}) + "\n"
+
+
+def write_transcript(path: Path, size_mb: int, huge_line_mb: int) -> None:
+    """A transcript of about size_mb, ending in text, a huge tool result, then a tool call."""
+    result = "x" * 20000
+    with open(path, "w", encoding="utf-8") as f:
+        i = 0
+        while f.tell() < size_mb * 1024 * 1024:
+            f.write(entry("user", [{"type": "text", "text": f"Prompt {i}"}]))
+            f.write(entry("assistant", [{"type": "text", "text": f"Working on step {i}"}]))
+            f.write(entry("assistant", [{"type": "tool_use", "name": "Read", "input": {"file": f"f{i}.py"}}]))
+            f.write(entry("user", [{"type": "tool_result", "content": result}]))
+            i += 1
+        f.write(entry("assistant", [{"type": "text", "text": "All done: final summary"}]))
+        f.write(entry("user", [{"type": "tool_result", "content": "y" * (huge_line_mb * 1024 * 1024)}]))
+        f.write(entry("assistant", [{"type": "tool_use", "name": "Bash", "input": {"command": "true"}}]))
+
+
+def forward_scan(path: Path) -> str:
+    """The previous implementation: json.loads every line from the start."""
+    last_text = ""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                last_text = assistant_text(json.loads(line)) or last_text
+            except json.JSONDecodeError:
+                continue
+    return last_text
+
+
+def measure(fn, path: Path) -> tuple[str, float, float]:
+    """(result, seconds, peak MB) of fn(path)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(path)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Stop hook transcript reader")
+    parser.add_argument(
+        "--sizes",
+        type=lambda s: [int(x) for x in s.split(",")],
+        default=[10, 100],
+        help="Comma-separated transcript sizes in MB (default: 10,100)",
+    )
+    parser.add_argument("--huge-line-mb", type=int, default=4, help="Size of the tool result near the end (default: 4)")
+    args = parser.parse_args()
+
+    print(f"{'size MB':>8} {'forward ms':>11} {'peak MB':>8} {'tail ms':>8} {'peak MB':>8} {'index ms':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = Path(tmp) / f"transcript-{size}.jsonl"
+            write_transcript(path, size, args.huge_line_mb)
+            expected, forward, forward_peak = measure(forward_scan, path)
+            found, tail, tail_peak = measure(last_assistant_text, path)
+            assert found == expected, (found, expected)
+
+            # The service indexed the transcript earlier; one more turn arrives before Stop
+            index = TranscriptIndex(path)
+            index.update()
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(entry("user", [{"type": "tool_result", "content": "z" * 20000}]))
+                f.write(entry("assistant", [{"type": "text", "text": "One more thing"}]))
+            start = time.perf_counter()
+            assert index.update()["text"] == "One more thing"
+            incremental = time.perf_counter() - start
+            print(
+                f"{size:>8} {forward * 1000:>11.1f} {forward_peak:>8.1f} {tail * 1000:>8.1f} {tail_peak:>8.1f} "
+                f"{incremental * 1000:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
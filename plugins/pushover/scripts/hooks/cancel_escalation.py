@@ -26,7 +26,7 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from service import cancel_escalation, get_client
+from service import cancel_escalation, get_client, hook_deadline
 
 
 def main():
@@ -37,6 +37,9 @@ def main():
     except json.JSONDecodeError:
         hook_input = {}
 
+    # Bound every service call by the hook's own timeout (--timeout in hooks.json)
+    get_client().deadline = hook_deadline(5)
+
     session_id = hook_input.get("session_id", "")
     hook_event = hook_input.get("hook_event_name", "")
 
@@ -44,6 +47,11 @@ def main():
         return
 
     client = get_client()
+
+    # Common case: the status page shows nothing pending, so skip the socket
+    if client.has_pending(session_id) is False:
+        return
+
     if not client.is_running():
         return
 
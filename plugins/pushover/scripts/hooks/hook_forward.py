@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Hook Forwarder - Minimal entry point that hands a hook event to the service.
+
+The escalation service handles the event itself (see the "hook" command in
+escalation_service.py), so this script only streams stdin and the event name
+to the socket. Run it with `python3 -S` and it imports nothing beyond the
+builtin _socket, posix and time modules, which keeps interpreter startup to a
+minimum on every tool call.
+
+Usage (hooks.json):
+    python3 -S hook_forward.py <HookEventName> [--timeout SECONDS]
+
+Connect, send and receive share one deadline derived from the hook timeout,
+and a failed connect is never retried.
+
+If the service is not running there is nothing to cancel, so the event is
+dropped silently. For cancel-only events the shared status page (see
+escalation_status.py) is consulted first, and the socket is skipped when it
+shows nothing pending for the session.
+"""
+
+import _socket
+import posix
+import sys
+import time
+
+RUN_DIR = posix.environ.get(b"HOME", b"").decode() + "/.claude/run"
+SOCKET_PATH = RUN_DIR + "/escalation.sock"
+STATUS_PAGE = RUN_DIR + "/escalation.status"
+TIMEOUT = 5.0  # Default hook timeout when --timeout is not given
+TIMEOUT_SHARE = 0.8  # Fraction of the hook timeout spent on the service
+CHUNK_SIZE = 1024 * 1024  # Service frame limit; larger payloads go as chunk frames
+MORE = 0x80000000
+
+# Keep in sync with CANCEL_HOOK_EVENTS in escalation_service.py
+CANCEL_EVENTS = {"PreToolUse", "PostToolUse", "PermissionRequest", "UserPromptSubmit", "PreCompact", "Stop"}
+
+# Status page layout, see escalation_status.py
+PAGE_MAGIC = b"ESCS"
+PAGE_HEADER = 24
+BITMAP_BITS = 8192
+
+
+def session_id_of(payload: bytes) -> str | None:
+    """Find the session_id string in raw hook JSON without a JSON parser."""
+    key = payload.find(b'"session_id"')
+    if key < 0:
+        return None
+    start = payload.find(b'"', payload.find(b":", key + 12) + 1)
+    end = payload.find(b'"', start + 1)
+    value = payload[start + 1:end]
+    if start < 0 or end < 0 or b"\\" in value:
+        return None
+    return value.decode()
+
+
+def nothing_pending(session_id: str) -> bool:
+    """True if the status page proves the session has nothing to cancel."""
+    try:
+        fd = posix.open(STATUS_PAGE, posix.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        page = posix.read(fd, PAGE_HEADER + BITMAP_BITS // 8)
+        if len(page) < PAGE_HEADER + BITMAP_BITS // 8 or page[:4] != PAGE_MAGIC:
+            return False
+        generation = page[8:16]
+        if generation[-1] & 1 or posix.pread(fd, 8, 8) != generation:
+            return False  # Page being updated: ask the service
+        if not page[7] & 1:
+            return True  # Service stopped cleanly
+        try:
+            posix.kill(int.from_bytes(page[16:20], "big"), 0)
+        except PermissionError:
+            pass
+        except OSError:
+            return True  # Service died
+        h = 0x811C9DC5
+        for byte in session_id.encode():
+            h = ((h ^ byte) * 0x01000193) & 0xFFFFFFFF
+        byte, bit = divmod(h % BITMAP_BITS, 8)
+        return not page[PAGE_HEADER + byte] & (1 << bit)
+    finally:
+        posix.close(fd)
+
+
+def hook_timeout(argv: list) -> float:
+    """The hook's --timeout argument, or TIMEOUT."""
+    if "--timeout" in argv:
+        try:
+            return float(argv[argv.index("--timeout") + 1])
+        except (IndexError, ValueError):
+            pass
+    return TIMEOUT
+
+
+def remaining(expires_at: float) -> float:
+    """Seconds left before the deadline; raises TimeoutError once it passed."""
+    left = expires_at - time.monotonic()
+    if left <= 0:
+        raise TimeoutError("deadline expired")
+    return left
+
+
+def main():
+    event = sys.argv[1] if len(sys.argv) > 1 else ""
+    if not event.isalnum():
+        return
+    expires_at = time.monotonic() + hook_timeout(sys.argv) * TIMEOUT_SHARE
+
+    payload = sys.stdin.buffer.read().strip() or b"null"
+    if event in CANCEL_EVENTS:
+        session_id = session_id_of(payload)
+        if session_id is not None and nothing_pending(session_id):
+            return
+
+    body = b'{"command": "hook", "event": "' + event.encode() + b'", "payload": ' + payload + b"}"
+
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.settimeout(remaining(expires_at))
+        sock.connect(SOCKET_PATH)
+        view = memoryview(body)
+        while len(view) > CHUNK_SIZE:
+            sock.settimeout(remaining(expires_at))
+            sock.sendall((CHUNK_SIZE | MORE).to_bytes(4, "big"))
+            sock.sendall(view[:CHUNK_SIZE])
+            view = view[CHUNK_SIZE:]
+        sock.settimeout(remaining(expires_at))
+        sock.sendall(len(view).to_bytes(4, "big") + view)
+        # Wait for the response so the event is applied before the hook exits
+        sock.settimeout(remaining(expires_at))
+        sock.recv(4)
+    except OSError:
+        pass
+    finally:
+        sock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -27,7 +27,7 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from service import add_escalation, start_service
+from service import add_escalation, get_client, hook_deadline, start_service
 
 
 # Escalation delays in seconds
@@ -42,6 +42,9 @@ def main():
     except json.JSONDecodeError:
         hook_input = {}
 
+    # Bound every service call by the hook's own timeout (--timeout in hooks.json)
+    get_client().deadline = hook_deadline(15)
+
     notification_type = hook_input.get("notification_type", "")
 
     # Only handle permission_prompt notifications
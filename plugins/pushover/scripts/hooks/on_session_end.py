@@ -16,7 +16,7 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from service import unregister_session, get_client
+from service import forget_session_pid, get_client, hook_deadline, unregister_session
 
 
 def main():
@@ -27,8 +27,12 @@ def main():
     except json.JSONDecodeError:
         hook_input = {}
 
+    # Bound every service call by the hook's own timeout (--timeout in hooks.json)
+    get_client().deadline = hook_deadline(15)
+
     session_id = hook_input.get("session_id", "")
     client = get_client()
+    forget_session_pid(session_id)
 
     # Unregister session (service will shutdown if this was the last session)
     if client.is_running():
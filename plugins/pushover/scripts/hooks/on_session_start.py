@@ -5,52 +5,19 @@ Claude Code SessionStart Hook - Start escalation service and register session.
 Receives via stdin:
 {
   "session_id": "...",
+  "transcript_path": "~/.claude/projects/.../conversation.jsonl",
   "hook_event_name": "SessionStart"
 }
 """
 
 import json
-import os
-import subprocess
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports (~/bin when deployed)
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from service import start_service, register_session
-
-
-def get_claude_pid() -> int | None:
-    """Walk up process tree to find Claude Code's PID."""
-    pid = os.getppid()
-    visited = set()
-
-    while pid > 1 and pid not in visited:
-        visited.add(pid)
-        try:
-            result = subprocess.run(
-                ["ps", "-p", str(pid), "-o", "comm=,ppid="],
-                capture_output=True, text=True
-            )
-            if result.returncode != 0:
-                break
-
-            parts = result.stdout.strip().split()
-            if len(parts) < 2:
-                break
-
-            comm = parts[0].lower()
-            ppid = int(parts[1])
-
-            if "claude" in comm:
-                return pid
-
-            pid = ppid
-        except (subprocess.CalledProcessError, ValueError):
-            break
-
-    return os.getppid()  # Fallback to direct parent
+from service import get_client, hook_deadline, register_session, resolve_session_pid, start_service
 
 
 def main():
@@ -61,13 +28,20 @@ def main():
     except json.JSONDecodeError:
         hook_input = {}
 
+    # Bound every service call by the hook's own timeout (--timeout in hooks.json)
+    get_client().deadline = hook_deadline(15)
+
     session_id = hook_input.get("session_id", "")
-    claude_pid = get_claude_pid()
+    # Walks up to the Claude process via /proc; cached for the session's later hooks
+    claude_pid = resolve_session_pid(session_id)
 
     # Start the escalation service if not running
     if start_service():
-        # Register this session with PID for tracking
-        result = register_session(session_id=session_id, pid=claude_pid)
+        # Register this session with PID for tracking; the service starts
+        # indexing its transcript for the Stop hook's summaries
+        result = register_session(
+            session_id=session_id, pid=claude_pid, transcript_path=hook_input.get("transcript_path")
+        )
         if result and result.get("status") == "ok":
             count = result.get("session_count", 1)
             print(f"Session registered (pid={claude_pid}, count={count})", file=sys.stderr)
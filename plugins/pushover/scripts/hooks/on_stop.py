@@ -3,7 +3,13 @@
 Claude Code Stop Hook - Task Completion Notification
 
 Sends a low-priority Pushover notification when Claude finishes a task.
-Extracts a summary from the conversation transcript.
+Extracts a summary from the conversation transcript: the service's
+incremental index parses only what was appended since the last Stop; without
+the service the transcript is read backwards from its end. The notification goes
+through the escalation service when it is running, so it is coalesced with
+other sessions' and paced against the Pushover message budget; otherwise it
+is sent directly, and if that fails with a retryable error it is left in
+the service's outbox to be retried.
 Also cancels any pending escalation timers (handles permission rejection case).
 
 Receives via stdin:
@@ -16,38 +22,35 @@ Receives via stdin:
 """
 
 import json
-import subprocess
 import sys
 from pathlib import Path
 
-# Add parent directory to path for imports
+# Add parent directory to path for imports, and po_notify (tools/pushover-notify)
 sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from service import cancel_escalation, get_client
-
-
-def get_last_assistant_text(transcript_path: str, max_words: int = 100) -> str:
-    """Extract the last assistant text message from the transcript."""
-    path = Path(transcript_path).expanduser()
-    if not path.exists():
-        return "Task completed"
-
-    last_text = ""
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                try:
-                    entry = json.loads(line.strip())
-                    msg = entry.get("message", {})
-                    if msg.get("role") == "assistant":
-                        content = msg.get("content", [])
-                        for block in content:
-                            if isinstance(block, dict) and block.get("type") == "text":
-                                last_text = block.get("text", "")
-                except json.JSONDecodeError:
-                    continue
-    except Exception:
-        return "Task completed"
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools" / "pushover-notify"))
+
+from po_notify import BREAKER_STATE, CircuitBreaker, PushoverClient, PushoverError
+from service import append_outbox, cancel_escalation, get_client, hook_deadline, last_assistant_text, outbox_path
+
+
+def get_last_assistant_text(transcript_path: str, max_words: int = 100, session_id: str = "") -> str:
+    """Extract the last assistant text message from the transcript.
+
+    Asks the service's transcript index first; otherwise the transcript is
+    read backwards from its end. Either way the cost does not grow with the
+    length of the session.
+    """
+    last_text = None
+    client = get_client()
+    if session_id and client.is_running():
+        result = client.transcript_summary(session_id, transcript_path)
+        if result and result.get("status") == "ok":
+            last_text = result.get("text", "")
+    if last_text is None:
+        try:
+            last_text = last_assistant_text(Path(transcript_path).expanduser())
+        except Exception:
+            return "Task completed"
 
     if not last_text:
         return "Task completed"
@@ -59,24 +62,26 @@ def get_last_assistant_text(transcript_path: str, max_words: int = 100) -> str:
     return last_text
 
 
-def send_notification(title: str, message: str, priority: int = -1) -> None:
-    """Send notification via po_notify."""
-    # Use plugin-relative path (tools/pushover-notify/po_notify.py)
-    plugin_root = Path(__file__).parent.parent.parent
-    po_notify = plugin_root / "tools" / "pushover-notify" / "po_notify.py"
-
+def send_notification(title: str, message: str, priority: int = -1, session_id: str = "") -> None:
+    """Hand the notification to the service, or send it in-process via po_notify."""
+    client = get_client()
+    if client.is_running():
+        result = client.notify(title, message, priority=priority, session_id=session_id)
+        if result and result.get("status") == "ok":
+            return
     try:
-        # po_notify uses: title message --priority N
-        subprocess.run(
-            [str(po_notify), title, message, "--priority", str(priority)],
-            check=True,
-            capture_output=True,
-            timeout=10,
+        # Shares the service's circuit breaker: fails fast while Pushover is unreachable
+        PushoverClient(pool_size=0, breaker=CircuitBreaker(state_path=BREAKER_STATE)).send(
+            title, message, priority=priority
         )
-    except subprocess.CalledProcessError as e:
-        print(f"Notification failed: {e.stderr.decode()}", file=sys.stderr)
-    except FileNotFoundError:
-        print("po_notify not found. Install pushover-notify first.", file=sys.stderr)
+    except PushoverError as e:
+        print(f"Notification failed: {e}", file=sys.stderr)
+        if e.retryable:
+            try:
+                append_outbox(outbox_path(client.socket_path), session_id or "stop", title, message, priority, error=str(e))
+                client.poke_outbox()  # A running service reads it now; otherwise at its next start
+            except OSError as oe:
+                print(f"Could not queue notification for retry: {oe}", file=sys.stderr)
     except Exception as e:
         print(f"Notification error: {e}", file=sys.stderr)
 
@@ -93,11 +98,14 @@ def main():
     except json.JSONDecodeError:
         hook_input = {}
 
+    # Bound every service call by the hook's own timeout (--timeout in hooks.json)
+    get_client().deadline = hook_deadline(30)
+
     # Cancel any pending escalation (handles permission rejection case)
     session_id = hook_input.get("session_id", "")
     if session_id:
         client = get_client()
-        if client.is_running():
+        if client.has_pending(session_id) is not False and client.is_running():
             result = cancel_escalation(session_id)
             if result and result.get("cancelled"):
                 print(f"Cancelled escalation on Stop", file=sys.stderr)
@@ -106,12 +114,12 @@ def main():
 
     # Extract summary from transcript
     if transcript_path:
-        summary = get_last_assistant_text(transcript_path)
+        summary = get_last_assistant_text(transcript_path, session_id=session_id)
     else:
         summary = "Task completed"
 
     # Send low-priority notification
-    send_notification("Claude Done", summary, priority=-1)
+    send_notification("Claude Done", summary, priority=-1, session_id=session_id)
 
 
 if __name__ == "__main__":
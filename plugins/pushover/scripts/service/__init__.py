@@ -1,25 +1,46 @@
 """Escalation service package."""
 
+from .escalation_ancestry import find_claude_pid, forget_session_pid, resolve_session_pid
 from .escalation_client import (
+    Deadline,
     EscalationClient,
+    EscalationConnection,
     add_escalation,
+    batch,
     cancel_escalation,
     get_client,
     get_status,
+    hook_deadline,
+    notify,
     register_session,
     shutdown_service,
     start_service,
+    transcript_summary,
     unregister_session,
 )
+from .escalation_outbox import append_outbox, outbox_path
+from .escalation_transcript import last_assistant_text
 
 __all__ = [
+    "Deadline",
     "EscalationClient",
+    "EscalationConnection",
     "add_escalation",
+    "append_outbox",
+    "batch",
     "cancel_escalation",
+    "find_claude_pid",
+    "forget_session_pid",
     "get_client",
     "get_status",
+    "hook_deadline",
+    "last_assistant_text",
+    "notify",
+    "outbox_path",
     "register_session",
+    "resolve_session_pid",
     "shutdown_service",
     "start_service",
+    "transcript_summary",
     "unregister_session",
 ]
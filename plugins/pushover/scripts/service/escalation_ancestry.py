@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Escalation Ancestry - Find the Claude Code process a hook runs under.
+
+Hooks run a few levels below Claude Code (claude -> sh -> python3, or
+deeper under tmux and wrapper shells). The service tracks sessions by the
+PID of that Claude process, so SessionStart walks up the process tree
+until a process named "claude" appears.
+
+Each step of the walk reads /proc/<pid>/stat; where there is no /proc
+(macOS) psutil is used if installed, otherwise one `ps -A` call lists the
+whole process table up front. No process is spawned per level.
+
+The resolved PID is cached per session id in ~/.claude/run/sessions, along
+with the process start time, so SessionStart firing again for the same
+session (on resume or after a compaction) skips the walk, and a recycled
+PID is never mistaken for the session's.
+"""
+
+import os
+import re
+import subprocess
+from pathlib import Path
+from typing import Callable, Optional
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+PROC = "/proc"
+CLAUDE_PROCESS = "claude"  # Substring of the Claude Code process name
+SESSION_PID_DIR = Path("~/.claude/run/sessions").expanduser()
+
+# One entry of the process table: (name, parent pid, start time or "" if unknown)
+ProcessEntry = tuple[str, int, str]
+
+
+def _proc_entry(pid: int) -> Optional[ProcessEntry]:
+    try:
+        with open(f"{PROC}/{pid}/stat", "rb") as f:
+            stat = f.read()
+        # The name is in parentheses and may itself contain spaces and parentheses
+        name = stat[stat.index(b"(") + 1:stat.rindex(b")")].decode("utf-8", "replace")
+        fields = stat[stat.rindex(b")") + 2:].split()
+        return name, int(fields[1]), fields[19].decode()
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _psutil_entry(pid: int) -> Optional[ProcessEntry]:
+    try:
+        proc = psutil.Process(pid)
+        with proc.oneshot():
+            return proc.name(), proc.ppid(), f"{proc.create_time():.2f}"
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return None
+
+
+def _ps_table() -> dict[int, ProcessEntry]:
+    """The whole process table from a single ps call (start times unknown)."""
+    try:
+        result = subprocess.run(
+            ["ps", "-A", "-o", "pid=,ppid=,comm="], capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return {}
+    table = {}
+    for line in result.stdout.splitlines():
+        parts = line.split(None, 2)
+        if len(parts) == 3 and parts[0].isdigit() and parts[1].isdigit():
+            # comm may be a full executable path (macOS)
+            table[int(parts[0])] = (os.path.basename(parts[2].strip()), int(parts[1]), "")
+    return table
+
+
+def process_lookup() -> Callable[[int], Optional[ProcessEntry]]:
+    """The cheapest way to read process entries on this platform."""
+    if os.path.isdir(f"{PROC}/self"):
+        return _proc_entry
+    if HAS_PSUTIL:
+        return _psutil_entry
+    return _ps_table().get
+
+
+def find_claude_pid(
+    pid: Optional[int] = None, lookup: Optional[Callable[[int], Optional[ProcessEntry]]] = None
+) -> int:
+    """Walk up from pid (default: this process's parent) to the Claude Code process.
+
+    Falls back to the direct parent if no ancestor is named like Claude.
+    """
+    lookup = lookup or process_lookup()
+    pid = os.getppid() if pid is None else pid
+    visited = set()
+    while pid > 1 and pid not in visited:
+        visited.add(pid)
+        entry = lookup(pid)
+        if entry is None:
+            break
+        name, ppid, _ = entry
+        if CLAUDE_PROCESS in name.lower():
+            return pid
+        pid = ppid
+    return os.getppid()
+
+
+def session_pid_path(session_id: str) -> Path:
+    """Cache file of a session's resolved PID."""
+    return SESSION_PID_DIR / (re.sub(r"[^A-Za-z0-9_.-]", "_", session_id) + ".pid")
+
+
+def _cached_session_pid(session_id: str) -> Optional[int]:
+    """The cached Claude PID of a session, if that process is still the one running."""
+    try:
+        pid_text, _, start = session_pid_path(session_id).read_text().partition(" ")
+        pid = int(pid_text)
+    except (OSError, ValueError):
+        return None
+    start = start.strip()
+    if start:
+        entry = process_lookup()(pid)
+        return pid if entry is not None and entry[2] == start else None
+    try:
+        os.kill(pid, 0)
+        return pid
+    except OSError:
+        return None
+
+
+def resolve_session_pid(session_id: str) -> int:
+    """The Claude PID of a session: from the cache, or found by walking and then cached."""
+    if session_id:
+        pid = _cached_session_pid(session_id)
+        if pid is not None:
+            return pid
+    lookup = process_lookup()
+    pid = find_claude_pid(lookup=lookup)
+    if session_id:
+        entry = lookup(pid)
+        path = session_pid_path(session_id)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(f"{pid} {entry[2] if entry else ''}")
+            os.replace(tmp, path)
+        except OSError:
+            pass  # Uncached: the next hook walks again
+    return pid
+
+
+def forget_session_pid(session_id: str) -> None:
+    """Drop a session's cached PID (at SessionEnd)."""
+    if not session_id:
+        return
+    try:
+        session_pid_path(session_id).unlink()
+    except OSError:
+        pass
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Escalation Budget - Pacing deliveries against the Pushover message limit.
+
+Pushover limits each application to a number of messages per month and
+reports what is left in X-Limit-App-Limit/-Remaining/-Reset headers on every
+response. MessageBudget learns from those headers and decides, per
+notification, whether to send it now, later or not at all:
+
+- The remaining messages are spread evenly until the reset time: a token
+  bucket refills at (remaining - reserve) / (seconds until reset) and holds
+  up to BUDGET_BURST tokens. Every send takes a token.
+- Low-priority notifications (priority below 0, e.g. "Claude Done") are
+  deferred while the bucket is empty, so a burst of them waits (and is
+  coalesced by the delivery queue) instead of eating into the month.
+- Once remaining falls to the reserve, only emergency (priority 2)
+  notifications are sent; the rest are dropped. Emergencies are never held
+  back.
+
+Until a response has reported the limit, everything is sent. The last known
+budget is kept in a small JSON file next to the socket, so a restarted
+service does not start blind.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from po_notify import RateLimit
+
+SEND = "send"
+DEFER = "defer"
+DROP = "drop"
+
+BUDGET_BURST = 20  # Tokens the bucket holds: sends allowed back to back
+BUDGET_RESERVE_SHARE = 0.05  # Share of the monthly limit kept for emergencies
+BUDGET_RESERVE_MIN = 25
+MAX_DEFER = 900  # Re-check deferred notifications at least this often (seconds)
+EMERGENCY_PRIORITY = 2
+
+
+def budget_path(socket_path: Path) -> Path:
+    """Budget file location for a service socket."""
+    return socket_path.with_name(socket_path.stem + ".budget")
+
+
+class MessageBudget:
+    """Token bucket over the application's remaining monthly messages. Thread-safe."""
+
+    def __init__(self, path: Optional[Path] = None, burst: int = BUDGET_BURST):
+        self.path = path
+        self.burst = burst
+        self.limit: Optional[int] = None
+        self.remaining = 0
+        self.reset = 0.0
+        self.tokens = float(burst)
+        self.refilled_at = time.monotonic()
+        self.deferred = 0
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if self.path is None:
+            return
+        try:
+            state = json.loads(self.path.read_text())
+            self._apply(RateLimit(int(state["limit"]), int(state["remaining"]), float(state["reset"])))
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def _save(self) -> None:
+        """Write the budget atomically (lock held)."""
+        if self.path is None or self.limit is None:
+            return
+        # escalation.budget.tmp: other runtime files next to it have their own temp files
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            tmp.write_text(json.dumps({"limit": self.limit, "remaining": self.remaining, "reset": self.reset}))
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def _apply(self, rate_limit: RateLimit) -> None:
+        self.limit = rate_limit.limit
+        self.remaining = rate_limit.remaining
+        self.reset = rate_limit.reset
+
+    @property
+    def reserve(self) -> int:
+        """Messages held back for emergencies."""
+        if self.limit is None:
+            return 0
+        return max(BUDGET_RESERVE_MIN, int(self.limit * BUDGET_RESERVE_SHARE))
+
+    def _rollover(self, now: float) -> None:
+        """Assume a full budget once the reset time has passed (lock held)."""
+        if self.limit is not None and now >= self.reset:
+            self.remaining = self.limit
+            self.reset = 0.0  # Unknown until the next response
+
+    def _rate(self, now: float) -> float:
+        """Fair refill rate in tokens per second (lock held)."""
+        spendable = self.remaining - self.reserve
+        if spendable <= 0:
+            return 0.0
+        if self.reset <= now:
+            return float("inf")
+        return spendable / (self.reset - now)
+
+    def _refill(self, now: float) -> float:
+        """Add the tokens earned since the last refill; returns the rate (lock held)."""
+        rate = self._rate(now)
+        elapsed = time.monotonic() - self.refilled_at
+        self.refilled_at += elapsed
+        self.tokens = min(self.burst, self.tokens + rate * elapsed) if rate != float("inf") else self.burst
+        return rate
+
+    def admit(self, priority: int) -> tuple[str, float]:
+        """Decide on a notification: (SEND, 0), (DEFER, seconds) or (DROP, 0).
+
+        SEND takes a message from the budget.
+        """
+        now = time.time()
+        with self.lock:
+            if self.limit is None:
+                return SEND, 0.0
+            self._rollover(now)
+            rate = self._refill(now)
+            if priority < EMERGENCY_PRIORITY and self.remaining <= self.reserve:
+                self.dropped += 1
+                return DROP, 0.0
+            if priority < 0 and self.tokens < 1:
+                self.deferred += 1
+                return DEFER, min(MAX_DEFER, (1 - self.tokens) / rate)
+            self.tokens -= 1
+            self.remaining = max(0, self.remaining - 1)
+            return SEND, 0.0
+
+    def observe(self, rate_limit: Optional[RateLimit]) -> None:
+        """Correct the budget from a response's rate-limit headers."""
+        if rate_limit is None:
+            return
+        with self.lock:
+            self._apply(rate_limit)
+            self._save()
+
+    def stats(self) -> dict:
+        """Known budget and pacing counters for the status command."""
+        now = time.time()
+        with self.lock:
+            if self.limit is None:
+                return {"known": False, "deferred": self.deferred, "dropped": self.dropped}
+            self._rollover(now)
+            self._refill(now)
+            return {
+                "known": True,
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "reset": self.reset,
+                "reserve": self.reserve,
+                "tokens": round(self.tokens, 1),
+                "burst": self.burst,
+                "deferred": self.deferred,
+                "dropped": self.dropped,
+            }
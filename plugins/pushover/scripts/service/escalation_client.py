@@ -7,98 +7,330 @@ and starting the service if needed.
 """
 
 import fcntl
-import json
 import os
+import select
 import socket
-import struct
 import subprocess
 import sys
 import time
 from pathlib import Path
 
+try:
+    from .escalation_codec import CodecError, FrameCodec, decode_json, encode_json
+    from .escalation_framing import FrameReader, FramingError
+    from .escalation_status import StatusSnapshot, read_status_page, status_page_path
+except ImportError:  # Loaded as a top-level module (escalation_ctl)
+    from escalation_codec import CodecError, FrameCodec, decode_json, encode_json
+    from escalation_framing import FrameReader, FramingError
+    from escalation_status import StatusSnapshot, read_status_page, status_page_path
+
 
 # Default configuration - use ~/.claude/run for runtime files
 DEFAULT_SOCKET = Path("~/.claude/run/escalation.sock").expanduser()
 DEFAULT_LOCKFILE = Path("~/.claude/run/escalation.lock").expanduser()
 # Service script is relative to this file
 SERVICE_SCRIPT = Path(__file__).parent / "escalation_service.py"
+LISTEN_BACKLOG = 64  # Requests queued in the kernel while the service starts
+SERVICE_READY_TIMEOUT = 5.0  # Default wait for the readiness signal
+LOCK_RETRY_INTERVAL = 0.01  # First wait between attempts at a held start lock
+LOCK_RETRY_MAX = 0.1  # The wait doubles up to this
+
+
+class Deadline:
+    """One time budget shared by every step of a client call.
+
+    Connect, send and receive all draw from the same budget, so a slow or
+    absent service can never stall the caller past it. With fail_fast,
+    connect failures are not retried at all.
+    """
+
+    def __init__(self, seconds: float, fail_fast: bool = False):
+        self.expires_at = time.monotonic() + seconds
+        self.fail_fast = fail_fast
+
+    def remaining(self) -> float:
+        """Seconds left (0 once expired)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, cap: float) -> float:
+        """Socket timeout for one step: the remaining budget, at most cap."""
+        return min(cap, self.remaining())
+
+
+def hook_deadline(default: float, argv: list[str] | None = None, share: float = 0.8) -> Deadline:
+    """Fail-fast deadline for a hook, from its ``--timeout SECONDS`` argument.
+
+    hooks.json passes each hook's configured timeout; the hook spends at most
+    ``share`` of it talking to the service, leaving room for interpreter
+    startup and exit before Claude Code gives up on the hook.
+    """
+    argv = sys.argv if argv is None else argv
+    seconds = default
+    if "--timeout" in argv:
+        try:
+            seconds = float(argv[argv.index("--timeout") + 1])
+        except (IndexError, ValueError):
+            pass
+    return Deadline(seconds * share, fail_fast=True)
+
+
+class EscalationConnection:
+    """A long-lived connection that pipelines many requests over one socket.
+
+    Each request is tagged with an ``id`` which the service echoes back, so
+    responses are matched by id and may arrive in any order. The connection
+    starts on JSON; after negotiate() it switches to the compact binary
+    encoding for hot commands once the service accepts the handshake.
+    """
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.closed = False
+        self.codec = FrameCodec()
+        self.reader = FrameReader()
+        self._next_id = 1
+        self._hello_id: int | None = None
+        self._responses: dict[int, dict] = {}
+
+    def negotiate(self) -> None:
+        """Offer the binary protocol without waiting for the answer.
+
+        Requests keep using JSON until the handshake response is read, so
+        negotiation never adds a round trip.
+        """
+        self._hello_id = self.submit(FrameCodec.hello())
+
+    def submit(self, command: dict, deadline: Deadline | None = None) -> int | None:
+        """Send a request without waiting for its response. Returns the request id."""
+        if self.closed or (deadline and deadline.expired):
+            return None
+        request_id = self._next_id
+        self._next_id += 1
+        try:
+            if deadline:
+                self.sock.settimeout(deadline.remaining())
+            self.sock.sendall(self.codec.encode_request({**command, "id": request_id}))
+        except OSError:
+            self.close()
+            return None
+        return request_id
+
+    def result(self, request_id: int, deadline: Deadline | None = None) -> dict | None:
+        """Wait for the response to a previously submitted request."""
+        while request_id not in self._responses:
+            if self.closed:
+                return None
+            try:
+                payload = self.reader.read_message(self.sock, deadline.expires_at if deadline else None)
+                response = None if payload is None else self.codec.decode_response(payload)
+            except (CodecError, FramingError, socket.timeout, OSError):
+                # A timed-out connection may still receive the late response,
+                # so it cannot be reused
+                response = None
+            if not isinstance(response, dict):
+                self.close()
+                return None
+            response_id = response.pop("id", None)
+            if response_id is not None and response_id == self._hello_id:
+                self._hello_id = None
+                self.codec.finish_hello(response)
+                continue
+            self._responses[response_id] = response
+        return self._responses.pop(request_id)
+
+    def request(self, command: dict, deadline: Deadline | None = None) -> dict | None:
+        """Send a request and wait for its response."""
+        request_id = self.submit(command, deadline)
+        if request_id is None:
+            return None
+        return self.result(request_id, deadline)
+
+    def pipeline(self, commands: list[dict], deadline: Deadline | None = None) -> list[dict | None]:
+        """Send all commands back to back, then collect their responses in order."""
+        request_ids = [self.submit(command, deadline) for command in commands]
+        return [None if rid is None else self.result(rid, deadline) for rid in request_ids]
+
+    def close(self) -> None:
+        """Close the underlying socket."""
+        if not self.closed:
+            self.closed = True
+            self.sock.close()
+
+    def __enter__(self) -> "EscalationConnection":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
 
 
 class EscalationClient:
-    """Client for communicating with the escalation service."""
+    """Client for communicating with the escalation service.
+
+    Every method accepts an optional Deadline bounding the whole call; the
+    ``deadline`` attribute provides a default for calls that pass none.
+    """
 
-    def __init__(self, socket_path: Path = DEFAULT_SOCKET):
+    def __init__(
+        self,
+        socket_path: Path = DEFAULT_SOCKET,
+        persistent: bool = False,
+        deadline: Deadline | None = None,
+    ):
         self.socket_path = socket_path
         self.lockfile_path = DEFAULT_LOCKFILE
+        # Persistent clients keep one pipelined connection open across calls
+        self.persistent = persistent
+        self.deadline = deadline
+        self._connection: EscalationConnection | None = None
 
-    def connect(self, timeout: float = 5.0, retries: int = 2) -> socket.socket | None:
+    def connect(
+        self,
+        timeout: float = 5.0,
+        retries: int = 2,
+        deadline: Deadline | None = None,
+    ) -> socket.socket | None:
         """Connect to the escalation service with retry logic."""
+        deadline = deadline or self.deadline
+        if deadline and deadline.fail_fast:
+            retries = 0
         for attempt in range(retries + 1):
+            if deadline and deadline.expired:
+                return None
             try:
                 sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-                sock.settimeout(timeout)
+                sock.settimeout(deadline.timeout(timeout) if deadline else timeout)
                 sock.connect(str(self.socket_path))
                 return sock
             except (ConnectionRefusedError, FileNotFoundError, OSError) as e:
+                sock.close()
                 if attempt < retries:
-                    # Wait with exponential backoff
-                    time.sleep(0.5 * (2 ** attempt))
+                    # Wait with exponential backoff, unless that would overrun the deadline
+                    backoff = 0.5 * (2 ** attempt)
+                    if deadline and backoff >= deadline.remaining():
+                        return None
+                    time.sleep(backoff)
                     continue
                 return None
         return None
 
-    def _recv_exact(self, sock: socket.socket, n: int) -> bytes | None:
-        """Receive exactly n bytes, handling partial reads."""
-        data = b""
-        while len(data) < n:
-            chunk = sock.recv(n - len(data))
-            if not chunk:
-                return None
-            data += chunk
-        return data
-
-    def send_command(self, sock: socket.socket, command: dict) -> dict | None:
+    def send_command(self, sock: socket.socket, command: dict, deadline: Deadline | None = None) -> dict | None:
         """Send a command and receive response using length-prefixed framing."""
+        deadline = deadline or self.deadline
         try:
-            # Send command
-            encoded = json.dumps(command).encode("utf-8")
-            length = struct.pack("!I", len(encoded))
-            sock.sendall(length + encoded)
-
-            # Receive response (handle partial reads)
-            length_data = self._recv_exact(sock, 4)
-            if length_data is None:
-                return None
+            if deadline:
+                sock.settimeout(deadline.remaining())
+            sock.sendall(encode_json(command))
+            payload = FrameReader().read_message(sock, deadline.expires_at if deadline else None)
+            return None if payload is None else decode_json(payload)
+        except (CodecError, FramingError, socket.timeout, OSError):
+            return None
+        finally:
+            sock.close()
 
-            length = struct.unpack("!I", length_data)[0]
-            if length > 1024 * 1024:  # Max 1MB
-                return None
+    def open_connection(
+        self,
+        timeout: float = 5.0,
+        retries: int = 2,
+        deadline: Deadline | None = None,
+    ) -> "EscalationConnection | None":
+        """Open a long-lived connection for pipelining several requests."""
+        sock = self.connect(timeout=timeout, retries=retries, deadline=deadline)
+        if not sock:
+            return None
+        conn = EscalationConnection(sock)
+        conn.negotiate()
+        return conn
 
-            data = self._recv_exact(sock, length)
-            if data is None:
+    def _ensure_connection(
+        self,
+        timeout: float = 5.0,
+        retries: int = 2,
+        deadline: Deadline | None = None,
+    ) -> "EscalationConnection | None":
+        """Return the cached persistent connection, opening it if needed."""
+        if self._connection is None or self._connection.closed:
+            self._connection = self.open_connection(timeout=timeout, retries=retries, deadline=deadline)
+        return self._connection
+
+    def _request(self, command: dict, deadline: Deadline | None = None) -> dict | None:
+        """Send a single command and return its response.
+
+        Non-persistent clients use a fresh connection per request. Persistent
+        clients reuse one connection; if a reused connection turns out to be
+        stale (e.g. the service restarted), the request is retried once on a
+        new connection.
+        """
+        deadline = deadline or self.deadline
+        if not self.persistent:
+            sock = self.connect(deadline=deadline)
+            if not sock:
                 return None
+            return self.send_command(sock, command, deadline)
 
-            return json.loads(data.decode("utf-8"))
-        except (json.JSONDecodeError, struct.error, socket.timeout, OSError):
+        reused = self._connection is not None and not self._connection.closed
+        conn = self._ensure_connection(deadline=deadline)
+        if not conn:
             return None
-        finally:
-            sock.close()
-
-    def is_running(self) -> bool:
+        response = conn.request(command, deadline)
+        if response is None and reused and not (deadline and deadline.expired):
+            conn = self._ensure_connection(deadline=deadline)
+            if conn:
+                response = conn.request(command, deadline)
+        return response
+
+    def close(self) -> None:
+        """Close the persistent connection, if any."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def is_running(self, deadline: Deadline | None = None) -> bool:
         """Check if the service is running."""
-        sock = self.connect(timeout=2, retries=0)
+        if self.persistent:
+            return self._ensure_connection(timeout=2, retries=0, deadline=deadline) is not None
+
+        sock = self.connect(timeout=2, retries=0, deadline=deadline)
         if sock:
             sock.close()
             return True
         return False
 
-    def start_service_if_needed(self) -> bool:
+    def read_status_page(self) -> StatusSnapshot | None:
+        """Read the service's shared status page (no socket round trip)."""
+        return read_status_page(status_page_path(self.socket_path))
+
+    def has_pending(self, session_id: str) -> bool | None:
+        """Whether a session may have pending escalations, from the status page.
+
+        Returns False when the service is not running or the session
+        certainly has nothing pending, True when it may, and None when the
+        page is unavailable and the caller should ask the service.
+        """
+        page = self.read_status_page()
+        if page is None:
+            return None
+        return page.running and page.may_be_pending(session_id)
+
+    def start_service_if_needed(self, deadline: Deadline | None = None) -> bool:
         """Start the escalation service if not already running.
 
-        Uses a lockfile to prevent race conditions when multiple hooks
-        try to start the service simultaneously.
+        The client binds the listening socket itself and hands it to the
+        service (socket activation), so connections made while the service
+        is still starting queue in the kernel backlog instead of failing.
+        The service reports readiness by writing to a pipe, which is awaited
+        with select() rather than polled.
+
+        A lockfile serializes concurrent starts. It is held only while the
+        socket is bound and the service spawned, so a losing hook waits for
+        it briefly and then finds the socket accepting connections. The wait
+        is bounded by the deadline; False is returned once it expires.
         """
-        if self.is_running():
+        deadline = deadline or self.deadline
+        if self.is_running(deadline):
             return True
 
         # Ensure lockfile directory exists
@@ -106,47 +338,124 @@ class EscalationClient:
 
         try:
             # Use lockfile to prevent concurrent starts
-            lockfile = open(self.lockfile_path, "w")
+            with open(self.lockfile_path, "w") as lockfile:
+                if not self._lock(lockfile.fileno(), deadline):
+                    print("Timed out waiting for another service start", file=sys.stderr)
+                    return False
+                try:
+                    # Double-check after acquiring lock
+                    if self.is_running(deadline):
+                        return True
+                    ready_fd = self._spawn_service()
+                finally:
+                    fcntl.flock(lockfile.fileno(), fcntl.LOCK_UN)
+        except Exception as e:
+            print(f"Error starting service: {e}", file=sys.stderr)
+            return False
+
+        if ready_fd is None:
+            return self.is_running(deadline)
+        return self._wait_ready(ready_fd, deadline)
+
+    @staticmethod
+    def _lock(fd: int, deadline: Deadline | None) -> bool:
+        """Take the start lock, waiting no longer than the deadline allows."""
+        if deadline is None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            return True
+        interval = LOCK_RETRY_INTERVAL
+        while True:
             try:
-                fcntl.flock(lockfile.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
             except BlockingIOError:
-                # Another process is starting the service
-                lockfile.close()
-                time.sleep(1)
-                return self.is_running()
+                pass
+            remaining = deadline.remaining()
+            if remaining <= 0:
+                return False
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, LOCK_RETRY_MAX)
 
-            try:
-                # Double-check after acquiring lock
-                if self.is_running():
-                    return True
+    def _bind_listener(self) -> socket.socket | None:
+        """Bind and listen on the service socket, replacing a stale socket file.
 
-                # Start the service
-                if not SERVICE_SCRIPT.exists():
-                    print(f"Service script not found: {SERVICE_SCRIPT}", file=sys.stderr)
-                    return False
+        Returns None if the path is held by a live (if unresponsive) service.
+        """
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists() and not self._socket_is_stale():
+            return None
+        self.socket_path.unlink(missing_ok=True)
 
-                # Start in background, detached
-                subprocess.Popen(
-                    [sys.executable, str(SERVICE_SCRIPT)],
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    stdin=subprocess.DEVNULL,
-                    start_new_session=True,
-                )
-
-                # Wait for service to be ready
-                for _ in range(20):  # Wait up to 2 seconds
-                    time.sleep(0.1)
-                    if self.is_running():
-                        return True
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.bind(str(self.socket_path))
+            # Harden socket permissions - only owner can read/write (0600)
+            os.chmod(self.socket_path, 0o600)
+            sock.listen(LISTEN_BACKLOG)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
 
-                return False
-            finally:
-                fcntl.flock(lockfile.fileno(), fcntl.LOCK_UN)
-                lockfile.close()
-        except Exception as e:
-            print(f"Error starting service: {e}", file=sys.stderr)
+    def _socket_is_stale(self) -> bool:
+        """Whether the socket file is left over from a service that is gone."""
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.setblocking(False)
+            probe.connect(str(self.socket_path))
             return False
+        except (ConnectionRefusedError, FileNotFoundError):
+            return True
+        except OSError:
+            return False  # Backlog full: alive but busy
+        finally:
+            probe.close()
+
+    def _spawn_service(self) -> int | None:
+        """Spawn the service on a pre-bound socket. Returns the readiness pipe's read end."""
+        if not SERVICE_SCRIPT.exists():
+            raise FileNotFoundError(f"Service script not found: {SERVICE_SCRIPT}")
+
+        listener = self._bind_listener()
+        if listener is None:
+            return None
+        ready_r, ready_w = os.pipe()
+        try:
+            # Start in background, detached
+            subprocess.Popen(
+                [
+                    sys.executable, str(SERVICE_SCRIPT),
+                    "--socket", str(self.socket_path),
+                    "--listen-fd", str(listener.fileno()),
+                    "--ready-fd", str(ready_w),
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                stdin=subprocess.DEVNULL,
+                start_new_session=True,
+                pass_fds=(listener.fileno(), ready_w),
+            )
+        except BaseException:
+            os.close(ready_r)
+            self.socket_path.unlink(missing_ok=True)
+            raise
+        finally:
+            # The service owns the listener now; keeping our copy open would
+            # let connections queue even if the service died
+            listener.close()
+            os.close(ready_w)
+        return ready_r
+
+    def _wait_ready(self, ready_fd: int, deadline: Deadline | None = None) -> bool:
+        """Wait for the service to signal readiness (False if it exits first)."""
+        try:
+            timeout = deadline.remaining() if deadline else SERVICE_READY_TIMEOUT
+            readable, _, _ = select.select([ready_fd], [], [], timeout)
+            if not readable:
+                return False
+            return os.read(ready_fd, 1) != b""  # EOF: exited before becoming ready
+        finally:
+            os.close(ready_fd)
 
     def add_escalation(
         self,
@@ -154,14 +463,17 @@ class EscalationClient:
         message: str,
         delays: list[int] | None = None,
         auto_start: bool = True,
+        deadline: Deadline | None = None,
+        mode: str | None = None,
     ) -> dict | None:
-        """Add an escalation timer."""
-        if auto_start:
-            self.start_service_if_needed()
+        """Add an escalation timer.
 
-        sock = self.connect()
-        if not sock:
-            return None
+        mode controls what happens if the ID already has pending timers:
+        "replace" (the service default) restarts them, "if_absent" keeps
+        them, and "extend" keeps them and adds only the missing delays.
+        """
+        if auto_start:
+            self.start_service_if_needed(deadline)
 
         command = {
             "command": "add",
@@ -170,61 +482,118 @@ class EscalationClient:
         }
         if delays:
             command["delays"] = delays
+        if mode:
+            command["mode"] = mode
 
-        return self.send_command(sock, command)
+        return self._request(command, deadline)
 
-    def cancel_escalation(self, escalation_id: str) -> dict | None:
-        """Cancel an escalation timer."""
-        sock = self.connect()
-        if not sock:
-            return None
+    def notify(
+        self,
+        title: str,
+        message: str,
+        priority: int = 0,
+        session_id: str = "",
+        deadline: Deadline | None = None,
+    ) -> dict | None:
+        """Have the service deliver a one-off notification.
+
+        The service coalesces it with others and paces it against the
+        Pushover message budget. Does not start the service.
+        """
+        return self._request({
+            "command": "notify",
+            "title": title,
+            "message": message,
+            "priority": priority,
+            "session_id": session_id,
+        }, deadline)
+
+    def poke_outbox(self, deadline: Deadline | None = None) -> dict | None:
+        """Tell the service that records were added with append_outbox()."""
+        return self._request({"command": "outbox"}, deadline)
 
-        return self.send_command(sock, {
+    def cancel_escalation(self, escalation_id: str, deadline: Deadline | None = None) -> dict | None:
+        """Cancel an escalation timer."""
+        return self._request({
             "command": "cancel",
             "escalation_id": escalation_id,
-        })
+        }, deadline)
 
-    def get_status(self) -> dict | None:
-        """Get list of pending escalations."""
-        sock = self.connect()
-        if not sock:
-            return None
+    def batch(self, operations: list[dict], deadline: Deadline | None = None) -> dict | None:
+        """Apply several add/cancel operations in one request.
 
-        return self.send_command(sock, {"command": "status"})
+        Each operation is a command dict, e.g. ``{"command": "cancel",
+        "escalation_id": "abc"}``. Cancels may also select in bulk with
+        ``"prefix"`` or ``"pid"`` instead of an ID.
+        """
+        return self._request({"command": "batch", "operations": operations}, deadline)
 
-    def shutdown_service(self) -> dict | None:
-        """Request service shutdown."""
-        sock = self.connect()
-        if not sock:
-            return None
+    def cancel_matching(
+        self,
+        prefix: str | None = None,
+        pid: int | None = None,
+        deadline: Deadline | None = None,
+    ) -> dict | None:
+        """Cancel every escalation whose ID starts with prefix and/or belongs to pid."""
+        operations = []
+        if prefix is not None:
+            operations.append({"command": "cancel", "prefix": prefix})
+        if pid is not None:
+            operations.append({"command": "cancel", "pid": pid})
+        return self.batch(operations, deadline)
+
+    def get_status(self, deadline: Deadline | None = None) -> dict | None:
+        """Get list of pending escalations."""
+        return self._request({"command": "status"}, deadline)
 
-        return self.send_command(sock, {"command": "shutdown"})
+    def shutdown_service(self, deadline: Deadline | None = None) -> dict | None:
+        """Request service shutdown."""
+        return self._request({"command": "shutdown"}, deadline)
 
-    def register_session(self, session_id: str | None = None, pid: int | None = None) -> dict | None:
-        """Register a new session with optional PID for tracking."""
-        sock = self.connect()
-        if not sock:
-            return None
+    def register_session(
+        self,
+        session_id: str | None = None,
+        pid: int | None = None,
+        deadline: Deadline | None = None,
+        transcript_path: str | None = None,
+    ) -> dict | None:
+        """Register a new session with optional PID for tracking.
 
+        With transcript_path the service starts indexing the transcript
+        (see transcript_summary).
+        """
         cmd = {"command": "register_session"}
         if session_id:
             cmd["session_id"] = session_id
         if pid:
             cmd["pid"] = pid
+        if transcript_path:
+            cmd["transcript_path"] = transcript_path
 
-        return self.send_command(sock, cmd)
+        return self._request(cmd, deadline)
 
-    def unregister_session(self, session_id: str | None = None) -> dict | None:
-        """Unregister a session (decrement ref count, may shutdown if 0)."""
-        sock = self.connect()
-        if not sock:
-            return None
+    def transcript_summary(
+        self, session_id: str, transcript_path: str | None = None, deadline: Deadline | None = None
+    ) -> dict | None:
+        """Last assistant text and counters of a session's transcript.
+
+        The service parses only what was appended since the session's
+        previous summary. transcript_path is needed unless the session
+        registered with one.
+        """
+        cmd = {"command": "transcript_summary", "session_id": session_id}
+        if transcript_path:
+            cmd["transcript_path"] = transcript_path
+
+        return self._request(cmd, deadline)
 
+    def unregister_session(self, session_id: str | None = None, deadline: Deadline | None = None) -> dict | None:
+        """Unregister a session (decrement ref count, may shutdown if 0)."""
         cmd = {"command": "unregister_session"}
         if session_id:
             cmd["session_id"] = session_id
 
-        return self.send_command(sock, cmd)
+        return self._request(cmd, deadline)
 
 
 # Convenience functions for simple usage
@@ -232,10 +601,14 @@ _client: EscalationClient | None = None
 
 
 def get_client() -> EscalationClient:
-    """Get or create a shared client instance."""
+    """Get or create a shared client instance.
+
+    The shared client is persistent, so a hook that checks ``is_running()``
+    and then sends a command only connects once.
+    """
     global _client
     if _client is None:
-        _client = EscalationClient()
+        _client = EscalationClient(persistent=True)
     return _client
 
 
@@ -249,6 +622,16 @@ def cancel_escalation(escalation_id: str) -> dict | None:
     return get_client().cancel_escalation(escalation_id)
 
 
+def notify(title: str, message: str, priority: int = 0, session_id: str = "") -> dict | None:
+    """Deliver a notification through the service (convenience function)."""
+    return get_client().notify(title, message, priority, session_id)
+
+
+def batch(operations: list[dict]) -> dict | None:
+    """Apply several add/cancel operations in one request (convenience function)."""
+    return get_client().batch(operations)
+
+
 def start_service() -> bool:
     """Start the escalation service if needed (convenience function)."""
     return get_client().start_service_if_needed()
@@ -264,9 +647,16 @@ def get_status() -> dict | None:
     return get_client().get_status()
 
 
-def register_session(session_id: str | None = None, pid: int | None = None) -> dict | None:
+def register_session(
+    session_id: str | None = None, pid: int | None = None, transcript_path: str | None = None
+) -> dict | None:
     """Register a session (convenience function)."""
-    return get_client().register_session(session_id=session_id, pid=pid)
+    return get_client().register_session(session_id=session_id, pid=pid, transcript_path=transcript_path)
+
+
+def transcript_summary(session_id: str, transcript_path: str | None = None) -> dict | None:
+    """Summarize a session's transcript in the service (convenience function)."""
+    return get_client().transcript_summary(session_id, transcript_path)
 
 
 def unregister_session(session_id: str | None = None) -> dict | None:
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Escalation Codec - Wire format shared by the escalation client and service.
+
+Every message travels in length-prefixed frames (see escalation_framing).
+Payloads are JSON objects (protocol version 1) or, once both sides agree on
+version 2 through a "hello" handshake, compact binary messages for the hot
+operations (ping, cancel, add). Version 3 additionally allows large JSON
+messages to be streamed as a sequence of chunk frames.
+
+Binary requests:
+    B opcode | I request_id [| H handle [| H len | id bytes]] [| op fields]
+
+The handle is a per-connection integer standing in for a session ID. The
+first request that uses an ID sets FLAG_INTERN on its opcode and carries the
+ID string; later requests send only the 2-byte handle.
+
+    ping    no fields
+    cancel  handle
+    add     handle | B n_delays | n_delays * I delay | message bytes
+
+Binary responses:
+    B OP_REPLY | I request_id | B status | B flags [| error message bytes]
+
+JSON payloads always start with "{", which no binary opcode uses, so the two
+encodings can be mixed freely on a version 2 connection.
+"""
+
+import json
+import struct
+from typing import Union
+
+try:
+    from .escalation_framing import encode_frame, stream_json
+except ImportError:  # Loaded as a top-level module
+    from escalation_framing import encode_frame, stream_json
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+PROTOCOL_JSON = 1
+PROTOCOL_BINARY = 2
+PROTOCOL_STREAM = 3  # Binary plus streamed (chunked) JSON responses
+SUPPORTED_VERSIONS = (PROTOCOL_JSON, PROTOCOL_BINARY, PROTOCOL_STREAM)
+
+OP_PING = 0x01
+OP_CANCEL = 0x02
+OP_ADD = 0x03
+OP_REPLY = 0x40
+FLAG_INTERN = 0x80
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+REPLY_CANCELLED = 0x01
+
+MAX_HANDLES = 0xFFFF
+
+_LENGTH = struct.Struct("!I")
+_HEADER = struct.Struct("!BI")
+_HANDLE = struct.Struct("!H")
+_REPLY = struct.Struct("!BIBB")
+_HOT_COMMANDS = {"ping": OP_PING, "cancel": OP_CANCEL, "add": OP_ADD}
+_OPCODE_COMMANDS = {op: name for name, op in _HOT_COMMANDS.items()}
+
+
+class CodecError(ValueError):
+    """Raised for malformed or unsupported payloads."""
+
+
+def encode_json(message: dict) -> bytes:
+    """Encode a message as a length-prefixed JSON frame."""
+    return encode_frame(json.dumps(message).encode("utf-8"))
+
+
+def decode_json(payload: Buffer) -> dict:
+    """Decode a JSON payload straight from the receive buffer."""
+    try:
+        return json.loads(str(payload, "utf-8"))
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise CodecError(f"invalid JSON payload: {e}") from e
+
+
+def is_json(payload: Buffer) -> bool:
+    """Whether a payload uses the JSON encoding."""
+    return len(payload) > 0 and payload[0] == 0x7B  # "{"
+
+
+class FrameCodec:
+    """Per-connection codec state: negotiated version and interned session IDs.
+
+    Client side: encode_request() / decode_response().
+    Service side: decode_request() / encode_response() / accept_hello().
+    """
+
+    def __init__(self):
+        self.version = PROTOCOL_JSON
+        self._handles: dict[str, int] = {}   # client: session ID -> handle
+        self._ids: dict[int, str] = {}       # service: handle -> session ID
+        self._pending: dict[int, tuple[str, str]] = {}  # client: request id -> (command, escalation id)
+
+    # -- handshake -------------------------------------------------------
+
+    @staticmethod
+    def hello() -> dict:
+        """Handshake request offering every supported version."""
+        return {"command": "hello", "versions": list(SUPPORTED_VERSIONS)}
+
+    def accept_hello(self, request: dict) -> dict:
+        """Service side: pick the highest version both sides support."""
+        offered = request.get("versions") or [PROTOCOL_JSON]
+        common = [v for v in offered if v in SUPPORTED_VERSIONS]
+        self.version = max(common) if common else PROTOCOL_JSON
+        return {"status": "ok", "version": self.version}
+
+    def finish_hello(self, response: dict | None) -> None:
+        """Client side: adopt the version chosen by the service.
+
+        Services that predate the handshake answer with an error, which
+        leaves the connection on JSON.
+        """
+        if response and response.get("status") == "ok" and response.get("version") in SUPPORTED_VERSIONS:
+            self.version = response["version"]
+
+    # -- client side -----------------------------------------------------
+
+    def encode_request(self, command: dict) -> bytes:
+        """Encode a request frame, using the binary form when negotiated."""
+        if self.version >= PROTOCOL_BINARY:
+            payload = self._encode_binary(command)
+            if payload is not None:
+                return encode_frame(payload)
+        if self.version >= PROTOCOL_STREAM:
+            return b"".join(stream_json(command))
+        return encode_json(command)
+
+    def _encode_binary(self, command: dict) -> bytes | None:
+        """Binary payload for a hot command, or None to fall back to JSON."""
+        opcode = _HOT_COMMANDS.get(command.get("command", ""))
+        request_id = command.get("id", 0)
+        if opcode is None or not isinstance(request_id, int) or not 0 <= request_id <= 0xFFFFFFFF:
+            return None
+
+        if opcode == OP_PING:
+            if len(command) > 2:
+                return None
+            return _HEADER.pack(opcode, request_id)
+
+        escalation_id = command.get("escalation_id")
+        if not isinstance(escalation_id, str):
+            return None
+        if opcode == OP_CANCEL and command.keys() - {"command", "id", "escalation_id"}:
+            return None
+        if opcode == OP_ADD:
+            if "message" not in command or command.keys() - {"command", "id", "escalation_id", "message", "delays"}:
+                return None
+            delays = command.get("delays") or []
+            if len(delays) > 255 or not all(isinstance(d, int) and 0 <= d <= 0xFFFFFFFF for d in delays):
+                return None
+
+        parts = []
+        handle = self._handles.get(escalation_id)
+        if handle is None:
+            encoded_id = escalation_id.encode("utf-8")
+            if len(self._handles) >= MAX_HANDLES or len(encoded_id) > 0xFFFF:
+                return None
+            handle = len(self._handles)
+            self._handles[escalation_id] = handle
+            parts.append(_HEADER.pack(opcode | FLAG_INTERN, request_id))
+            parts.append(_HANDLE.pack(handle) + _HANDLE.pack(len(encoded_id)) + encoded_id)
+        else:
+            parts.append(_HEADER.pack(opcode, request_id))
+            parts.append(_HANDLE.pack(handle))
+
+        if opcode == OP_ADD:
+            parts.append(struct.pack(f"!B{len(delays)}I", len(delays), *delays))
+            parts.append(command.get("message", "").encode("utf-8"))
+
+        self._pending[request_id] = (command["command"], escalation_id)
+        return b"".join(parts)
+
+    def decode_response(self, payload: Buffer) -> dict:
+        """Decode a response payload in either encoding."""
+        if is_json(payload):
+            return decode_json(payload)
+        if len(payload) < _REPLY.size or payload[0] != OP_REPLY:
+            raise CodecError("malformed binary response")
+
+        _op, request_id, status, flags = _REPLY.unpack_from(payload)
+        command, escalation_id = self._pending.pop(request_id, ("", ""))
+        if status != STATUS_OK:
+            message = str(payload[_REPLY.size:], "utf-8", errors="replace")
+            return {"id": request_id, "status": "error", "message": message}
+
+        response: dict = {"id": request_id, "status": "ok"}
+        if command == "cancel":
+            response["cancelled"] = bool(flags & REPLY_CANCELLED)
+        elif command == "add":
+            response["escalation_id"] = escalation_id
+        return response
+
+    # -- service side ----------------------------------------------------
+
+    def decode_request(self, payload: Buffer) -> tuple[dict, bool]:
+        """Decode a request payload. Returns (command, was_binary)."""
+        if is_json(payload):
+            return decode_json(payload), False
+        if self.version < PROTOCOL_BINARY:
+            raise CodecError("binary request before handshake")
+        if len(payload) < _HEADER.size:
+            raise CodecError("truncated binary request")
+
+        raw_opcode, request_id = _HEADER.unpack_from(payload)
+        opcode = raw_opcode & ~FLAG_INTERN
+        name = _OPCODE_COMMANDS.get(opcode)
+        if name is None:
+            raise CodecError(f"unknown opcode: {raw_opcode:#x}")
+        command: dict = {"command": name, "id": request_id}
+        if opcode == OP_PING:
+            return command, True
+
+        try:
+            offset = _HEADER.size
+            (handle,) = _HANDLE.unpack_from(payload, offset)
+            offset += _HANDLE.size
+            if raw_opcode & FLAG_INTERN:
+                (length,) = _HANDLE.unpack_from(payload, offset)
+                offset += _HANDLE.size
+                self._ids[handle] = str(payload[offset:offset + length], "utf-8")
+                offset += length
+            escalation_id = self._ids.get(handle)
+            if escalation_id is None:
+                raise CodecError(f"unknown session handle: {handle}")
+            command["escalation_id"] = escalation_id
+
+            if opcode == OP_ADD:
+                count = payload[offset]
+                delays = list(struct.unpack_from(f"!{count}I", payload, offset + 1))
+                offset += 1 + 4 * count
+                command["message"] = str(payload[offset:], "utf-8")
+                if delays:
+                    command["delays"] = delays
+        except (struct.error, IndexError, UnicodeDecodeError) as e:
+            raise CodecError(f"malformed binary request: {e}") from e
+        return command, True
+
+    def encode_response(self, response: dict, binary: bool) -> list[bytes]:
+        """Encode a response in the same encoding as its request.
+
+        Returns the frames to send: large JSON responses to version 3 peers
+        are streamed in chunks, everything else is a single frame.
+        """
+        if not binary:
+            if self.version >= PROTOCOL_STREAM:
+                return list(stream_json(response))
+            return [encode_json(response)]
+        request_id = response.get("id", 0)
+        if response.get("status") == "ok":
+            flags = REPLY_CANCELLED if response.get("cancelled") else 0
+            return [encode_frame(_REPLY.pack(OP_REPLY, request_id, STATUS_OK, flags))]
+        message = str(response.get("message", "error")).encode("utf-8")
+        return [encode_frame(_REPLY.pack(OP_REPLY, request_id, STATUS_ERROR, 0) + message)]
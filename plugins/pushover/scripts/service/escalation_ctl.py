@@ -6,14 +6,23 @@ Usage:
     escalation_ctl start              Start service if not running
     escalation_ctl stop               Force stop the service
     escalation_ctl status             Show sessions (with PIDs) and pending escalations
+    escalation_ctl status --quick     Liveness and pending count from the status page
 
     escalation_ctl add <id> <msg>     Add an escalation manually
-    escalation_ctl cancel <id>        Cancel an escalation
+    escalation_ctl cancel <id>...     Cancel one or more escalations
+    escalation_ctl cancel --prefix P  Cancel escalations whose ID starts with P
+    escalation_ctl cancel --pid PID   Cancel escalations of sessions with PID
 
     escalation_ctl register [--session-id ID] [--pid PID]
                                       Register a session with PID tracking
     escalation_ctl unregister [--session-id ID]
                                       Unregister a session
+    escalation_ctl summary <session_id> [--transcript PATH]
+                                      Last assistant text and counters of a
+                                      session's transcript
+
+    escalation_ctl pipe               Pipeline JSON commands (one per line on
+                                      stdin) over a single connection
 
 Examples:
     # Simulate full Claude Code flow with PID tracking
@@ -26,20 +35,30 @@ Examples:
 
     # Test PID auto-cleanup (register with non-existent PID)
     escalation_ctl register --pid 99999
-    # Wait 60s, then check status - session should be auto-removed
+    # Check status - session is auto-removed at once on Linux (pidfd), within 60s elsewhere
 
     # Add escalation with custom delays (5s, 30s)
     escalation_ctl add test "Test message" --delays 5,30
+
+    # Tear down everything belonging to one Claude process in one round trip
+    escalation_ctl cancel --pid 12345
+
+    # Send several commands over one connection
+    printf '%s\n' '{"command": "cancel", "escalation_id": "a"}' \
+                   '{"command": "status"}' | escalation_ctl pipe
 """
 
 import argparse
+import json
 import sys
+import time
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
 from escalation_client import EscalationClient
+from escalation_timers import ADD_MODES
 
 
 def cmd_start(client: EscalationClient, _args: argparse.Namespace) -> int:
@@ -73,8 +92,18 @@ def cmd_stop(client: EscalationClient, _args: argparse.Namespace) -> int:
         return 1
 
 
-def cmd_status(client: EscalationClient, _args: argparse.Namespace) -> int:
+def cmd_status(client: EscalationClient, args: argparse.Namespace) -> int:
     """Show service status and pending escalations."""
+    page = client.read_status_page()
+    if page is not None and not page.running:
+        print("Service is not running")
+        return 1
+
+    if args.quick and page is not None:
+        # Answer from the shared status page without touching the socket
+        print(f"Service is running (pid={page.pid}). {page.pending_count} session(s) with pending escalations.")
+        return 0
+
     if not client.is_running():
         print("Service is not running")
         return 1
@@ -95,6 +124,60 @@ def cmd_status(client: EscalationClient, _args: argparse.Namespace) -> int:
             print(f"  {sid[:16]}{'...' if len(sid) > 16 else ''} pid={pid} age={age:.0f}s")
     print()
 
+    delivery = result.get("delivery")
+    if delivery:
+        latency = delivery.get("latency_ms") or {}
+        print(
+            f"Delivery: {delivery.get('depth', 0)}/{delivery.get('max_depth', 0)} queued, "
+            f"{delivery.get('in_flight', 0)} in flight, {delivery.get('delivered', 0)} delivered, "
+            f"{delivery.get('failed', 0)} failed, {delivery.get('skipped', 0)} skipped (busy), "
+            f"{delivery.get('dropped', 0)} dropped"
+        )
+        if delivery.get("coalesce_window"):
+            print(
+                f"  Coalescing: {delivery['coalesce_window']:g}s window, "
+                f"{delivery.get('holding', 0)} held, {delivery.get('coalesced', 0)} merged"
+            )
+        if latency:
+            print(
+                f"  Latency: queue avg {latency['queue_avg']:.0f}ms (max {latency['queue_max']:.0f}ms), "
+                f"delivery avg {latency['delivery_avg']:.0f}ms (max {latency['delivery_max']:.0f}ms)"
+            )
+        print()
+
+    budget = result.get("budget")
+    if budget:
+        if budget.get("known"):
+            reset = time.strftime("%Y-%m-%d %H:%M", time.localtime(budget["reset"])) if budget["reset"] else "?"
+            print(
+                f"Pushover budget: {budget['remaining']}/{budget['limit']} messages left until {reset} "
+                f"({budget['reserve']} reserved for emergencies), "
+                f"{budget['tokens']:g}/{budget['burst']} tokens"
+            )
+        else:
+            print("Pushover budget: unknown until the first message is sent")
+        if budget.get("deferred") or budget.get("dropped"):
+            print(f"  {budget['deferred']} deferral(s), {budget['dropped']} dropped for the reserve")
+        print()
+
+    breaker = result.get("breaker")
+    if breaker and breaker.get("state") != "closed":
+        print(
+            f"Pushover circuit {breaker['state'].replace('_', '-')} after {breaker['failures']} failure(s), "
+            f"probing in {breaker.get('retry_in', 0):.0f}s"
+        )
+        print()
+
+    outbox = result.get("outbox")
+    if outbox and (outbox.get("pending") or outbox.get("retried")):
+        next_retry = outbox.get("next_retry_in")
+        print(
+            f"Outbox: {outbox['pending']} awaiting retry"
+            + (f" (next in {next_retry:.0f}s)" if next_retry is not None else "")
+            + f", {outbox['retried']} retried, {outbox['abandoned']} abandoned"
+        )
+        print()
+
     if not pending:
         print("No pending escalations.")
     else:
@@ -151,6 +234,24 @@ def cmd_unregister(client: EscalationClient, args: argparse.Namespace) -> int:
         return 1
 
 
+def cmd_summary(client: EscalationClient, args: argparse.Namespace) -> int:
+    """Show the service's incremental summary of a session's transcript."""
+    if not client.is_running():
+        print("Service is not running")
+        return 1
+
+    result = client.transcript_summary(args.session_id, args.transcript)
+    if result and result.get("status") == "ok":
+        print(f"Assistant turns: {result.get('assistant_turns', 0)}, tool uses: {result.get('tool_uses', 0)}")
+        print(f"Indexed: {result.get('offset', 0)} bytes ({result.get('parsed_bytes', 0)} parsed now)")
+        print(f"Last text: {result.get('text') or '(none)'}")
+        return 0
+    else:
+        message = result.get("message") if result else "no response"
+        print(f"Failed to summarize transcript: {message}", file=sys.stderr)
+        return 1
+
+
 def cmd_add(client: EscalationClient, args: argparse.Namespace) -> int:
     """Add an escalation manually."""
     result = client.add_escalation(
@@ -158,10 +259,14 @@ def cmd_add(client: EscalationClient, args: argparse.Namespace) -> int:
         message=args.message,
         delays=args.delays,
         auto_start=True,
+        mode=args.mode,
     )
 
     if result and result.get("status") == "ok":
-        print(f"Added escalation: {args.escalation_id}")
+        if result.get("added") is False:
+            print(f"Escalation already pending, unchanged: {args.escalation_id}")
+        else:
+            print(f"Added escalation: {args.escalation_id}")
         return 0
     else:
         print("Failed to add escalation", file=sys.stderr)
@@ -169,22 +274,70 @@ def cmd_add(client: EscalationClient, args: argparse.Namespace) -> int:
 
 
 def cmd_cancel(client: EscalationClient, args: argparse.Namespace) -> int:
-    """Cancel an escalation."""
+    """Cancel escalations by ID, prefix or PID in a single batch request."""
     if not client.is_running():
         print("Service is not running")
         return 1
 
-    result = client.cancel_escalation(args.escalation_id)
-    if result and result.get("status") == "ok":
-        if result.get("cancelled"):
-            print(f"Cancelled escalation: {args.escalation_id}")
-        else:
-            print(f"No escalation found with ID: {args.escalation_id}")
-        return 0
-    else:
+    operations = [{"command": "cancel", "escalation_id": eid} for eid in args.escalation_ids]
+    if args.prefix is not None:
+        operations.append({"command": "cancel", "prefix": args.prefix})
+    if args.pid is not None:
+        operations.append({"command": "cancel", "pid": args.pid})
+    if not operations:
+        print("Nothing to cancel: give an ID, --prefix or --pid", file=sys.stderr)
+        return 1
+
+    result = client.batch(operations)
+    if not result or result.get("status") != "ok":
         print("Failed to cancel escalation", file=sys.stderr)
         return 1
 
+    for op, outcome in zip(operations, result.get("results", [])):
+        if outcome.get("status") != "ok":
+            print(f"Error: {outcome.get('message')}", file=sys.stderr)
+            continue
+        cancelled = outcome.get("cancelled")
+        if "escalation_id" in op:
+            if cancelled:
+                print(f"Cancelled escalation: {op['escalation_id']}")
+            else:
+                print(f"No escalation found with ID: {op['escalation_id']}")
+        else:
+            selector = f"prefix={op['prefix']}" if "prefix" in op else f"pid={op['pid']}"
+            print(f"Cancelled {len(cancelled)} escalation(s) matching {selector}")
+            for eid in cancelled:
+                print(f"  {eid}")
+    return 0
+
+
+def cmd_pipe(client: EscalationClient, _args: argparse.Namespace) -> int:
+    """Send JSON commands from stdin over one pipelined connection."""
+    commands = []
+    for lineno, line in enumerate(sys.stdin, 1):
+        if not line.strip():
+            continue
+        try:
+            commands.append(json.loads(line))
+        except json.JSONDecodeError as e:
+            print(f"Invalid JSON on line {lineno}: {e}", file=sys.stderr)
+            return 1
+
+    conn = client.open_connection()
+    if not conn:
+        print("Service is not running")
+        return 1
+
+    with conn:
+        responses = conn.pipeline(commands)
+
+    failed = 0
+    for response in responses:
+        if response is None:
+            failed += 1
+        print(json.dumps(response))
+    return 1 if failed else 0
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -201,7 +354,12 @@ def main():
     subparsers.add_parser("stop", help="Stop the service")
 
     # status command
-    subparsers.add_parser("status", help="Show service status")
+    status_parser = subparsers.add_parser("status", help="Show service status")
+    status_parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Only report liveness and pending count from the status page (no socket)",
+    )
 
     # add command
     add_parser = subparsers.add_parser("add", help="Add an escalation")
@@ -213,10 +371,19 @@ def main():
         default=None,
         help="Comma-separated delays in seconds (default: 60,3600)",
     )
+    add_parser.add_argument(
+        "--mode",
+        choices=ADD_MODES,
+        default=None,
+        help="If the ID is already pending: restart its timers (replace, default), "
+        "keep them (if_absent), or keep them and add missing delays (extend)",
+    )
 
     # cancel command
-    cancel_parser = subparsers.add_parser("cancel", help="Cancel an escalation")
-    cancel_parser.add_argument("escalation_id", help="ID of the escalation to cancel")
+    cancel_parser = subparsers.add_parser("cancel", help="Cancel escalations")
+    cancel_parser.add_argument("escalation_ids", nargs="*", metavar="escalation_id", help="IDs of escalations to cancel")
+    cancel_parser.add_argument("--prefix", help="Cancel every escalation whose ID starts with PREFIX")
+    cancel_parser.add_argument("--pid", type=int, help="Cancel every escalation of sessions registered with PID")
 
     # register command
     register_parser = subparsers.add_parser("register", help="Register a session with PID tracking")
@@ -227,8 +394,16 @@ def main():
     unregister_parser = subparsers.add_parser("unregister", help="Unregister a session")
     unregister_parser.add_argument("--session-id", dest="session_id", help="Session ID to unregister (default: oldest)")
 
+    # summary command
+    summary_parser = subparsers.add_parser("summary", help="Summarize a session's transcript")
+    summary_parser.add_argument("session_id", help="Session ID")
+    summary_parser.add_argument("--transcript", help="Transcript path (needed unless the session registered with one)")
+
+    # pipe command
+    subparsers.add_parser("pipe", help="Pipeline JSON commands from stdin over one connection")
+
     args = parser.parse_args()
-    client = EscalationClient()
+    client = EscalationClient(persistent=True)
 
     commands = {
         "start": cmd_start,
@@ -238,6 +413,8 @@ def main():
         "cancel": cmd_cancel,
         "register": cmd_register,
         "unregister": cmd_unregister,
+        "summary": cmd_summary,
+        "pipe": cmd_pipe,
     }
 
     return commands[args.command](client, args)
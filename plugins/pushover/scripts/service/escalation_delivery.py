@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Escalation Delivery - Notification delivery queue off the scheduler thread.
+
+The scheduler hands due notifications to a DeliveryQueue and goes straight
+back to its timers; a small pool of worker threads does the slow part
+(busy check, Pushover request). The queue is bounded and ordered by
+priority, so emergency escalations (priority 2) are delivered first and are
+the last to be dropped when the queue overflows.
+
+With a coalescing window, a notification is held for that many seconds
+before it becomes deliverable; notifications of the same priority that
+arrive meanwhile join it, and the group is delivered as one Notification
+whose coalesced list holds the others. Several sessions blocking together
+then cost one Pushover request and one phone alert instead of one each.
+Emergencies (priority 2) are never held: they are queued at once.
+
+An optional MessageBudget (see escalation_budget) is consulted before each
+delivery; notifications it defers go back to the holding area until the
+budget allows them, and those it refuses are dropped.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Union
+
+from escalation_budget import DEFER, DROP, EMERGENCY_PRIORITY, MessageBudget
+
+DELIVERY_WORKERS = 2
+DELIVERY_QUEUE_SIZE = 256
+LATENCY_WINDOW = 100  # Recent deliveries averaged in stats()
+COALESCE_WINDOW = 2.0  # Seconds a notification waits for others of its priority (0 disables)
+COALESCE_MAX = 20  # A group this large is released without waiting out the window
+
+SKIPPED = "skipped"  # deliver() result: nothing needed sending (e.g. every session busy)
+
+
+@dataclass
+class Notification:
+    """A notification waiting for delivery."""
+    escalation_id: str
+    message: str
+    priority: int
+    title: str = ""  # Empty: the service picks one by priority
+    fire_time: float = field(default_factory=time.time)  # With escalation_id, identifies it in the outbox
+    enqueued_at: float = field(default_factory=time.monotonic)
+    # Same-priority notifications merged into this one by the coalescing window
+    coalesced: list["Notification"] = field(default_factory=list)
+
+    @property
+    def group(self) -> list["Notification"]:
+        """This notification followed by the ones coalesced into it."""
+        return [self, *self.coalesced]
+
+
+class DeliveryQueue:
+    """Bounded priority queue drained by a pool of worker threads.
+
+    deliver(notification) runs on a worker; returning False (or raising)
+    counts the delivery as failed, returning SKIPPED counts it as skipped
+    (neither delivered nor in the latency figures). on_drop(group, reason) is told about every
+    notification the queue gives up on, reason "overflow" (queue full) or
+    "budget" (emergency reserve); it runs with the queue lock held and must
+    not call back into the queue.
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[Notification], Optional[Union[bool, str]]],
+        logger: logging.Logger,
+        workers: int = DELIVERY_WORKERS,
+        maxsize: int = DELIVERY_QUEUE_SIZE,
+        coalesce: float = COALESCE_WINDOW,
+        budget: Optional[MessageBudget] = None,
+        on_drop: Optional[Callable[[list[Notification], str], None]] = None,
+    ):
+        self.deliver = deliver
+        self.on_drop = on_drop
+        self.logger = logger
+        self.maxsize = maxsize
+        self.coalesce = coalesce
+        self.budget = budget
+        # Coalescing groups and deferred notifications:
+        # {(priority, title): (release time, first notification)}
+        self.holding: dict[tuple[int, str], tuple[float, Notification]] = {}
+        # Heap of (-priority, sequence, notification): highest priority first, FIFO within one
+        self.heap: list[tuple[int, int, Notification]] = []
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.running = True
+        self.in_flight = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.failed = 0
+        self.skipped = 0
+        self.coalesced = 0
+        # Deferred by the budget when the queue shut down, handed back by shutdown()
+        self.undelivered: list[Notification] = []
+        # (seconds queued, seconds delivering) of recent deliveries
+        self.latencies: deque[tuple[float, float]] = deque(maxlen=LATENCY_WINDOW)
+        self.threads = [
+            threading.Thread(target=self._worker, name=f"delivery-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, notification: Notification) -> bool:
+        """Queue a notification. Returns False if it was dropped.
+
+        With a coalescing window the notification is held (or joins the held
+        group of its priority) and True is returned; the group is queued when
+        the window closes. Emergencies are never held.
+        """
+        with self.condition:
+            if not self.running:
+                return False
+            if self.coalesce <= 0 or notification.priority >= EMERGENCY_PRIORITY:
+                return self._push(notification)
+            first = self._hold(notification, time.monotonic() + self.coalesce)
+            if len(first.group) >= COALESCE_MAX:
+                del self.holding[(first.priority, first.title)]
+                return self._push(first)
+            return True
+
+    def _hold(self, notification: Notification, release_at: float) -> Notification:
+        """Hold a notification until release_at, merging it into the open
+        group of its priority and title (lock held). Returns the group's first
+        notification; a group is released at the latest of its members' times.
+        """
+        key = (notification.priority, notification.title)
+        held = self.holding.get(key)
+        if held is None:
+            self.holding[key] = (release_at, notification)
+            self.condition.notify()
+            return notification
+        group_release, first = held
+        members = notification.group
+        notification.coalesced = []
+        first.coalesced.extend(members)
+        self.coalesced += len(members)
+        if release_at > group_release:
+            self.holding[key] = (release_at, first)
+        return first
+
+    def _push(self, notification: Notification) -> bool:
+        """Make a notification deliverable (lock held). Returns False if it was dropped.
+
+        When the queue is full, the lowest-priority (then newest) queued
+        notification is evicted if the new one outranks it; otherwise the
+        new one is dropped.
+        """
+        entry = (-notification.priority, next(self.sequence), notification)
+        if len(self.heap) >= self.maxsize:
+            lowest = max(self.heap)
+            if entry >= lowest:
+                self._drop(notification)
+                return False
+            self.heap.remove(lowest)
+            heapq.heapify(self.heap)
+            self._drop(lowest[2])
+        heapq.heappush(self.heap, entry)
+        self.condition.notify()
+        return True
+
+    def _drop(self, notification: Notification, reason: str = "overflow") -> None:
+        """Record a drop and report it to on_drop (lock held)."""
+        self.dropped += len(notification.group)
+        cause = "Delivery queue full" if reason == "overflow" else "Message budget at emergency reserve"
+        self.logger.warning(
+            f"{cause}, dropped notification for "
+            f"{', '.join(n.escalation_id for n in notification.group)} (priority {notification.priority})"
+        )
+        if self.on_drop:
+            try:
+                self.on_drop(notification.group, reason)
+            except Exception as e:
+                self.logger.error(f"Drop handler failed: {e}")
+
+    def _release_held(self, now: float) -> Optional[float]:
+        """Queue coalescing groups whose window has closed (lock held).
+
+        Everything is released once the queue is shutting down. Returns
+        the seconds until the next group is due, or None if none is held.
+        """
+        next_release = None
+        for key, (release_at, first) in list(self.holding.items()):
+            if release_at <= now or not self.running:
+                del self.holding[key]
+                self._push(first)
+            elif next_release is None or release_at - now < next_release:
+                next_release = release_at - now
+        return next_release
+
+    def _next_admitted(self) -> Optional[Notification]:
+        """Wait for a notification the budget lets through (lock held).
+
+        Returns None once shut down and drained.
+        """
+        while True:
+            wait = self._release_held(time.monotonic()) if self.holding else None
+            if self.heap:
+                _, _, notification = heapq.heappop(self.heap)
+                if self.budget is None:
+                    return notification
+                decision, delay = self.budget.admit(notification.priority)
+                if decision == DEFER and self.running:
+                    self.logger.info(
+                        f"Message budget low, deferring {len(notification.group)} notification(s) "
+                        f"(priority {notification.priority}) for {delay:.0f}s"
+                    )
+                    self._hold(notification, time.monotonic() + delay)
+                    continue
+                if decision == DEFER:
+                    self.undelivered.extend(notification.group)
+                    continue
+                if decision == DROP:
+                    self._drop(notification, "budget")
+                    continue
+                return notification
+            if not self.running and not self.holding:
+                return None
+            self.condition.wait(wait)
+
+    def _worker(self) -> None:
+        """Deliver queued notifications until shut down and drained."""
+        while True:
+            with self.condition:
+                notification = self._next_admitted()
+                if notification is None:
+                    return
+                self.in_flight += 1
+                if self.holding:
+                    self.condition.notify()  # Hand the coalescing timer to an idle worker
+
+            started = time.monotonic()
+            try:
+                result = self.deliver(notification)
+            except Exception as e:
+                result = False
+                self.logger.error(f"Delivery error for {notification.escalation_id}: {e}")
+            finished = time.monotonic()
+
+            with self.condition:
+                self.in_flight -= 1
+                if result == SKIPPED:
+                    self.skipped += 1
+                    continue
+                if result is not False:
+                    self.delivered += 1
+                else:
+                    self.failed += 1
+                self.latencies.append((started - notification.enqueued_at, finished - started))
+
+    def stats(self) -> dict:
+        """Queue depth, counters and recent latency for the status command."""
+        with self.condition:
+            queued = [n for _, _, n in self.heap]
+            held = [first for _, first in self.holding.values()]
+            latencies = list(self.latencies)
+            stats = {
+                "workers": len(self.threads),
+                "depth": len(queued),
+                "max_depth": self.maxsize,
+                "in_flight": self.in_flight,
+                "delivered": self.delivered,
+                "failed": self.failed,
+                "skipped": self.skipped,
+                "dropped": self.dropped,
+                "coalesce_window": self.coalesce,
+                "holding": sum(len(first.group) for first in held),
+                "coalesced": self.coalesced,
+            }
+        now = time.monotonic()
+        stats["oldest_queued_ms"] = round(max((now - n.enqueued_at for n in queued), default=0) * 1000, 1)
+        if latencies:
+            waits = [w for w, _ in latencies]
+            sends = [s for _, s in latencies]
+            stats["latency_ms"] = {
+                "queue_avg": round(sum(waits) / len(waits) * 1000, 1),
+                "queue_max": round(max(waits) * 1000, 1),
+                "delivery_avg": round(sum(sends) / len(sends) * 1000, 1),
+                "delivery_max": round(max(sends) * 1000, 1),
+            }
+        return stats
+
+    def shutdown(self, timeout: Optional[float] = 5.0) -> list[Notification]:
+        """Stop accepting notifications and let workers drain the queue.
+
+        Returns the notifications that could not be delivered in time or
+        were still deferred by the budget.
+        """
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self.threads:
+            thread.join(None if deadline is None else max(0, deadline - time.monotonic()))
+        with self.condition:
+            undelivered = self.undelivered + [m for _, _, n in self.heap for m in n.group]
+            undelivered += [m for _, first in self.holding.values() for m in first.group]
+            if undelivered:
+                self.logger.warning(f"Delivery queue shut down with {len(undelivered)} undelivered notification(s)")
+            return undelivered
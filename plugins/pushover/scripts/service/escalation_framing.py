@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Escalation Framing - Length-prefixed framing shared by client and service.
+
+A frame is a 4-byte big-endian header followed by its payload. The low 31
+bits of the header are the payload length; the high bit (FLAG_MORE) marks a
+chunk of a streamed message that continues in the next frame. Streamed
+messages are only sent to peers that negotiated them (see escalation_codec).
+
+FrameReader receives with recv_into() into one reusable buffer and hands out
+memoryviews of complete payloads, so a frame is never copied between the
+socket and the decoder. Writers send header and payload with scatter/gather
+I/O instead of concatenating them.
+"""
+
+import json
+import socket
+import struct
+import time
+from typing import Iterator
+
+MAX_MESSAGE_SIZE = 1024 * 1024  # 1MB per frame
+MAX_STREAM_SIZE = 64 * 1024 * 1024  # 64MB per streamed message
+STREAM_CHUNK_SIZE = 64 * 1024
+FLAG_MORE = 0x80000000
+LENGTH_MASK = 0x7FFFFFFF
+
+_HEADER = struct.Struct("!I")
+
+
+class FramingError(ValueError):
+    """Raised when the peer violates the framing rules."""
+
+
+def frame_header(length: int, more: bool = False) -> bytes:
+    """Header for a payload of the given length."""
+    return _HEADER.pack(length | FLAG_MORE if more else length)
+
+
+def encode_frame(payload: bytes) -> bytes:
+    """Prefix a payload with its length (single, unstreamed frame)."""
+    return _HEADER.pack(len(payload)) + payload
+
+
+def send_frames(sock: socket.socket, frames: list) -> None:
+    """Send buffers with scatter/gather I/O, handling partial sends."""
+    views = [memoryview(f) for f in frames if len(f)]
+    while views:
+        sent = sock.sendmsg(views)
+        while sent:
+            if sent >= len(views[0]):
+                sent -= len(views[0])
+                views.pop(0)
+            else:
+                views[0] = views[0][sent:]
+                sent = 0
+
+
+def stream_json(message: dict, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Encode a message as one or more frames without building it in one piece.
+
+    Small messages produce a single ordinary frame; larger ones are split
+    into FLAG_MORE chunks of about chunk_size bytes.
+    """
+    pending: list[str] = []
+    pending_size = 0
+    previous: bytes | None = None
+    for piece in json.JSONEncoder().iterencode(message):
+        pending.append(piece)
+        pending_size += len(piece)
+        if pending_size >= chunk_size:
+            if previous is not None:
+                yield frame_header(len(previous), more=True) + previous
+            previous = "".join(pending).encode("utf-8")
+            pending.clear()
+            pending_size = 0
+    tail = "".join(pending).encode("utf-8")
+    if previous is None:
+        yield encode_frame(tail)
+        return
+    if tail:
+        yield frame_header(len(previous), more=True) + previous
+        previous = tail
+    yield frame_header(len(previous)) + previous
+
+
+class FrameReader:
+    """Incremental frame reader over a reusable receive buffer.
+
+    Use fill() with non-blocking sockets and next_message() to drain complete
+    messages, or read_message() on blocking sockets. Returned memoryviews
+    stay valid until the next fill().
+    """
+
+    def __init__(self, capacity: int = 65536):
+        self.buffer = bytearray(capacity)
+        self.view = memoryview(self.buffer)
+        self.start = 0  # First unread byte
+        self.end = 0    # One past the last received byte
+        self._chunks: bytearray | None = None  # Streamed message being assembled
+
+    def fill(self, sock: socket.socket) -> int:
+        """Receive once into the buffer. Returns bytes read (0 on EOF)."""
+        if self.end == len(self.buffer):
+            self._make_room()
+        n = sock.recv_into(self.view[self.end:])
+        self.end += n
+        return n
+
+    def _make_room(self, needed: int = 0) -> None:
+        """Move unread data to the front, growing the buffer if it cannot hold needed bytes."""
+        unread = self.end - self.start
+        required = max(needed, unread + 1)
+        if required > len(self.buffer):
+            # Allocate a new buffer rather than resizing in place: views
+            # handed out earlier stay valid, and resizing an exported
+            # bytearray would fail anyway.
+            capacity = len(self.buffer)
+            while capacity < required:
+                capacity *= 2
+            buffer = bytearray(capacity)
+            buffer[:unread] = self.view[self.start:self.end]
+            self.buffer = buffer
+            self.view = memoryview(buffer)
+        elif self.start:
+            self.view[:unread] = self.view[self.start:self.end]
+        self.start = 0
+        self.end = unread
+
+    def next_message(self) -> memoryview | None:
+        """Return the next complete message, or None if more data is needed."""
+        while True:
+            available = self.end - self.start
+            if available < 4:
+                return None
+            header = _HEADER.unpack_from(self.buffer, self.start)[0]
+            length = header & LENGTH_MASK
+            if length > MAX_MESSAGE_SIZE:
+                raise FramingError(f"frame too large: {length} bytes")
+            if available < 4 + length:
+                if self.start + 4 + length > len(self.buffer):
+                    self._make_room(4 + length)
+                return None
+
+            payload = self.view[self.start + 4:self.start + 4 + length]
+            self.start += 4 + length
+            if self.start == self.end:
+                self.start = self.end = 0
+
+            if header & FLAG_MORE:
+                if self._chunks is None:
+                    self._chunks = bytearray()
+                self._chunks += payload
+                if len(self._chunks) > MAX_STREAM_SIZE:
+                    raise FramingError("streamed message too large")
+                continue
+            if self._chunks is not None:
+                self._chunks += payload
+                message, self._chunks = memoryview(self._chunks), None
+                return message
+            return payload
+
+    def read_message(self, sock: socket.socket, expires_at: float | None = None) -> memoryview | None:
+        """Block until a complete message arrives. Returns None on EOF.
+
+        With expires_at (a time.monotonic() value) the whole read, however
+        many recv calls it takes, raises socket.timeout past that instant.
+        """
+        while True:
+            message = self.next_message()
+            if message is not None:
+                return message
+            if expires_at is not None:
+                remaining = expires_at - time.monotonic()
+                if remaining <= 0:
+                    raise socket.timeout("deadline expired")
+                sock.settimeout(remaining)
+            if not self.fill(sock):
+                return None
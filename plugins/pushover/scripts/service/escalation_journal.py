@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Escalation Journal - Crash-safe persistence of pending escalations.
+
+The scheduler records every change to an escalation's pending timers (add,
+cancel, fire, restore) in an append-only write-ahead journal next to the
+socket (escalation.journal). Each record holds the escalation's complete
+pending state afterwards, one JSON array per line:
+
+    ["add", escalation_id, [[fire_time, priority, delay, message], ...]]
+
+so replaying is "last record per ID wins", and replaying a record twice is
+harmless. Records reach the kernel immediately (they survive a crash of the
+service) and are fsynced in batches by a background thread (group commit).
+
+Every JOURNAL_SNAPSHOT_RECORDS records, and on shutdown, the whole pending
+state is written to escalation.snapshot (atomically, via rename). The
+scheduler hands over its state with its lock held; the journal is then
+rotated to escalation.journal.old at once, and the background thread
+writes the snapshot and removes the rotated journal, so no fsync happens
+under the scheduler lock. Startup loads the snapshot, then the rotated
+journal (if a snapshot was interrupted) and the journal on top.
+Replay decodes only the last record of each escalation, in a single
+json.loads() call, so replaying 100k records takes a small fraction of a
+second (see benchmarks/bench_journal.py).
+
+Timers that fell due while the service was down are handled by a catch-up
+policy (see catch_up()); timers overdue by more than CATCH_UP_MAX_STALE
+times their delay are dropped under every policy.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+JOURNAL_SNAPSHOT_RECORDS = 10000  # Compact into a snapshot after this many records
+JOURNAL_FSYNC_INTERVAL = 0.1  # Seconds between batched fsyncs
+CATCH_UP_POLICIES = ("fire", "latest", "skip")
+CATCH_UP_MAX_STALE = 2.0  # Drop timers overdue by more than this many times their delay
+
+# Pending state: {escalation_id: [[fire_time, priority, delay, message], ...]}
+JournalState = dict[str, list[list]]
+
+
+def rotated_path(path: Path) -> Path:
+    """Where the journal is moved while its records are being snapshotted."""
+    return path.with_name(path.name + ".old")
+
+
+def journal_paths(socket_path: Path) -> tuple[Path, Path]:
+    """(journal, snapshot) locations for a service socket."""
+    return (
+        socket_path.with_name(socket_path.stem + ".journal"),
+        socket_path.with_name(socket_path.stem + ".snapshot"),
+    )
+
+
+def replay_records(data: bytes) -> tuple[JournalState, int]:
+    """Final pending state per escalation ID in journal data, and the record count.
+
+    Only the last record of each ID matters, so lines are first bucketed by
+    their raw ID bytes and only the surviving lines are decoded, in a single
+    json.loads() call. Lines that are not complete records (a write torn by a
+    crash) are ignored.
+    """
+    latest: dict[bytes, bytes] = {}
+    escaped: list[bytes] = []  # IDs with JSON escapes cannot be bucketed by their bytes
+    count = 0
+    for line in data.splitlines():
+        start = line.find(b'","') + 2  # ["op","id",[...]]
+        end = line.find(b'",[', start)
+        if start < 2 or end < 0 or not line.endswith(b"]"):
+            continue
+        count += 1
+        key = line[start:end]
+        if b"\\" in key:
+            escaped.append(line)
+        else:
+            latest[key] = line
+    lines = [*latest.values(), *escaped]
+    if not lines:
+        return {}, 0
+    try:
+        records = json.loads(b"[" + b",".join(lines) + b"]")
+    except ValueError:
+        # A damaged line survived the cheap check: decode one by one
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                count -= 1
+    state: JournalState = {}
+    for record in records:
+        try:
+            _, escalation_id, events = record
+        except (TypeError, ValueError):
+            continue
+        state[escalation_id] = events
+    return state, count
+
+
+def catch_up(
+    state: JournalState, now: float, policy: str, max_stale: float = CATCH_UP_MAX_STALE
+) -> tuple[JournalState, int]:
+    """Apply a catch-up policy to timers that became due while the service was down.
+
+    - "fire": fire every overdue timer now (the delivery queue coalesces them)
+    - "latest": fire only the last overdue timer of each escalation, e.g. the
+      1-hour escalation and not the 1-minute one it superseded
+    - "skip": drop overdue timers; only future timers are restored
+
+    Whatever the policy, a timer overdue by more than max_stale times its
+    delay is dropped (0 keeps them all): after a night of downtime a
+    1-minute reminder, or an emergency alert for a session long gone, is
+    noise. Returns the new state and the number of overdue timers dropped.
+    """
+    if policy not in CATCH_UP_POLICIES:
+        raise ValueError(f"unknown catch-up policy: {policy}")
+    result: JournalState = {}
+    dropped = 0
+    for escalation_id, events in state.items():
+        overdue = [e for e in events if e[0] <= now]
+        future = [e for e in events if e[0] > now]
+        if max_stale > 0:
+            fresh = [e for e in overdue if now - e[0] <= max_stale * e[2]]
+            dropped += len(overdue) - len(fresh)
+            overdue = fresh
+        if policy == "latest" and overdue:
+            dropped += len(overdue) - 1
+            overdue = overdue[-1:]
+        elif policy == "skip":
+            dropped += len(overdue)
+            overdue = []
+        kept = overdue + future
+        if kept:
+            result[escalation_id] = kept
+    return result, dropped
+
+
+class EscalationJournal:
+    """Write-ahead journal plus snapshot of the scheduler's pending timers."""
+
+    def __init__(
+        self,
+        path: Path,
+        snapshot_path: Path,
+        logger: logging.Logger,
+        snapshot_records: int = JOURNAL_SNAPSHOT_RECORDS,
+    ):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.logger = logger
+        self.snapshot_records = snapshot_records
+        self.records = 0  # Records in the journal since the last snapshot
+        self.dirty = False
+        self.rotated = rotated_path(path)
+        # The rotated journal while its snapshot is outstanding (None otherwise)
+        self.rotated_fd: Optional[int] = None
+        self.pending: Optional[JournalState] = None  # Snapshot for the background thread to write
+        self.condition = threading.Condition()
+        self.running = True
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o600)
+        size = os.fstat(self.fd).st_size
+        if size and os.pread(self.fd, 1, size - 1) != b"\n":
+            os.write(self.fd, b"\n")  # Terminate a record torn by a crash
+        if self.rotated.exists():
+            # An earlier snapshot never completed: the next one retires this file
+            self.rotated_fd = os.open(self.rotated, os.O_RDONLY)
+        self.thread = threading.Thread(target=self._flusher, name="journal", daemon=True)
+        self.thread.start()
+
+    def load(self) -> JournalState:
+        """Pending state from the snapshot and the journal records after it (rotated ones first)."""
+        state: JournalState = {}
+        try:
+            state = json.loads(self.snapshot_path.read_bytes())["escalations"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.logger.error(f"Ignoring unreadable snapshot {self.snapshot_path}: {e}")
+        records = 0
+        for path in (self.rotated, self.path):
+            try:
+                replayed, count = replay_records(path.read_bytes())
+            except OSError:
+                continue
+            records += count
+            for escalation_id, events in replayed.items():
+                if events:
+                    state[escalation_id] = events
+                else:
+                    state.pop(escalation_id, None)
+        with self.condition:
+            self.records = records
+        return state
+
+    def record(self, op: str, escalation_id: str, events: list[list]) -> None:
+        """Append an escalation's pending state after an operation."""
+        line = json.dumps([op, escalation_id, events], separators=(",", ":")) + "\n"
+        with self.condition:
+            os.write(self.fd, line.encode("utf-8"))
+            self.records += 1
+            if not self.dirty:
+                self.dirty = True
+                self.condition.notify()
+
+    @property
+    def wants_snapshot(self) -> bool:
+        return self.records >= self.snapshot_records
+
+    def snapshot(self, state: JournalState) -> None:
+        """Hand the complete pending state to the background thread to persist.
+
+        state must reflect every record written so far (the scheduler calls
+        this with its lock held). Only the journal rotation happens here.
+        Replaying records that a snapshot already contains yields the same
+        state, so a rotated journal is only removed once a snapshot taken
+        after it was written; while one is outstanding, later snapshots
+        just replace the pending state.
+        """
+        with self.condition:
+            if self.rotated_fd is None:
+                os.replace(self.path, self.rotated)
+                self.rotated_fd = self.fd
+                self.fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o600)
+            self.pending = state
+            self.records = 0
+            self.condition.notify()
+
+    def _write_snapshot(self, state: JournalState) -> None:
+        """Write a snapshot atomically and retire the rotated journal it covers."""
+        tmp = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")  # Not shared with other runtime files
+        data = json.dumps({"written_at": time.time(), "escalations": state}, separators=(",", ":"))
+        with open(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w", encoding="utf-8") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        with self.condition:
+            if self.rotated_fd is not None:
+                os.close(self.rotated_fd)
+                self.rotated_fd = None
+                self.rotated.unlink(missing_ok=True)
+
+    def _flusher(self) -> None:
+        """Write handed-over snapshots and fsync appended records every JOURNAL_FSYNC_INTERVAL."""
+        while True:
+            with self.condition:
+                while self.running and not self.dirty and self.pending is None:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                state, self.pending = self.pending, None
+            if state is not None:
+                try:
+                    self._write_snapshot(state)
+                except OSError as e:
+                    # The rotated journal stays; the next snapshot retries
+                    self.logger.warning(f"Journal snapshot failed: {e}")
+                continue
+            time.sleep(JOURNAL_FSYNC_INTERVAL)  # Let more records join this fsync
+            with self.condition:
+                if self.dirty:
+                    self.dirty = False
+                    try:
+                        os.fsync(self.fd)
+                    except OSError as e:
+                        self.logger.warning(f"Journal fsync failed: {e}")
+
+    def close(self, state: Optional[JournalState] = None) -> None:
+        """Stop the flusher, writing a final snapshot if a state is given."""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.thread.join(timeout=2)
+        if state is not None:
+            self._write_snapshot(state)
+            os.ftruncate(self.fd, 0)  # Everything in it is in the snapshot
+        else:
+            os.fsync(self.fd)
+        os.close(self.fd)
+        if self.rotated_fd is not None:
+            os.close(self.rotated_fd)
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Escalation Loop - Single-threaded event-loop server core.
+
+Multiplexes the listening socket and every client connection on one
+selector. With no client connected the loop blocks in select() with no
+timeout, so an idle service never wakes up; shutdown requests (signals,
+commands, other threads) wake it through a self-pipe instead of polling.
+While clients are connected, select() times out when the longest-idle one
+reaches idle_timeout, and idle connections are closed.
+
+Backpressure: a connection whose unsent responses exceed MAX_OUTPUT_BUFFER
+is not read from (nor are its buffered requests handled) until the client
+catches up.
+
+Commands named in offload (slow file I/O) are handled by worker threads so
+they cannot stall every other client; the worker posts the response back
+through the self-pipe. The connection's later requests wait until that
+response is queued, so responses stay in request order.
+"""
+
+import logging
+import os
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
+
+from escalation_codec import CodecError, FrameCodec
+from escalation_framing import FrameReader, FramingError
+
+MAX_IOV = 64  # Buffers per sendmsg() call
+MAX_OUTPUT_BUFFER = 4 * 1024 * 1024  # Unsent bytes per connection before reading pauses
+LOOP_WORKERS = 2  # Threads for offloaded commands
+
+
+class _Connection:
+    """Per-client buffers for the event loop."""
+
+    __slots__ = ("sock", "codec", "reader", "outq", "outbytes", "events", "busy", "last_active")
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.codec = FrameCodec()
+        self.reader = FrameReader()
+        self.outq: deque[memoryview] = deque()  # Encoded frames not yet sent
+        self.outbytes = 0  # Bytes in outq
+        self.events = selectors.EVENT_READ  # Currently registered events
+        self.busy = False  # An offloaded request is being handled
+        self.last_active = time.monotonic()  # Last read or write progress
+
+
+class SelectorLoop:
+    """Event-loop core serving length-prefixed frames on one thread."""
+
+    def __init__(
+        self,
+        server_socket: socket.socket,
+        dispatch: Callable[[dict, FrameCodec], dict],
+        logger: logging.Logger,
+        idle_timeout: Optional[float] = None,
+        offload: Iterable[str] = (),
+    ):
+        self.server_socket = server_socket
+        self.dispatch = dispatch
+        self.logger = logger
+        self.idle_timeout = idle_timeout
+        self.offload = frozenset(offload)
+        self.selector = selectors.DefaultSelector()
+        self.connections: dict[int, _Connection] = {}
+        self.stopped = False
+        self.workers: Optional[ThreadPoolExecutor] = None  # Started on first offloaded request
+        # Responses of offloaded requests, for the loop thread to queue
+        self.completed: deque[tuple[_Connection, dict, bool]] = deque()
+        self.completed_lock = threading.Lock()
+
+        # Self-pipe: writing a byte wakes select() from any thread or signal handler
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+
+    def stop(self) -> None:
+        """Ask the loop to exit. Safe to call from signal handlers and other threads."""
+        self.stopped = True
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._wake_w == -1:
+            return
+        try:
+            os.write(self._wake_w, b"\0")
+        except (BlockingIOError, OSError):
+            pass  # Pipe full or closed: the loop is already waking up
+
+    def run(self) -> None:
+        """Serve clients until stop() is called."""
+        self.server_socket.setblocking(False)
+        self.selector.register(self.server_socket, selectors.EVENT_READ, self._accept)
+        self.selector.register(self._wake_r, selectors.EVENT_READ, self._drain_wakeup)
+
+        try:
+            while not self.stopped:
+                for key, mask in self.selector.select(self._idle_wait()):
+                    key.data(key, mask)
+                    if self.stopped:
+                        break
+                self._sweep_idle()
+        finally:
+            self._close_all()
+
+    def _idle_wait(self) -> Optional[float]:
+        """Seconds until the longest-idle connection times out (None: wait indefinitely)."""
+        if not self.idle_timeout or not self.connections:
+            return None
+        oldest = min(conn.last_active for conn in self.connections.values())
+        return max(0.0, oldest + self.idle_timeout - time.monotonic())
+
+    def _sweep_idle(self) -> None:
+        """Close connections idle for idle_timeout (not those awaiting a worker)."""
+        if not self.idle_timeout:
+            return
+        cutoff = time.monotonic() - self.idle_timeout
+        for conn in list(self.connections.values()):
+            if conn.last_active <= cutoff and not conn.busy:
+                self.logger.warning("Client connection timed out")
+                self._close(conn)
+
+    def _drain_wakeup(self, _key: selectors.SelectorKey, _mask: int) -> None:
+        """Empty the self-pipe and queue the responses workers finished."""
+        try:
+            while os.read(self._wake_r, 512):
+                pass
+        except BlockingIOError:
+            pass
+        while True:
+            with self.completed_lock:
+                if not self.completed:
+                    return
+                conn, response, binary = self.completed.popleft()
+            conn.busy = False
+            if conn.sock.fileno() == -1:
+                continue  # Closed while the worker ran
+            self._send(conn, response, binary)
+            self._process(conn)  # Requests that arrived meanwhile
+
+    def _accept(self, _key: selectors.SelectorKey, _mask: int) -> None:
+        """Accept all pending connections."""
+        while True:
+            try:
+                sock, _addr = self.server_socket.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                self.logger.error(f"Accept failed: {e}")
+                return
+            sock.setblocking(False)
+            conn = _Connection(sock)
+            self.connections[sock.fileno()] = conn
+            self.selector.register(sock, selectors.EVENT_READ, self._on_event)
+
+    def _on_event(self, key: selectors.SelectorKey, mask: int) -> None:
+        """Handle readiness on a client connection."""
+        conn = self.connections.get(key.fd)
+        if conn is None:
+            return
+        if mask & selectors.EVENT_READ:
+            self._read(conn)
+        if mask & selectors.EVENT_WRITE and conn.sock.fileno() != -1:
+            self._flush(conn)
+            self._process(conn)  # Requests held back while the output buffer was full
+
+    def _read(self, conn: _Connection) -> None:
+        """Read available data and dispatch every complete frame."""
+        try:
+            if not conn.reader.fill(conn.sock):
+                self._close(conn)
+                return
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self._close(conn)
+            return
+        conn.last_active = time.monotonic()
+        self._process(conn)
+
+    def _process(self, conn: _Connection) -> None:
+        """Dispatch buffered frames until none is left, a worker is busy or output backs up."""
+        while not conn.busy and conn.outbytes < MAX_OUTPUT_BUFFER:
+            try:
+                payload = conn.reader.next_message()
+                if payload is None:
+                    break
+                msg, binary = conn.codec.decode_request(payload)
+            except (CodecError, FramingError) as e:
+                self.logger.warning(f"Dropping client: {e}")
+                self._close(conn)
+                return
+            self._respond(conn, msg, binary)
+            if conn.sock.fileno() == -1:
+                return
+        self._update_events(conn)
+
+    def _respond(self, conn: _Connection, msg: dict, binary: bool) -> None:
+        """Dispatch one request (or hand it to a worker) and queue its response."""
+        if msg.get("command") in self.offload:
+            if self.workers is None:
+                self.workers = ThreadPoolExecutor(LOOP_WORKERS, thread_name_prefix="loop-worker")
+            conn.busy = True
+            self.workers.submit(self._work, conn, msg, binary)
+            return
+        try:
+            response = self.dispatch(msg, conn.codec)
+        except Exception as e:
+            self.logger.error(f"Error handling client: {e}")
+            self._close(conn)
+            return
+        self._send(conn, response, binary)
+
+    def _work(self, conn: _Connection, msg: dict, binary: bool) -> None:
+        """Handle an offloaded request on a worker thread and post the response to the loop."""
+        try:
+            response = self.dispatch(msg, conn.codec)
+        except Exception as e:
+            self.logger.error(f"Error handling client: {e}")
+            response = {"status": "error", "message": str(e)}
+            if "id" in msg:
+                response["id"] = msg["id"]
+        with self.completed_lock:
+            self.completed.append((conn, response, binary))
+        self._wake()
+
+    def _send(self, conn: _Connection, response: dict, binary: bool) -> None:
+        """Queue a response and write what the socket accepts."""
+        for frame in conn.codec.encode_response(response, binary):
+            conn.outq.append(memoryview(frame))
+            conn.outbytes += len(frame)
+        self._flush(conn)
+
+    def _flush(self, conn: _Connection) -> None:
+        """Write as much queued output as the socket accepts."""
+        outq = conn.outq
+        try:
+            while outq:
+                sent = conn.sock.sendmsg([outq[i] for i in range(min(len(outq), MAX_IOV))])
+                conn.outbytes -= sent
+                conn.last_active = time.monotonic()
+                while sent:
+                    if sent >= len(outq[0]):
+                        sent -= len(outq.popleft())
+                    else:
+                        outq[0] = outq[0][sent:]
+                        sent = 0
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            self._close(conn)
+            return
+        self._update_events(conn)
+
+    def _update_events(self, conn: _Connection) -> None:
+        """Register the events a connection needs now.
+
+        Writability only while output is pending; input only while no worker
+        is handling one of its requests and its output is not backed up.
+        """
+        if conn.sock.fileno() == -1:
+            return
+        events = selectors.EVENT_WRITE if conn.outq else 0
+        if not conn.busy and conn.outbytes < MAX_OUTPUT_BUFFER:
+            events |= selectors.EVENT_READ
+        if events == conn.events:
+            return
+        if conn.events and events:
+            self.selector.modify(conn.sock, events, self._on_event)
+        elif events:
+            self.selector.register(conn.sock, events, self._on_event)
+        else:
+            self.selector.unregister(conn.sock)  # Waiting on a worker
+        conn.events = events
+
+    def _close(self, conn: _Connection) -> None:
+        """Unregister and close a client connection."""
+        fd = conn.sock.fileno()
+        if fd == -1:
+            return
+        self.connections.pop(fd, None)
+        try:
+            self.selector.unregister(conn.sock)
+        except (KeyError, ValueError):
+            pass
+        conn.sock.close()
+
+    def _close_all(self) -> None:
+        """Close client connections, the selector and the self-pipe."""
+        if self.workers is not None:
+            # Running workers still write to the self-pipe: let them finish before it is closed
+            self.workers.shutdown(wait=True, cancel_futures=True)
+        for conn in list(self.connections.values()):
+            self._close(conn)
+        self.selector.close()
+        wake_r, wake_w = self._wake_r, self._wake_w
+        self._wake_r = self._wake_w = -1
+        os.close(wake_r)
+        os.close(wake_w)
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Escalation Outbox - Durable retry queue for notifications that failed.
+
+A notification whose delivery fails with a retryable error (network error,
+Pushover 5xx) is written to an append-only outbox file next to the socket
+(escalation.outbox) instead of being dropped. A retry worker hands it back
+to the delivery queue with exponential backoff and jitter until it is sent
+or OUTBOX_MAX_ATTEMPTS is reached.
+
+The file is JSON lines. A record with "due" (re)schedules an entry; a
+record with "done" retires it. Entries are keyed by escalation ID and fire
+time, so a notification is retried at most once at a time and never again
+after it was delivered. Appends are written at once and fsynced in batches
+by the worker (group commit); the file is compacted at startup and once
+retired records dominate it.
+
+Other processes (the Stop hook, when the service is not running or cannot
+take the notification) append with append_outbox() and then send the
+service an "outbox" command; the worker picks up records it did not write
+by reading the file from where it left off, on that nudge and whenever it
+wakes for a due entry. With nothing pending the worker sleeps until
+something is appended. All writers hold an exclusive flock on the file
+while appending or compacting.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+OUTBOX_BASE_BACKOFF = 5.0  # Seconds before the first retry
+OUTBOX_MAX_BACKOFF = 900.0  # Cap on the retry interval
+OUTBOX_MAX_ATTEMPTS = 10  # Give up after this many failed deliveries
+OUTBOX_FSYNC_DELAY = 0.05  # Appends within this window share one fsync
+OUTBOX_COMPACT_MIN = 1024  # Never compact smaller files
+OUTBOX_DONE_MEMORY = 4096  # Delivered keys remembered for deduplication
+
+
+def outbox_path(socket_path: Path) -> Path:
+    """Outbox file location for a service socket."""
+    return socket_path.with_name(socket_path.stem + ".outbox")
+
+
+def outbox_key(escalation_id: str, fire_time: float) -> str:
+    """Deduplication key of a notification."""
+    return f"{escalation_id}@{fire_time:.3f}"
+
+
+def backoff(attempts: int) -> float:
+    """Delay before the next retry: exponential, with jitter over its upper half."""
+    delay = min(OUTBOX_MAX_BACKOFF, OUTBOX_BASE_BACKOFF * 2 ** max(0, attempts - 1))
+    return random.uniform(delay / 2, delay)
+
+
+def _open_locked(path: Path) -> int:
+    """Open the outbox for appending with an exclusive lock, following compactions."""
+    while True:
+        fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_ino == os.stat(path).st_ino:
+                return fd
+        except FileNotFoundError:
+            pass
+        os.close(fd)  # Replaced by a compaction while we waited
+
+
+def _write_records(fd: int, data: bytes) -> None:
+    """Append to a locked outbox, first terminating a line torn by a crashed writer."""
+    size = os.fstat(fd).st_size
+    if size and os.pread(fd, 1, size - 1) != b"\n":
+        data = b"\n" + data
+    os.write(fd, data)
+
+
+def append_outbox(
+    path: Path,
+    escalation_id: str,
+    title: str,
+    message: str,
+    priority: int,
+    fire_time: float | None = None,
+    error: str = "",
+) -> None:
+    """Add a notification to the outbox from another process (durable on return)."""
+    fire_time = time.time() if fire_time is None else fire_time
+    record = {
+        "key": outbox_key(escalation_id, fire_time),
+        "escalation_id": escalation_id,
+        "title": title,
+        "message": message,
+        "priority": priority,
+        "fire_time": fire_time,
+        "attempts": 1,
+        "due": time.time() + backoff(1),
+        "error": error,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = _open_locked(path)
+    try:
+        _write_records(fd, (json.dumps(record) + "\n").encode("utf-8"))
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Outbox:
+    """Service side: the outbox file, its live entries and the retry worker.
+
+    resubmit(entry) is called on the worker thread for each entry that is
+    due; the caller reports the outcome with retry() or done().
+    """
+
+    def __init__(self, path: Path, resubmit: Callable[[dict], None], logger: logging.Logger):
+        self.path = path
+        self.resubmit = resubmit
+        self.logger = logger
+        self.entries: dict[str, dict] = {}  # Live entries by key
+        self.in_flight: set[str] = set()  # Resubmitted, outcome pending
+        self.delivered: OrderedDict[str, None] = OrderedDict()
+        self.records = 0  # Records in the file
+        self.offset = 0  # Bytes of the file applied so far
+        self.dirty = False
+        self.poked = False  # Another process appended records
+        self.retried = 0
+        self.abandoned = 0
+        self.condition = threading.Condition()
+        self.running = True
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self.condition:
+            self._read_new()
+            self._compact()
+        if self.entries:
+            self.logger.info(f"Outbox: {len(self.entries)} notification(s) awaiting retry")
+        self.thread = threading.Thread(target=self._run, name="outbox", daemon=True)
+        self.thread.start()
+
+    def _apply(self, record: dict) -> None:
+        """Apply one record to the in-memory state (lock held)."""
+        key = record.get("key")
+        if not key:
+            return
+        self.records += 1
+        if record.get("done"):
+            self.entries.pop(key, None)
+            self._remember(key)
+        elif key not in self.delivered:
+            self.entries[key] = record
+
+    def _remember(self, key: str) -> None:
+        self.delivered[key] = None
+        if len(self.delivered) > OUTBOX_DONE_MEMORY:
+            self.delivered.popitem(last=False)
+
+    def _read_new(self) -> None:
+        """Apply records appended since the last read (lock held)."""
+        try:
+            with open(self.path, "rb") as f:
+                if os.fstat(f.fileno()).st_size < self.offset:
+                    self.offset = 0  # Compacted by someone else; re-read (records are idempotent)
+                f.seek(self.offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b"\n") + 1  # Leave a partially written last line for later
+        for line in data[:end].splitlines():
+            try:
+                self._apply(json.loads(line))
+            except (ValueError, AttributeError):
+                continue  # Torn write from a crash
+        self.offset += end
+
+    def _append(self, records: list[dict]) -> None:
+        """Write records and apply them (lock held); fsync follows in the worker."""
+        fd = _open_locked(self.path)
+        try:
+            self._read_new()  # Keep offset in step with foreign appends
+            data = "".join(json.dumps(r) + "\n" for r in records).encode("utf-8")
+            _write_records(fd, data)
+            self.offset = os.fstat(fd).st_size  # Everything before our records was just read
+        finally:
+            os.close(fd)
+        for record in records:
+            self._apply(record)
+        self.dirty = True
+        self.condition.notify()
+
+    def _compact(self) -> None:
+        """Rewrite the file with live entries only (lock held)."""
+        fd = _open_locked(self.path)
+        try:
+            self._read_new()
+            tmp = self.path.with_name(self.path.name + ".tmp")  # Not shared with other runtime files
+            data = "".join(json.dumps(e) + "\n" for e in self.entries.values()).encode("utf-8")
+            with open(tmp, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            self.offset = len(data)
+            self.records = len(self.entries)
+            self.dirty = False
+        finally:
+            os.close(fd)
+
+    def retry(self, notifications: list[dict], error: str = "") -> None:
+        """Schedule failed notifications for another attempt (or give up on them).
+
+        Each item has escalation_id, title, message, priority and fire_time.
+        """
+        now = time.time()
+        records = []
+        with self.condition:
+            for n in notifications:
+                key = outbox_key(n["escalation_id"], n["fire_time"])
+                self.in_flight.discard(key)
+                if key in self.delivered:
+                    continue
+                attempts = self.entries.get(key, {}).get("attempts", 0) + 1
+                if attempts >= OUTBOX_MAX_ATTEMPTS:
+                    self.abandoned += 1
+                    self.logger.error(f"Outbox: giving up on {key} after {attempts} attempts")
+                    records.append({"key": key, "done": True})
+                    continue
+                records.append({**n, "key": key, "attempts": attempts, "due": now + backoff(attempts), "error": error})
+            if records:
+                self._append(records)
+
+    def done(self, notifications: list[dict]) -> None:
+        """Retire notifications that were delivered (or need no delivery)."""
+        with self.condition:
+            records = []
+            for n in notifications:
+                key = outbox_key(n["escalation_id"], n["fire_time"])
+                self.in_flight.discard(key)
+                if key in self.entries:
+                    records.append({"key": key, "done": True})
+                else:
+                    self._remember(key)
+            if records:
+                self._append(records)
+
+    def poke(self) -> None:
+        """Another process appended records: read them now."""
+        with self.condition:
+            self.poked = True
+            self.condition.notify()
+
+    def _run(self) -> None:
+        """Fsync batches, pick up foreign appends and resubmit due entries."""
+        while True:
+            due = []
+            with self.condition:
+                if self.dirty:
+                    self.condition.wait(OUTBOX_FSYNC_DELAY)  # Let concurrent appends join the batch
+                    self._fsync()
+                if not self.running:
+                    return
+                if self.poked:
+                    self.poked = False
+                    self._read_new()
+                if self.records >= OUTBOX_COMPACT_MIN and self.records > 2 * len(self.entries):
+                    try:
+                        self._compact()
+                    except OSError as e:
+                        self.logger.warning(f"Outbox compaction failed: {e}")
+                now = time.time()
+                next_due = None
+                for key, entry in self.entries.items():
+                    if key in self.in_flight:
+                        continue
+                    if entry["due"] <= now:
+                        due.append(entry)
+                        self.in_flight.add(key)
+                    elif next_due is None or entry["due"] < next_due:
+                        next_due = entry["due"]
+                if not due:
+                    # Without a due date (empty, or all in flight) sleep until notified
+                    if not self.condition.wait(None if next_due is None else max(0, next_due - now)):
+                        self._read_new()  # Woke for a due entry: catch up with foreign appends too
+                    continue
+            for entry in due:
+                self.retried += 1
+                self.logger.info(f"Outbox: retrying {entry['key']} (attempt {entry['attempts'] + 1})")
+                self.resubmit(entry)
+
+    def _fsync(self) -> None:
+        """Flush appended records to disk (lock held)."""
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            self.logger.warning(f"Outbox fsync failed: {e}")
+        self.dirty = False
+
+    def stats(self) -> dict:
+        """Outbox size and counters for the status command."""
+        with self.condition:
+            next_due = min((e["due"] for e in self.entries.values()), default=None)
+            return {
+                "pending": len(self.entries),
+                "in_flight": len(self.in_flight),
+                "retried": self.retried,
+                "abandoned": self.abandoned,
+                "next_retry_in": None if next_due is None else round(max(0, next_due - time.time()), 1),
+            }
+
+    def close(self) -> None:
+        """Stop the worker and make every append durable."""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.thread.join(timeout=2)
+        with self.condition:
+            if self.dirty:
+                self._fsync()
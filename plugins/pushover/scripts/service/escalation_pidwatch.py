@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Escalation PID Watch - Immediate notice when a session's process exits.
+
+Sessions register with the PID of their Claude process and are dropped when
+it exits. Polling for that (os.kill(pid, 0) every PID_CHECK_INTERVAL) lets
+a dead session linger for up to a minute, and a recycled PID keeps it alive
+indefinitely.
+
+On Linux 5.3+ PidWatcher opens a pidfd for each watched PID and waits on
+all of them with one selector thread: a pidfd becomes readable when its
+process exits, so the callback runs at once, and a pidfd refers to the
+process, not the number, so PID reuse cannot fool it. Without pidfds
+(macOS, older kernels) PidWatcher is unavailable and the service falls back
+to polling.
+"""
+
+import logging
+import os
+import selectors
+import threading
+from typing import Callable
+
+
+def pidfd_supported() -> bool:
+    """Whether this platform can watch processes through pidfds."""
+    if not hasattr(os, "pidfd_open"):
+        return False
+    try:
+        os.close(os.pidfd_open(os.getpid()))
+        return True
+    except OSError:
+        return False
+
+
+class PidWatcher:
+    """Calls on_exit(pid) on a background thread when a watched process exits.
+
+    The watched set is replaced wholesale with watch(). A PID that is
+    already gone when it is first watched is reported right away.
+    """
+
+    def __init__(self, on_exit: Callable[[int], None], logger: logging.Logger):
+        self.on_exit = on_exit
+        self.logger = logger
+        self.pids: set[int] = set()
+        self.lock = threading.Lock()
+        self.running = True
+        # Owned by the watcher thread: the selector and the open pidfds
+        self.selector = selectors.DefaultSelector()
+        self.pidfds: dict[int, int] = {}
+        self.exited: set[int] = set()  # Reported, but not yet unwatched: never reopen (the PID may be reused)
+        self.wake_r, self.wake_w = os.pipe()
+        os.set_blocking(self.wake_w, False)
+        self.selector.register(self.wake_r, selectors.EVENT_READ)
+        self.thread = threading.Thread(target=self._run, name="pidwatch", daemon=True)
+        self.thread.start()
+
+    def watch(self, pids: set[int]) -> None:
+        """Watch exactly these PIDs."""
+        with self.lock:
+            self.pids = set(pids)
+        self._wake()
+
+    def _wake(self) -> None:
+        try:
+            os.write(self.wake_w, b"x")
+        except BlockingIOError:
+            pass  # A wakeup is already pending
+
+    def _sync(self) -> list[int]:
+        """Open pidfds for newly watched PIDs and close unwatched ones; returns PIDs found dead."""
+        with self.lock:
+            pids = set(self.pids)
+        dead = []
+        self.exited &= pids
+        for pid in list(self.pidfds):
+            if pid not in pids:
+                fd = self.pidfds.pop(pid)
+                self.selector.unregister(fd)
+                os.close(fd)
+        for pid in pids - self.pidfds.keys() - self.exited:
+            try:
+                fd = os.pidfd_open(pid)
+            except ProcessLookupError:
+                self.exited.add(pid)
+                dead.append(pid)
+                continue
+            except OSError as e:
+                self.logger.warning(f"Cannot watch pid {pid}: {e}")
+                continue
+            self.pidfds[pid] = fd
+            self.selector.register(fd, selectors.EVENT_READ, pid)
+        return dead
+
+    def _run(self) -> None:
+        dead: list[int] = []
+        while True:
+            for pid in dead:
+                try:
+                    self.on_exit(pid)
+                except Exception as e:
+                    self.logger.error(f"PID exit handler failed for {pid}: {e}")
+            dead = []
+            events = self.selector.select()
+            if not self.running:
+                return
+            for key, _ in events:
+                if key.fd == self.wake_r:
+                    os.read(self.wake_r, 4096)
+                    dead.extend(self._sync())
+                else:
+                    pid = key.data
+                    self.selector.unregister(key.fd)
+                    os.close(self.pidfds.pop(pid))
+                    self.exited.add(pid)
+                    dead.append(pid)
+
+    def close(self) -> None:
+        self.running = False
+        self._wake()
+        self.thread.join(timeout=2)
+        for fd in self.pidfds.values():
+            os.close(fd)
+        self.pidfds.clear()
+        self.selector.close()
+        os.close(self.wake_r)
+        os.close(self.wake_w)
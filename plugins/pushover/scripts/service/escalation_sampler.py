@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Escalation Sampler - Background CPU and child-process sampling of sessions.
+
+Escalations are skipped while their session is busy (a tool is running):
+the Claude process used more than BUSY_CPU_PERCENT of a CPU, or it has
+child processes. Measuring that when a notification fires blocked a
+delivery worker for half a second (psutil cpu_percent(interval=0.5)) and
+walked the whole process table for every notification.
+
+ProcessSampler measures every watched PID on one background thread, once
+per interval, and keeps the latest result, so the busy check is a dict
+lookup. A tick costs, per PID, one read of /proc/<pid>/stat (CPU time since
+the previous tick) and of /proc/<pid>/task/*/children (direct children: any
+descendant implies one). Without /proc (macOS) psutil is used if it is
+installed; without either, no session is ever busy. The thread sleeps while
+no PID is watched.
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+BUSY_SAMPLE_INTERVAL = 1.0  # Seconds between samples (bounds the sampling cost)
+BUSY_CPU_PERCENT = 10.0  # CPU use above this (percent of one CPU) counts as busy
+
+PROC = "/proc"
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+@dataclass
+class ProcessSample:
+    """Latest measurement of one process."""
+    cpu: float  # Percent of one CPU over the last interval
+    children: int  # Direct child processes
+    sampled_at: float  # time.monotonic() of the measurement
+
+    @property
+    def busy(self) -> bool:
+        return self.cpu > BUSY_CPU_PERCENT or self.children > 0
+
+
+def _read_proc(pid: int) -> tuple[float, float, int]:
+    """(start time, CPU seconds, direct children) of a process from /proc. Raises OSError."""
+    with open(f"{PROC}/{pid}/stat", "rb") as f:
+        stat = f.read()
+    # The command name may contain spaces and parentheses; fields resume after the last ")"
+    fields = stat[stat.rindex(b")") + 2:].split()
+    utime, stime, start = int(fields[11]), int(fields[12]), int(fields[19])
+    children = 0
+    for tid in os.listdir(f"{PROC}/{pid}/task"):
+        try:
+            with open(f"{PROC}/{pid}/task/{tid}/children", "rb") as f:
+                children += len(f.read().split())
+        except FileNotFoundError:
+            continue  # Thread exited since listdir
+    return start, (utime + stime) / CLOCK_TICKS, children
+
+
+def _read_psutil(pid: int) -> tuple[float, float, int]:
+    """(start time, CPU seconds, direct children) of a process via psutil. Raises OSError."""
+    try:
+        proc = psutil.Process(pid)
+        with proc.oneshot():
+            times = proc.cpu_times()
+            return proc.create_time(), times.user + times.system, len(proc.children())
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess) as e:
+        raise OSError(str(e)) from e
+
+
+def sampler_backend() -> Optional[str]:
+    """"proc", "psutil" or None when processes cannot be measured here."""
+    if os.path.exists(f"{PROC}/self/task/{os.getpid()}/children"):
+        return "proc"
+    if HAS_PSUTIL:
+        return "psutil"
+    return None
+
+
+class ProcessSampler:
+    """Samples the CPU use and children of watched PIDs on a background thread.
+
+    The watched set is replaced wholesale with watch(); sample() returns the
+    latest measurement of a PID (None until it has been sampled twice, or
+    once it is gone).
+    """
+
+    def __init__(self, logger: logging.Logger, interval: float = BUSY_SAMPLE_INTERVAL):
+        self.logger = logger
+        self.interval = interval
+        self.backend = sampler_backend()
+        self.pids: set[int] = set()
+        # Previous reading per PID: (start time, CPU seconds, monotonic time)
+        self.readings: dict[int, tuple[float, float, float]] = {}
+        # Replaced, never mutated, by the sampler thread: lookups need no lock
+        self.samples: dict[int, ProcessSample] = {}
+        self.condition = threading.Condition()
+        self.running = self.backend is not None and interval > 0
+        self.thread: Optional[threading.Thread] = None
+        if self.running:
+            self.thread = threading.Thread(target=self._run, name="sampler", daemon=True)
+            self.thread.start()
+
+    def watch(self, pids: set[int]) -> None:
+        """Sample exactly these PIDs from the next tick on."""
+        with self.condition:
+            self.pids = set(pids)
+            self.condition.notify()
+
+    def sample(self, pid: int) -> Optional[ProcessSample]:
+        return self.samples.get(pid)
+
+    def _tick(self, pids: set[int]) -> None:
+        """Measure every watched PID once."""
+        read = _read_proc if self.backend == "proc" else _read_psutil
+        readings, samples = {}, {}
+        for pid in pids:
+            try:
+                start, cpu_time, children = read(pid)
+            except (OSError, ValueError, IndexError):
+                continue  # Exited (or unreadable): not busy
+            now = time.monotonic()
+            readings[pid] = (start, cpu_time, now)
+            previous = self.readings.get(pid)
+            if previous and previous[0] == start and now > previous[2]:
+                cpu = max(0.0, cpu_time - previous[1]) / (now - previous[2]) * 100
+                samples[pid] = ProcessSample(cpu, children, now)
+        self.readings = readings
+        self.samples = samples
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                while self.running and not self.pids:
+                    self.readings, self.samples = {}, {}
+                    self.condition.wait()
+                if not self.running:
+                    return
+                pids = set(self.pids)
+            started = time.monotonic()
+            try:
+                self._tick(pids)
+            except Exception as e:
+                self.logger.error(f"Process sampling failed: {e}")
+            with self.condition:
+                if self.running:
+                    self.condition.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def close(self) -> None:
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread:
+            self.thread.join(timeout=2)
@@ -3,40 +3,93 @@
 Escalation Service - Persistent notification escalation manager for Claude Code.
 
 Listens on a Unix socket for commands to add/cancel escalation timers.
-Uses a single scheduler thread with a heap for efficient timer management.
+Uses a single scheduler thread with a timer queue for efficient timer
+management: a heap (default) or a hierarchical timing wheel (--scheduler).
 
-Commands (JSON over socket with 4-byte length prefix):
+Commands (JSON over socket with 4-byte length prefix; see escalation_codec
+for the negotiated binary encoding of ping/add/cancel):
+- hello: Negotiate the wire protocol version
+- ping: Liveness check
 - add: Start escalation timers for a session
 - cancel: Cancel pending timers for a session
-- status: Return list of pending escalations
+- batch: Apply many add/cancel operations (including prefix/PID selectors) at once
+- hook: Handle a raw Claude Code hook event (sent by hooks/hook_forward.py)
+- notify: Deliver a one-off notification (e.g. "Claude Done") through the queue
+- outbox: Read records another process appended to the outbox
+- status: Return list of pending escalations (optionally for one escalation_id)
+- transcript_summary: Last assistant text and counters of a session's transcript
+  (incrementally indexed, see escalation_transcript)
 - shutdown: Graceful shutdown
 
+A connection may carry many frames. Requests tagged with an "id" field get
+the same "id" back in their response; pipelining clients match responses by
+id rather than by order.
+
+Server cores (--core):
+- threaded: accept loop with one thread per connection (default)
+- selector: single event loop multiplexing all connections, no idle wakeups
+
 Usage:
-    python3 escalation_service.py [--socket PATH] [--log PATH]
+    python3 escalation_service.py [--socket PATH] [--log PATH] [--core threaded|selector]
+                                  [--scheduler heap|wheel] [--delivery-workers N]
+                                  [--coalesce SECONDS] [--catch-up fire|latest|skip]
+                                  [--catch-up-max-stale FACTOR]
+                                  [--busy-interval SECONDS]
+
+Due notifications are delivered by a pool of worker threads from a bounded
+priority queue (see escalation_delivery), so a slow Pushover call never
+holds up the scheduler. Notifications of one priority that fall due within
+the --coalesce window are sent as a single message listing every session.
+Deliveries are paced against the Pushover monthly message limit (see
+escalation_budget): low-priority notifications wait when the budget runs
+ahead of schedule, and a reserve is kept for emergencies. Notifications that
+fail with a retryable error are kept in a durable outbox and retried with
+backoff (see escalation_outbox). After repeated failures a circuit breaker
+(po_notify.CircuitBreaker, shared with the hooks) makes sends fail fast, and
+the service probes Pushover until it is reachable again.
+
+Pending timers are journaled (see escalation_journal) and restored when the
+service starts again, whether it stopped cleanly or crashed; --catch-up
+decides what happens to timers that fell due in between, and
+--catch-up-max-stale drops those that are too late to matter.
+
+Escalations for a session whose process is busy (a tool running) are
+skipped. The CPU use and children of registered session PIDs are sampled
+in the background every --busy-interval seconds (see escalation_sampler),
+so the check at delivery time is a lookup. A session is dropped the moment
+its process exits: on Linux its PID is watched through a pidfd (see
+escalation_pidwatch); elsewhere PIDs are polled every PID_CHECK_INTERVAL.
 """
 
 import argparse
-import heapq
-import json
+import bisect
 import logging
 import os
 import signal
 import socket
-import struct
-import subprocess
 import sys
 import threading
 import time
-from dataclasses import dataclass, field
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
-try:
-    import psutil
-    HAS_PSUTIL = True
-except ImportError:
-    HAS_PSUTIL = False
+# po_notify relative to plugin root (scripts/service -> tools/pushover-notify)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools" / "pushover-notify"))
+
+from escalation_budget import MessageBudget, budget_path
+from escalation_codec import CodecError, FrameCodec
+from escalation_delivery import COALESCE_WINDOW, DELIVERY_WORKERS, SKIPPED, DeliveryQueue, Notification
+from escalation_framing import FrameReader, FramingError, send_frames
+from escalation_journal import CATCH_UP_MAX_STALE, CATCH_UP_POLICIES, EscalationJournal, catch_up, journal_paths
+from escalation_loop import SelectorLoop
+from escalation_outbox import Outbox, outbox_path
+from escalation_pidwatch import PidWatcher, pidfd_supported
+from escalation_sampler import BUSY_SAMPLE_INTERVAL, ProcessSampler
+from escalation_status import StatusPageWriter, status_page_path
+from escalation_timers import ADD_MODES, CANCELLED, FIRED, SCHEDULER_BACKENDS, ScheduledEvent
+from escalation_transcript import TranscriptIndexer
+from po_notify import BREAKER_STATE, CircuitBreaker, PushoverClient, PushoverError, PushoverResponse
 
 
 # Default configuration - use ~/.claude/run for runtime files
@@ -44,90 +97,233 @@ DEFAULT_SOCKET = Path("~/.claude/run/escalation.sock").expanduser()
 DEFAULT_LOG = Path("~/.claude/logs/escalation.log").expanduser()
 DEFAULT_DELAYS = [60, 3600]  # 1 min, 1 hour
 PRIORITIES = {60: 0, 3600: 2}  # delay -> priority mapping
-PID_CHECK_INTERVAL = 60  # Check for dead PIDs every 60 seconds
-
-# po_notify relative to plugin root (scripts/service -> tools/pushover-notify)
-PO_NOTIFY_SCRIPT = Path(__file__).parent.parent.parent / "tools" / "pushover-notify" / "po_notify.py"
+NOTIFY_PRIORITIES = range(-2, 3)  # Pushover priorities accepted by the notify command
+PID_CHECK_INTERVAL = 60  # Without pidfds, check for dead PIDs every 60 seconds
+CLIENT_IDLE_TIMEOUT = 300  # Close client connections idle for 5 minutes
+SLOW_COMMANDS = ("transcript_summary",)  # Handled off the selector core's loop thread (file I/O)
+LISTEN_BACKLOG = 64  # Connections queued while the service is busy or starting
+SERVER_CORES = ("threaded", "selector")
+MAX_PUSHOVER_MESSAGE = 1024  # Pushover truncates longer messages; coalesced ones are cut here
 
-
-@dataclass(order=True)
-class ScheduledEvent:
-    """A scheduled notification event."""
-    fire_time: float
-    escalation_id: str = field(compare=False)
-    message: str = field(compare=False)
-    priority: int = field(compare=False)
-    cancelled: bool = field(default=False, compare=False)
+# Hook events forwarded by hook_forward.py that signal user activity
+CANCEL_HOOK_EVENTS = {"PreToolUse", "PostToolUse", "PermissionRequest", "UserPromptSubmit", "PreCompact", "Stop"}
 
 
 class EscalationScheduler:
-    """Single-threaded scheduler using a heap and condition variable."""
-
-    def __init__(self, notify_callback):
-        self.heap: list[ScheduledEvent] = []
+    """Single-threaded scheduler using a timer queue and condition variable.
+
+    The timer queue backend ("heap" or "wheel", see escalation_timers) is
+    chosen at construction. events_by_id holds only the pending events of
+    each ID, sorted by fire time, so firing, cleanup and per-ID status are
+    O(1) in the number of other timers: the event being fired is the head
+    of its ID's list, the pending count is the list length and the next
+    fire time its head.
+
+    With a journal (see escalation_journal), every change to an ID's
+    pending timers is recorded so that they survive a restart.
+    """
+
+    def __init__(
+        self,
+        notify_callback,
+        on_pending_change=None,
+        backend: str = "heap",
+        journal: Optional[EscalationJournal] = None,
+    ):
+        self.backend = backend
+        self.queue = SCHEDULER_BACKENDS[backend](time.time())
         self.lock = threading.Lock()
         self.condition = threading.Condition(self.lock)
         self.running = True
         self.notify_callback = notify_callback
+        # Called as on_pending_change(escalation_id, pending) with the lock held
+        self.on_pending_change = on_pending_change
+        self.journal = journal
         self.events_by_id: dict[str, list[ScheduledEvent]] = {}
+        # Popped event whose notification is being sent; a cancel that
+        # arrives before the callback runs still suppresses it
+        self.firing: Optional[ScheduledEvent] = None
         self.thread = threading.Thread(target=self._run, daemon=True)
         self.thread.start()
 
-    def add(self, escalation_id: str, message: str, delays: list[int]) -> None:
-        """Add escalation timers for the given ID."""
-        with self.condition:
-            # Cancel existing timers for this ID
-            self._cancel_internal(escalation_id)
+    def add(self, escalation_id: str, message: str, delays: list[int], mode: str = "replace") -> bool:
+        """Add escalation timers for the given ID.
 
-            # Create new events
-            now = time.time()
+        Modes for an ID that already has pending timers:
+        - "replace": cancel them and start the new timers from now
+        - "if_absent": keep them and schedule nothing
+        - "extend": keep them and only schedule delays not already pending
+
+        Returns whether any timer was scheduled.
+        """
+        with self.condition:
+            added = self._add_internal(escalation_id, message, delays, mode)
+            if added:
+                self.condition.notify()
+            return added
+
+    def _add_internal(self, escalation_id: str, message: str, delays: list[int], mode: str = "replace") -> bool:
+        """Internal add without lock (must be called with lock held)."""
+        if mode not in ADD_MODES:
+            raise ValueError(f"unknown add mode: {mode}")
+        existing = self.events_by_id.get(escalation_id)
+        if existing and mode == "if_absent":
+            return False
+        if existing and mode == "extend":
+            # Leave pending timers untouched rather than churning the heap
+            scheduled = {e.delay for e in existing}
+            delays = [d for d in delays if d not in scheduled]
+            if not delays:
+                return False
+            was_pending = True
+            events = existing
+        else:
+            # Cancel existing timers for this ID (the ID stays pending throughout)
+            was_pending = self._cancel_internal(escalation_id, notify=False)
             events = []
-            for delay in delays:
-                priority = PRIORITIES.get(delay, 0)
-                event = ScheduledEvent(
-                    fire_time=now + delay,
-                    escalation_id=escalation_id,
-                    message=message,
-                    priority=priority,
-                )
-                heapq.heappush(self.heap, event)
-                events.append(event)
 
+        # Create new events
+        now = time.time()
+        for delay in delays:
+            priority = PRIORITIES.get(delay, 0)
+            event = ScheduledEvent(
+                fire_time=now + delay,
+                escalation_id=escalation_id,
+                message=message,
+                priority=priority,
+                delay=delay,
+            )
+            self.queue.push(event)
+            bisect.insort(events, event)
+
+        if events:
             self.events_by_id[escalation_id] = events
+        if events and not was_pending:
+            self._pending_changed(escalation_id, True)
+        elif was_pending and not events:
+            self._pending_changed(escalation_id, False)
+        if delays or was_pending:
+            self._journal("add", escalation_id)
+        return bool(delays)
+
+    def restore(self, state: dict[str, list[list]]) -> int:
+        """Schedule timers loaded from the journal into an empty scheduler.
+
+        Returns the number of timers restored.
+        """
+        restored = 0
+        with self.condition:
+            for escalation_id, entries in state.items():
+                events = []
+                for fire_time, priority, delay, message in entries:
+                    event = ScheduledEvent(
+                        fire_time=fire_time,
+                        escalation_id=escalation_id,
+                        message=message,
+                        priority=priority,
+                        delay=delay,
+                    )
+                    self.queue.push(event)
+                    bisect.insort(events, event)
+                if events:
+                    self.events_by_id[escalation_id] = events
+                    self._pending_changed(escalation_id, True)
+                    self._journal("restore", escalation_id)
+                    restored += len(events)
             self.condition.notify()
+        return restored
+
+    def journal_state(self) -> dict[str, list[list]]:
+        """Pending timers in journal form (lock held or scheduler stopped)."""
+        return {
+            eid: [[e.fire_time, e.priority, e.delay, e.message] for e in events]
+            for eid, events in self.events_by_id.items()
+        }
+
+    def _journal(self, op: str, escalation_id: str) -> None:
+        """Record an ID's pending timers after a change (lock held)."""
+        if self.journal is None:
+            return
+        events = self.events_by_id.get(escalation_id, ())
+        self.journal.record(op, escalation_id, [[e.fire_time, e.priority, e.delay, e.message] for e in events])
+        if self.journal.wants_snapshot:
+            self.journal.snapshot(self.journal_state())
+
+    def _pending_changed(self, escalation_id: str, pending: bool) -> None:
+        """Report that an ID gained or lost all of its pending timers."""
+        if self.on_pending_change:
+            self.on_pending_change(escalation_id, pending)
 
     def cancel(self, escalation_id: str) -> bool:
         """Cancel all pending timers for the given ID."""
         with self.condition:
             return self._cancel_internal(escalation_id)
 
-    def _cancel_internal(self, escalation_id: str) -> bool:
-        """Internal cancel without lock (must be called with lock held)."""
-        if escalation_id in self.events_by_id:
-            for event in self.events_by_id[escalation_id]:
-                event.cancelled = True
-            del self.events_by_id[escalation_id]
-            return True
-        return False
+    def batch(self, operations: list[tuple]) -> list[Any]:
+        """Apply several operations under a single lock acquisition.
+
+        Supported operations and their results:
+        - ("add", escalation_id, message, delays[, mode]) -> bool (whether timers were scheduled)
+        - ("cancel", escalation_id) -> bool (whether timers were found)
+        - ("cancel_many", escalation_ids) -> list of cancelled IDs
+        - ("cancel_prefix", prefix) -> list of cancelled IDs
+        """
+        results: list[Any] = []
+        with self.condition:
+            for op in operations:
+                kind = op[0]
+                if kind == "add":
+                    results.append(self._add_internal(*op[1:]))
+                elif kind == "cancel":
+                    results.append(self._cancel_internal(op[1]))
+                elif kind == "cancel_many":
+                    results.append([eid for eid in op[1] if self._cancel_internal(eid)])
+                elif kind == "cancel_prefix":
+                    matched = [eid for eid in self.events_by_id if eid.startswith(op[1])]
+                    for eid in matched:
+                        self._cancel_internal(eid)
+                    results.append(matched)
+                else:
+                    raise ValueError(f"unknown scheduler operation: {kind}")
+            self.condition.notify()
+        return results
 
-    def status(self) -> list[dict]:
-        """Return list of pending escalations."""
+    def _cancel_internal(self, escalation_id: str, notify: bool = True) -> bool:
+        """Internal cancel without lock (must be called with lock held)."""
+        firing = self.firing
+        if firing is not None and firing.escalation_id == escalation_id and firing.state == FIRED:
+            firing.state = CANCELLED
+        events = self.events_by_id.pop(escalation_id, None)
+        if not events:
+            return False
+        for event in events:
+            event.state = CANCELLED
+            self.queue.discard(event)
+        if notify:
+            # Internal callers (add, restore) report and journal the end state themselves
+            self._pending_changed(escalation_id, False)
+            self._journal("cancel", escalation_id)
+        return True
+
+    def status(self, escalation_id: Optional[str] = None) -> list[dict]:
+        """Return list of pending escalations (optionally just one ID)."""
         with self.lock:
-            result = []
-            # Build set of event IDs still in heap for O(1) lookup (using id() for identity)
-            heap_ids = {id(e) for e in self.heap}
-            for eid, events in self.events_by_id.items():
-                # Only count events that are not cancelled AND still in heap (not yet fired)
-                active_events = [e for e in events if not e.cancelled and id(e) in heap_ids]
-                if active_events:
-                    next_fire = min(e.fire_time for e in active_events)
-                    result.append({
-                        "escalation_id": eid,
-                        "message": active_events[0].message,
-                        "pending_count": len(active_events),
-                        "next_fire_in": max(0, next_fire - time.time()),
-                    })
-            return result
+            if escalation_id is None:
+                items = self.events_by_id.items()
+            elif escalation_id in self.events_by_id:
+                items = [(escalation_id, self.events_by_id[escalation_id])]
+            else:
+                items = []
+            now = time.time()
+            return [
+                {
+                    "escalation_id": eid,
+                    "message": events[0].message,
+                    "pending_count": len(events),
+                    "next_fire_in": max(0, events[0].fire_time - now),
+                }
+                for eid, events in items
+            ]
 
     def shutdown(self) -> None:
         """Stop the scheduler thread."""
@@ -136,16 +332,28 @@ class EscalationScheduler:
             self.condition.notify()
         self.thread.join(timeout=5)
 
-    def _cleanup_fired_events(self, escalation_id: str) -> None:
-        """Remove escalation from events_by_id if all events have fired."""
-        if escalation_id in self.events_by_id:
-            events = self.events_by_id[escalation_id]
-            # Check if all events are cancelled or have fired (not in heap)
-            # Use id() for identity-based check since ScheduledEvent is unhashable
-            heap_ids = {id(e) for e in self.heap}
-            active = [e for e in events if not e.cancelled and id(e) in heap_ids]
-            if not active:
-                del self.events_by_id[escalation_id]
+    def _pop_due(self, now: float) -> Optional[ScheduledEvent]:
+        """Pop the next event if it is due, updating bookkeeping (lock held).
+
+        Returns None if nothing is due yet.
+        """
+        event = self.queue.pop_due(now)
+        if event is None:
+            return None
+
+        event.state = FIRED
+        escalation_id = event.escalation_id
+        events = self.events_by_id[escalation_id]
+        # The earliest pending event of an ID is normally at the head of its list
+        if events[0] is event:
+            events.pop(0)
+        else:
+            events.remove(event)  # Equal fire times popped in a different order
+        if not events:
+            del self.events_by_id[escalation_id]
+            self._pending_changed(escalation_id, False)
+        self._journal("fire", escalation_id)
+        return event
 
     def _run(self) -> None:
         """Main scheduler loop."""
@@ -154,51 +362,82 @@ class EscalationScheduler:
                 if not self.running:
                     break
 
-                # Find next event to fire
-                while self.heap and self.heap[0].cancelled:
-                    heapq.heappop(self.heap)
-
-                if not self.heap:
-                    # No events, wait indefinitely
-                    self.condition.wait()
-                    continue
-
-                next_event = self.heap[0]
-                wait_time = next_event.fire_time - time.time()
-
-                if wait_time > 0:
-                    # Wait until next event or notification
-                    self.condition.wait(timeout=wait_time)
+                next_event = self._pop_due(time.time())
+                if next_event is None:
+                    next_fire = self.queue.next_fire_time()
+                    if next_fire is None:
+                        # No events, wait indefinitely
+                        self.condition.wait()
+                    else:
+                        # Wait until next event or notification
+                        self.condition.wait(timeout=max(0, next_fire - time.time()))
                     continue
-
-                # Time to fire
-                heapq.heappop(self.heap)
-                escalation_id = next_event.escalation_id
-
-                # Clean up fired events from memory
-                self._cleanup_fired_events(escalation_id)
+                self.firing = next_event
 
             # Fire event outside the lock
-            if not next_event.cancelled:
+            if next_event.state != CANCELLED:
                 self.notify_callback(
                     next_event.escalation_id,
                     next_event.message,
                     next_event.priority,
+                    next_event.fire_time,
                 )
+            with self.lock:
+                self.firing = None
 
 
 class EscalationService:
     """Unix socket server for escalation management."""
 
-    def __init__(self, socket_path: Path, log_path: Path):
+    def __init__(
+        self,
+        socket_path: Path,
+        log_path: Path,
+        core: str = "threaded",
+        listen_fd: Optional[int] = None,
+        ready_fd: Optional[int] = None,
+        scheduler_backend: str = "heap",
+        catch_up_policy: str = "latest",
+        catch_up_max_stale: float = CATCH_UP_MAX_STALE,
+        delivery_workers: int = DELIVERY_WORKERS,
+        coalesce: float = COALESCE_WINDOW,
+        busy_interval: float = BUSY_SAMPLE_INTERVAL,
+    ):
         self.socket_path = socket_path
         self.log_path = log_path
+        self.core = core
+        self.scheduler_backend = scheduler_backend
+        self.catch_up_policy = catch_up_policy
+        self.catch_up_max_stale = catch_up_max_stale
+        self.journal: Optional[EscalationJournal] = None
+        self.delivery_workers = delivery_workers
+        self.coalesce = coalesce
+        self.delivery: Optional[DeliveryQueue] = None
+        self.outbox: Optional[Outbox] = None
+        self.busy_interval = busy_interval
+        self.sampler: Optional[ProcessSampler] = None
+        self.pid_watcher: Optional[PidWatcher] = None
+        # Remaining Pushover messages, learned from response headers
+        self.budget = MessageBudget(budget_path(socket_path))
+        # In-process Pushover client; its keep-alive connections are shared by the
+        # delivery workers, and its circuit breaker (shared with the hooks) fails
+        # sends fast while Pushover is unreachable
+        self.breaker = CircuitBreaker(state_path=BREAKER_STATE)
+        self.pushover = PushoverClient(pool_size=max(1, delivery_workers), breaker=self.breaker)
+        # Socket activation: a listening socket inherited from the starting
+        # client, and a pipe on which to report readiness
+        self.listen_fd = listen_fd
+        self.ready_fd = ready_fd
         self.server_socket: Optional[socket.socket] = None
+        self.loop: Optional[SelectorLoop] = None
+        self.status_page: Optional[StatusPageWriter] = None
         self.running = False
         self.scheduler: Optional[EscalationScheduler] = None
         # PID-tracked sessions: {session_id: {"pid": int, "registered_at": float}}
         self.sessions: dict[str, dict] = {}
         self.session_lock = threading.Lock()
+        # Per-session transcript offsets and summaries, for the Stop hook
+        self.transcripts = TranscriptIndexer()
         self._setup_logging()
 
     def _setup_logging(self) -> None:
@@ -225,6 +464,13 @@ class EscalationService:
         ))
         self.logger.addHandler(stderr_handler)
 
+    def _request_stop(self) -> None:
+        """Stop serving; wakes the event loop if the selector core is active."""
+        self.running = False
+        self.breaker.wake()
+        if self.loop:
+            self.loop.stop()
+
     def _is_pid_alive(self, pid: int) -> bool:
         """Check if a PID is still running."""
         try:
@@ -236,11 +482,11 @@ class EscalationService:
     def _is_session_busy(self, session_id: str) -> bool:
         """Check if a session's process is busy (tool running).
 
-        A session is considered busy if:
+        A session is considered busy if, in the sampler's latest measurement:
         1. The main Claude process CPU > 10%, OR
         2. There are child processes (bash commands, etc.)
         """
-        if not HAS_PSUTIL:
+        if not self.sampler:
             return False
 
         with self.session_lock:
@@ -249,41 +495,41 @@ class EscalationService:
                 return False
             pid = session["pid"]
 
-        try:
-            proc = psutil.Process(pid)
-
-            # Check 1: Does the main process have high CPU?
-            cpu = proc.cpu_percent(interval=0.5)
-            cpu_busy = cpu > 10
-
-            # Check 2: Are there child processes?
-            children = proc.children(recursive=True)
-            has_children = len(children) > 0
-
-            is_busy = cpu_busy or has_children
-            self.logger.info(
-                f"Busy check for {session_id[:8]}...: cpu={cpu:.1f}%, children={len(children)}, busy={is_busy}"
-            )
-            return is_busy
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        sample = self.sampler.sample(pid)
+        if sample is None:
             return False
-
-    def _cleanup_dead_sessions(self) -> None:
-        """Remove sessions whose PIDs are no longer alive."""
+        self.logger.info(
+            f"Busy check for {session_id[:8]}...: cpu={sample.cpu:.1f}%, children={sample.children}, busy={sample.busy}"
+        )
+        return sample.busy
+
+    def _watch_session_pids(self) -> None:
+        """Point the sampler and PID watcher at the PIDs of the registered sessions (session_lock held)."""
+        pids = {info["pid"] for info in self.sessions.values() if info.get("pid")}
+        if self.sampler:
+            self.sampler.watch(pids)
+        if self.pid_watcher:
+            self.pid_watcher.watch(pids)
+
+    def _cleanup_dead_sessions(self, exited: Optional[int] = None) -> None:
+        """Remove sessions whose PIDs are no longer alive (or, given exited, whose PID exited)."""
         with self.session_lock:
             dead = []
             for session_id, info in self.sessions.items():
                 pid = info.get("pid")
-                if pid and not self._is_pid_alive(pid):
+                if pid and (pid == exited if exited is not None else not self._is_pid_alive(pid)):
                     dead.append((session_id, pid))
 
             for session_id, pid in dead:
                 del self.sessions[session_id]
+                self.transcripts.forget(session_id)
                 self.logger.info(f"Auto-unregistered dead session: {session_id} (pid={pid})")
+            if dead:
+                self._watch_session_pids()
 
             if not self.sessions and dead:
                 self.logger.info("No sessions remaining after cleanup, shutting down")
-                self.running = False
+                self._request_stop()
 
     def _start_pid_checker(self) -> None:
         """Start background thread to check for dead PIDs."""
@@ -297,6 +543,24 @@ class EscalationService:
         thread.start()
         self.logger.info(f"PID checker started (interval={PID_CHECK_INTERVAL}s)")
 
+    def _start_breaker_probe(self) -> None:
+        """Start background thread that probes Pushover while the circuit is open."""
+        def prober():
+            while self.running:
+                # Sleeps while the circuit is closed; woken when it opens or at shutdown
+                if not self.breaker.wait_open():
+                    continue
+                time.sleep(max(self.breaker.stats().get("retry_in", 0), 1.0))
+                if self.running and self.breaker.allow():
+                    try:
+                        self.pushover.probe()
+                        self.logger.info("Pushover reachable again, circuit closed")
+                    except PushoverError as e:
+                        self.logger.warning(f"Circuit breaker probe failed: {e}")
+
+        thread = threading.Thread(target=prober, name="breaker-probe", daemon=True)
+        thread.start()
+
     def _cleanup_socket(self) -> None:
         """Remove stale socket file if it exists."""
         if self.socket_path.exists():
@@ -326,75 +590,134 @@ class EscalationService:
             finally:
                 test_sock.close()
 
-    def _send_notification(self, escalation_id: str, message: str, priority: int) -> None:
-        """Send notification via po_notify."""
-        # Check if session is busy (tool running) - skip notification if so
-        if self._is_session_busy(escalation_id):
-            self.logger.info(f"Skipping notification for {escalation_id[:8]}... (session busy, tool running)")
-            return
+    def _enqueue_notification(self, escalation_id: str, message: str, priority: int, fire_time: float) -> None:
+        """Scheduler callback: hand a due notification to the delivery queue."""
+        assert self.delivery is not None, "Delivery queue not initialized"
+        self.delivery.submit(Notification(escalation_id, message, priority, fire_time=fire_time))
+
+    def _resubmit(self, entry: dict) -> None:
+        """Outbox callback: queue a failed notification for another attempt."""
+        assert self.delivery is not None, "Delivery queue not initialized"
+        notification = Notification(
+            entry["escalation_id"],
+            entry["message"],
+            entry["priority"],
+            title=entry.get("title", ""),
+            fire_time=entry["fire_time"],
+        )
+        self.delivery.submit(notification)  # A drop is reported to _dropped
 
-        po_notify = PO_NOTIFY_SCRIPT
+    def _dropped(self, notifications: list[Notification], reason: str) -> None:
+        """Delivery queue callback: settle dropped notifications with the outbox.
 
-        title = "Claude Permission" if priority < 2 else "Claude Permission (1hr)"
+        A full queue is transient, so those are retried later; budget drops
+        are final. Either way a resubmitted entry stops being in flight.
+        """
+        if self.outbox is None:
+            return
+        if reason == "overflow":
+            self.outbox.retry(self._outbox_items(notifications), "delivery queue full")
+        else:
+            self.outbox.done(self._outbox_items(notifications))
+
+    @staticmethod
+    def _outbox_items(notifications: list[Notification]) -> list[dict]:
+        """Outbox representation of notifications."""
+        return [
+            {
+                "escalation_id": n.escalation_id,
+                "title": n.title,
+                "message": n.message,
+                "priority": n.priority,
+                "fire_time": n.fire_time,
+            }
+            for n in notifications
+        ]
 
-        self.logger.info(f"Sending notification: {title} - {message[:50]}... (priority {priority})")
+    def _deliver(self, notification: Notification) -> Union[bool, str]:
+        """Delivery worker callback: one Pushover message per (possibly coalesced) notification.
 
+        Retryable failures go to the outbox; whatever was sent or skipped
+        is retired from it. Returns SKIPPED when every session was busy.
+        """
+        assert self.outbox is not None, "Outbox not initialized"
+        group, skipped = [], []
+        for n in notification.group:
+            # Check if session is busy (tool running) - skip escalations if so
+            if not n.title and self._is_session_busy(n.escalation_id):
+                self.logger.info(f"Skipping notification for {n.escalation_id[:8]}... (session busy, tool running)")
+                skipped.append(n)
+            else:
+                group.append(n)
+        if not group:
+            self.outbox.done(self._outbox_items(skipped))
+            return SKIPPED
         try:
-            cmd = [str(po_notify), title, message, "--priority", str(priority)]
-            if priority == 2:
-                cmd.extend(["--retry", "60", "--expire", "3600"])
-
-            subprocess.run(
-                cmd,
-                check=True,
-                capture_output=True,
-                timeout=10,
-            )
-            self.logger.info(f"Notification sent for {escalation_id}")
-        except subprocess.CalledProcessError as e:
-            self.logger.error(f"Notification failed: {e.stderr.decode()}")
-        except FileNotFoundError:
-            self.logger.error("po_notify not found")
+            if len(group) == 1:
+                self._send_notification(
+                    group[0].escalation_id, group[0].message, notification.priority, title=notification.title
+                )
+            else:
+                message = "\n".join(f"[{n.escalation_id[:8]}] {n.message}" for n in group)
+                self._send_notification(
+                    ", ".join(n.escalation_id for n in group),
+                    message[:MAX_PUSHOVER_MESSAGE],
+                    notification.priority,
+                    len(group),
+                    title=notification.title,
+                )
+        except PushoverError as e:
+            self.budget.observe(e.rate_limit)
+            self.logger.error(f"Notification failed: {e}")
+            if e.retryable:
+                self.outbox.retry(self._outbox_items(group), str(e))
+                self.outbox.done(self._outbox_items(skipped))
+            else:
+                self.outbox.done(self._outbox_items(notification.group))
+            return False
         except Exception as e:
             self.logger.error(f"Notification error: {e}")
+            self.outbox.done(self._outbox_items(notification.group))
+            return False
+        self.outbox.done(self._outbox_items(notification.group))
+        return True
+
+    def _send_notification(
+        self, escalation_id: str, message: str, priority: int, sessions: int = 1, title: str = ""
+    ) -> PushoverResponse:
+        """Send notification via the in-process Pushover client. Raises PushoverError on failure."""
+        if not title:
+            title = "Claude Permission" if priority < 2 else "Claude Permission (1hr)"
+        if sessions > 1:
+            title += f" - {sessions} sessions"
 
-    def _recv_exact(self, conn: socket.socket, n: int) -> Optional[bytes]:
-        """Receive exactly n bytes, handling partial reads."""
-        data = b""
-        while len(data) < n:
-            chunk = conn.recv(n - len(data))
-            if not chunk:
-                return None
-            data += chunk
-        return data
-
-    def _recv_message(self, conn: socket.socket) -> Optional[dict]:
-        """Receive a length-prefixed JSON message."""
-        try:
-            # Read 4-byte length prefix (handle partial reads)
-            length_data = self._recv_exact(conn, 4)
-            if length_data is None:
-                return None
+        self.logger.info(f"Sending notification: {title} - {message[:50]}... (priority {priority})")
 
-            length = struct.unpack("!I", length_data)[0]
-            if length > 1024 * 1024:  # Max 1MB message
-                return None
+        if priority == 2:
+            response = self.pushover.send(title, message, priority=priority, retry=60, expire=3600)
+        else:
+            response = self.pushover.send(title, message, priority=priority)
+        self.budget.observe(response.rate_limit)
+        self.logger.info(f"Notification sent for {escalation_id}")
+        return response
 
-            # Read message data (handle partial reads)
-            data = self._recv_exact(conn, length)
-            if data is None:
+    def _recv_message(self, conn: socket.socket, reader: FrameReader, codec: FrameCodec) -> Optional[tuple[dict, bool]]:
+        """Receive and decode one request frame. Returns (message, was_binary)."""
+        try:
+            payload = reader.read_message(conn)
+            if payload is None:
                 return None
-
-            return json.loads(data.decode("utf-8"))
-        except (json.JSONDecodeError, struct.error, OSError):
+            return codec.decode_request(payload)
+        except (CodecError, FramingError) as e:
+            self.logger.warning(f"Dropping client: {e}")
+            return None
+        except OSError:
             return None
 
-    def _send_message(self, conn: socket.socket, data: dict) -> bool:
-        """Send a length-prefixed JSON message."""
+    def _send_message(self, conn: socket.socket, frames: list[bytes]) -> bool:
+        """Send encoded response frames."""
         try:
-            encoded = json.dumps(data).encode("utf-8")
-            length = struct.pack("!I", len(encoded))
-            conn.sendall(length + encoded)
+            send_frames(conn, frames)
             return True
         except OSError:
             return False
@@ -408,10 +731,19 @@ class EscalationService:
             escalation_id = cmd.get("escalation_id") or cmd.get("session_id", "unknown")
             message = cmd.get("message", "Awaiting permission")
             delays = cmd.get("delays", DEFAULT_DELAYS)
+            mode = cmd.get("mode", "replace")
+            if mode not in ADD_MODES:
+                return {"status": "error", "message": f"Unknown add mode: {mode}"}
+
+            added = self.scheduler.add(escalation_id, message, delays, mode)
+            self.logger.info(f"Added escalation: {escalation_id} (mode={mode}, scheduled={added})")
+            response = {"status": "ok", "escalation_id": escalation_id}
+            if mode != "replace":
+                response["added"] = added
+            return response
 
-            self.scheduler.add(escalation_id, message, delays)
-            self.logger.info(f"Added escalation: {escalation_id}")
-            return {"status": "ok", "escalation_id": escalation_id}
+        elif command == "ping":
+            return {"status": "ok"}
 
         elif command == "cancel":
             escalation_id = cmd.get("escalation_id") or cmd.get("session_id", "")
@@ -419,8 +751,30 @@ class EscalationService:
             self.logger.info(f"Cancel escalation: {escalation_id} (found={cancelled})")
             return {"status": "ok", "cancelled": cancelled}
 
+        elif command == "batch":
+            return self._handle_batch(cmd.get("operations") or [])
+
+        elif command == "notify":
+            assert self.delivery is not None, "Delivery queue not initialized"
+            session_id = cmd.get("session_id") or "notify"
+            priority = cmd.get("priority", 0)
+            if type(priority) is not int or priority not in NOTIFY_PRIORITIES:
+                return {"status": "error", "message": f"Invalid priority: {priority!r}"}
+            queued = self.delivery.submit(Notification(
+                session_id,
+                cmd.get("message", ""),
+                priority,
+                title=cmd.get("title") or "Claude",
+            ))
+            return {"status": "ok", "queued": queued}
+
+        elif command == "outbox":
+            if self.outbox:
+                self.outbox.poke()
+            return {"status": "ok"}
+
         elif command == "status":
-            pending = self.scheduler.status()
+            pending = self.scheduler.status(cmd.get("escalation_id"))
             with self.session_lock:
                 sessions_info = {
                     sid: {
@@ -435,8 +789,25 @@ class EscalationService:
                 "pending": pending,
                 "session_count": len(sessions_info),
                 "sessions": sessions_info,
+                "delivery": self.delivery.stats() if self.delivery else None,
+                "budget": self.budget.stats(),
+                "outbox": self.outbox.stats() if self.outbox else None,
+                "breaker": self.breaker.stats(),
             }
 
+        elif command == "transcript_summary":
+            session_id = cmd.get("session_id", "")
+            transcript_path = cmd.get("transcript_path")
+            try:
+                summary = self.transcripts.summary(
+                    session_id, Path(transcript_path).expanduser() if transcript_path else None
+                )
+            except OSError as e:
+                return {"status": "error", "message": f"Cannot read transcript: {e}"}
+            if summary is None:
+                return {"status": "error", "message": f"No transcript indexed for session: {session_id}"}
+            return {"status": "ok", **summary}
+
         elif command == "register_session":
             session_id = cmd.get("session_id", f"session-{time.time()}")
             pid = cmd.get("pid")
@@ -446,6 +817,10 @@ class EscalationService:
                     "registered_at": time.time(),
                 }
                 count = len(self.sessions)
+                self._watch_session_pids()
+            transcript_path = cmd.get("transcript_path")
+            if transcript_path:
+                self.transcripts.track(session_id, Path(transcript_path).expanduser())
             self.logger.info(f"Session registered: {session_id} (pid={pid}, count={count})")
             return {"status": "ok", "session_id": session_id, "session_count": count}
 
@@ -461,31 +836,127 @@ class EscalationService:
                     del self.sessions[oldest[0]]
                     session_id = oldest[0]
                 count = len(self.sessions)
+                self._watch_session_pids()
+                if session_id:
+                    self.transcripts.forget(session_id)
                 if count == 0:
                     should_shutdown = True
             self.logger.info(f"Session unregistered: {session_id} (count={count})")
             if should_shutdown:
                 self.logger.info("No more sessions, shutting down")
-                self.running = False
+                self._request_stop()
             return {"status": "ok", "session_id": session_id, "session_count": count, "shutting_down": should_shutdown}
 
+        elif command == "hook":
+            payload = cmd.get("payload")
+            return self._handle_hook(cmd.get("event", ""), payload if isinstance(payload, dict) else {})
+
         elif command == "shutdown":
             # Force shutdown regardless of session count
             self.logger.info("Force shutdown requested")
-            self.running = False
+            self._request_stop()
             return {"status": "ok", "message": "shutting down"}
 
         else:
             return {"status": "error", "message": f"unknown command: {command}"}
 
+    def _handle_hook(self, event: str, payload: dict) -> dict:
+        """Handle a Claude Code hook event forwarded verbatim by hook_forward.py.
+
+        Mirrors cancel_escalation.py without spawning an interpreter per
+        event. Permission prompts are not forwarded: on_permission.py also
+        has to start the service when it is not running.
+        """
+        assert self.scheduler is not None, "Scheduler not initialized"
+        event = event or payload.get("hook_event_name", "")
+        session_id = payload.get("session_id", "")
+        if not session_id:
+            return {"status": "ok", "handled": False}
+
+        if event in CANCEL_HOOK_EVENTS:
+            cancelled = self.scheduler.cancel(session_id)
+            if cancelled:
+                self.logger.info(f"Cancel escalation: {session_id} (hook {event})")
+            return {"status": "ok", "handled": True, "cancelled": cancelled}
+
+        return {"status": "ok", "handled": False}
+
+    def _handle_batch(self, operations: list) -> dict:
+        """Apply a list of add/cancel operations with one scheduler lock acquisition.
+
+        Each operation is a dict with a "command" of "add" or "cancel". A
+        cancel targets one "escalation_id", or selects in bulk with "prefix"
+        (escalation IDs starting with it) or "pid" (escalations of sessions
+        registered with that PID).
+        """
+        assert self.scheduler is not None, "Scheduler not initialized"
+        sched_ops: list[tuple[int, tuple]] = []  # (result index, scheduler op)
+        results: list[Optional[dict]] = [None] * len(operations)
+
+        for index, op in enumerate(operations):
+            command = op.get("command", "") if isinstance(op, dict) else None
+            if command == "add" and op.get("mode", "replace") not in ADD_MODES:
+                results[index] = {"status": "error", "message": f"Unknown add mode: {op['mode']}"}
+            elif command == "add":
+                sched_ops.append((index, (
+                    "add",
+                    op.get("escalation_id") or op.get("session_id", "unknown"),
+                    op.get("message", "Awaiting permission"),
+                    op.get("delays", DEFAULT_DELAYS),
+                    op.get("mode", "replace"),
+                )))
+            elif command == "cancel" and "prefix" in op:
+                sched_ops.append((index, ("cancel_prefix", str(op["prefix"]))))
+            elif command == "cancel" and "pid" in op:
+                with self.session_lock:
+                    session_ids = [sid for sid, info in self.sessions.items() if info.get("pid") == op["pid"]]
+                sched_ops.append((index, ("cancel_many", session_ids)))
+            elif command == "cancel":
+                sched_ops.append((index, ("cancel", op.get("escalation_id") or op.get("session_id", ""))))
+            else:
+                results[index] = {"status": "error", "message": f"unsupported batch operation: {command}"}
+
+        outcomes = self.scheduler.batch([op for _, op in sched_ops])
+        for (index, op), outcome in zip(sched_ops, outcomes):
+            if op[0] == "add":
+                results[index] = {"status": "ok", "escalation_id": op[1]}
+                if op[4] != "replace":
+                    results[index]["added"] = outcome
+            else:
+                results[index] = {"status": "ok", "cancelled": outcome}
+
+        self.logger.info(f"Batch applied: {len(sched_ops)} operation(s), {len(operations) - len(sched_ops)} rejected")
+        return {"status": "ok", "results": results}
+
+    def _dispatch(self, msg: dict, codec: FrameCodec) -> dict:
+        """Handle one request frame, echoing its request id if present."""
+        if msg.get("command") == "hello":
+            response = codec.accept_hello(msg)
+        else:
+            response = self._handle_command(msg)
+        if "id" in msg:
+            response["id"] = msg["id"]
+        return response
+
     def _handle_client(self, conn: socket.socket, _addr: Any) -> None:
-        """Handle a single client connection."""
+        """Handle a client connection until it closes.
+
+        A connection may carry any number of frames. Requests that include an
+        ``id`` get it echoed in their response so pipelining clients can match
+        responses to requests.
+        """
         try:
-            conn.settimeout(30)
-            msg = self._recv_message(conn)
-            if msg:
-                response = self._handle_command(msg)
-                self._send_message(conn, response)
+            conn.settimeout(CLIENT_IDLE_TIMEOUT)
+            codec = FrameCodec()
+            reader = FrameReader()
+            while self.running:
+                received = self._recv_message(conn, reader, codec)
+                if not received:
+                    break
+                msg, binary = received
+                response = self._dispatch(msg, codec)
+                if not self._send_message(conn, codec.encode_response(response, binary)):
+                    break
         except socket.timeout:
             self.logger.warning("Client connection timed out")
         except Exception as e:
@@ -495,64 +966,173 @@ class EscalationService:
 
     def start(self) -> None:
         """Start the escalation service."""
-        self._cleanup_socket()
+        if self.listen_fd is None:
+            self._cleanup_socket()
 
         # Create parent directory if needed
         self.socket_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Create scheduler
-        self.scheduler = EscalationScheduler(self._send_notification)
+        # Publish the connectionless status page, then create the scheduler
+        self.status_page = StatusPageWriter(status_page_path(self.socket_path))
+        # Due notifications go to the delivery workers, never blocking the scheduler
+        self.delivery = DeliveryQueue(
+            self._deliver,
+            self.logger,
+            workers=self.delivery_workers,
+            coalesce=self.coalesce,
+            budget=self.budget,
+            on_drop=self._dropped,
+        )
+        # Failed notifications (from earlier runs too) are retried from the outbox
+        self.outbox = Outbox(outbox_path(self.socket_path), self._resubmit, self.logger)
+        # Pending timers of earlier runs come back from the journal
+        self.journal = EscalationJournal(*journal_paths(self.socket_path), self.logger)
+        state = self.journal.load()
+        self.scheduler = EscalationScheduler(
+            self._enqueue_notification,
+            self.status_page.set_pending,
+            backend=self.scheduler_backend,
+            journal=self.journal,
+        )
+        if state:
+            state, skipped = catch_up(state, time.time(), self.catch_up_policy, self.catch_up_max_stale)
+            restored = self.scheduler.restore(state)
+            self.logger.info(
+                f"Restored {restored} timer(s) for {len(state)} escalation(s) from the journal "
+                f"(catch-up={self.catch_up_policy}, {skipped} overdue timer(s) dropped)"
+            )
 
-        # Create server socket
-        self.server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.server_socket.bind(str(self.socket_path))
+        if self.listen_fd is not None:
+            # Adopt the socket the client already bound; connections made
+            # since then are waiting in its backlog
+            self.server_socket = socket.socket(fileno=self.listen_fd)
+            self.server_socket.set_inheritable(False)
+        else:
+            # Create server socket
+            self.server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.server_socket.bind(str(self.socket_path))
 
-        # Harden socket permissions - only owner can read/write (0600)
-        os.chmod(self.socket_path, 0o600)
+            # Harden socket permissions - only owner can read/write (0600)
+            os.chmod(self.socket_path, 0o600)
 
-        self.server_socket.listen(5)
-        self.server_socket.settimeout(1)  # Allow periodic shutdown check
+            self.server_socket.listen(LISTEN_BACKLOG)
+
+        # Busy detection: session PIDs are sampled in the background
+        self.sampler = ProcessSampler(self.logger, self.busy_interval)
+        with self.session_lock:
+            self._watch_session_pids()
 
         self.running = True
-        self.logger.info(f"Escalation service started on {self.socket_path}")
+        self.logger.info(f"Escalation service started on {self.socket_path} (core={self.core}, scheduler={self.scheduler_backend})")
 
-        # Start PID checker thread
-        self._start_pid_checker()
+        # Drop sessions whose process exits: pidfds where available, else polling
+        if pidfd_supported():
+            self.pid_watcher = PidWatcher(self._cleanup_dead_sessions, self.logger)
+            with self.session_lock:
+                self._watch_session_pids()
+            self.logger.info("PID watcher started (pidfd)")
+        else:
+            self._start_pid_checker()
+        self._start_breaker_probe()
+        if self.sampler.running:
+            self.logger.info(f"Process sampler started (backend={self.sampler.backend}, interval={self.busy_interval}s)")
+        elif self.busy_interval > 0:
+            self.logger.warning("No /proc or psutil: busy sessions are not detected")
 
         # Handle signals
         def signal_handler(signum, _frame):
             self.logger.info(f"Received signal {signum}")
-            self.running = False
+            self._request_stop()
+
+        def reload_handler(signum, _frame):
+            # Rotated credentials: drop the cached copy, fetch on the next send
+            self.logger.info("Received SIGHUP, reloading Pushover credentials")
+            self.pushover.credentials.invalidate()
 
         signal.signal(signal.SIGTERM, signal_handler)
         signal.signal(signal.SIGINT, signal_handler)
+        signal.signal(signal.SIGHUP, reload_handler)
 
-        # Main accept loop
+        self._signal_ready()
         try:
-            while self.running:
-                try:
-                    conn, addr = self.server_socket.accept()
-                    # Handle each client in a thread to avoid blocking
-                    threading.Thread(
-                        target=self._handle_client,
-                        args=(conn, addr),
-                        daemon=True,
-                    ).start()
-                except socket.timeout:
-                    continue
-                except OSError:
-                    if self.running:
-                        raise
+            if self.core == "selector":
+                self._serve_selector()
+            else:
+                self._serve_threaded()
         finally:
             self.shutdown()
 
+    def _signal_ready(self) -> None:
+        """Tell the starting client that the service is accepting requests."""
+        if self.ready_fd is None:
+            return
+        try:
+            os.write(self.ready_fd, b"R")
+        except OSError:
+            pass  # Starter gave up waiting
+        finally:
+            os.close(self.ready_fd)
+            self.ready_fd = None
+
+    def _serve_selector(self) -> None:
+        """Serve all connections from a single event loop."""
+        assert self.server_socket is not None, "Server socket not initialized"
+        self.loop = SelectorLoop(
+            self.server_socket,
+            self._dispatch,
+            self.logger,
+            idle_timeout=CLIENT_IDLE_TIMEOUT,
+            offload=SLOW_COMMANDS,
+        )
+        if not self.running:
+            return  # Stop requested before the loop existed
+        self.loop.run()
+
+    def _serve_threaded(self) -> None:
+        """Accept connections and handle each one in its own thread."""
+        assert self.server_socket is not None, "Server socket not initialized"
+        self.server_socket.settimeout(1)  # Allow periodic shutdown check
+
+        while self.running:
+            try:
+                conn, addr = self.server_socket.accept()
+                # Handle each client in a thread to avoid blocking
+                threading.Thread(
+                    target=self._handle_client,
+                    args=(conn, addr),
+                    daemon=True,
+                ).start()
+            except socket.timeout:
+                continue
+            except OSError:
+                if self.running:
+                    raise
+
     def shutdown(self) -> None:
         """Clean shutdown of the service."""
         self.logger.info("Shutting down...")
 
         if self.scheduler:
             self.scheduler.shutdown()
+        if self.journal:
+            # Pending timers outlive the service: the next start restores them
+            self.journal.close(self.scheduler.journal_state() if self.scheduler else None)
+
+        if self.delivery:
+            undelivered = self.delivery.shutdown()
+            if self.outbox and undelivered:
+                self.outbox.retry(self._outbox_items(undelivered), "service stopped")
+        if self.outbox:
+            self.outbox.close()
+        self.pushover.close()
+        if self.sampler:
+            self.sampler.close()
+        if self.pid_watcher:
+            self.pid_watcher.close()
+
+        if self.status_page:
+            self.status_page.close()
 
         if self.server_socket:
             self.server_socket.close()
@@ -577,9 +1157,78 @@ def main():
         default=DEFAULT_LOG,
         help=f"Log file path (default: {DEFAULT_LOG})",
     )
+    parser.add_argument(
+        "--core",
+        choices=SERVER_CORES,
+        default="threaded",
+        help="Server core: thread per connection or single event loop (default: threaded)",
+    )
+    parser.add_argument(
+        "--scheduler",
+        choices=sorted(SCHEDULER_BACKENDS),
+        default="heap",
+        help="Timer queue: binary heap or hierarchical timing wheel (default: heap)",
+    )
+    parser.add_argument(
+        "--catch-up",
+        choices=CATCH_UP_POLICIES,
+        default="latest",
+        help="Timers that fell due while the service was down: fire all, fire the latest per "
+        "escalation, or skip them (default: latest)",
+    )
+    parser.add_argument(
+        "--catch-up-max-stale",
+        type=float,
+        default=CATCH_UP_MAX_STALE,
+        metavar="FACTOR",
+        help="Drop overdue timers late by more than this many times their delay, whatever the "
+        f"--catch-up policy (0 keeps them, default: {CATCH_UP_MAX_STALE})",
+    )
+    parser.add_argument(
+        "--delivery-workers",
+        type=int,
+        default=DELIVERY_WORKERS,
+        help=f"Notification delivery threads (default: {DELIVERY_WORKERS})",
+    )
+    parser.add_argument(
+        "--coalesce",
+        type=float,
+        default=COALESCE_WINDOW,
+        metavar="SECONDS",
+        help=f"Merge same-priority notifications due within this window into one (0 disables, default: {COALESCE_WINDOW})",
+    )
+    parser.add_argument(
+        "--busy-interval",
+        type=float,
+        default=BUSY_SAMPLE_INTERVAL,
+        metavar="SECONDS",
+        help=f"How often session processes are sampled for busy detection (0 disables, default: {BUSY_SAMPLE_INTERVAL})",
+    )
+    parser.add_argument(
+        "--listen-fd",
+        type=int,
+        help="Serve on this already-listening socket instead of binding one",
+    )
+    parser.add_argument(
+        "--ready-fd",
+        type=int,
+        help="Write one byte to this pipe once the service is ready",
+    )
     args = parser.parse_args()
 
-    service = EscalationService(args.socket, args.log)
+    service = EscalationService(
+        args.socket,
+        args.log,
+        core=args.core,
+        listen_fd=args.listen_fd,
+        ready_fd=args.ready_fd,
+        scheduler_backend=args.scheduler,
+        catch_up_policy=args.catch_up,
+        catch_up_max_stale=args.catch_up_max_stale,
+        delivery_workers=args.delivery_workers,
+        coalesce=args.coalesce,
+        busy_interval=args.busy_interval,
+    )
     service.start()
 
 
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Escalation Status Page - Connectionless view of the service state.
+
+The service keeps a small memory-mapped file next to its socket
+(escalation.status) describing whether it is running and which sessions may
+have pending escalations. Hooks read it with a single read() to answer the
+common "nothing to cancel" case without connecting to the socket.
+
+Layout (big-endian):
+    4s magic | H version | H flags | Q generation | I pid | I pending_count
+    | BITMAP_BYTES bitmap
+
+The bitmap has one bit per FNV-1a hash bucket of a session ID; a set bit
+means some session in that bucket has pending escalations, a clear bit means
+none do. The generation is odd while the service is updating the page and
+even when the page is consistent (a seqlock), and it increases with every
+update.
+"""
+
+import mmap
+import os
+import struct
+from pathlib import Path
+
+MAGIC = b"ESCS"
+VERSION = 1
+FLAG_RUNNING = 0x0001
+BITMAP_BITS = 8192
+BITMAP_BYTES = BITMAP_BITS // 8
+
+_HEADER = struct.Struct("!4sHHQII")
+_GENERATION_OFFSET = 8
+PAGE_SIZE = _HEADER.size + BITMAP_BYTES
+
+
+def status_page_path(socket_path: Path) -> Path:
+    """Status page location for a service socket."""
+    return socket_path.with_name(socket_path.stem + ".status")
+
+
+def session_bucket(session_id: str) -> int:
+    """Bitmap bucket of a session ID (32-bit FNV-1a).
+
+    Pure Python so that hook_forward.py can compute it without imports.
+    """
+    h = 0x811C9DC5
+    for byte in session_id.encode("utf-8"):
+        h = ((h ^ byte) * 0x01000193) & 0xFFFFFFFF
+    return h % BITMAP_BITS
+
+
+class StatusPageWriter:
+    """Service side: publishes the running flag and pending-session bitmap."""
+
+    def __init__(self, path: Path, pid: int | None = None):
+        self.path = path
+        self.pid = pid or os.getpid()
+        self.pending: set[str] = set()
+        self.bucket_counts = [0] * BITMAP_BITS
+        self.generation = 0
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.ftruncate(fd, PAGE_SIZE)
+            self.page = mmap.mmap(fd, PAGE_SIZE)
+        finally:
+            os.close(fd)
+        self._write_header(FLAG_RUNNING)
+
+    def _write_header(self, flags: int) -> None:
+        """Rewrite the header with a new (even) generation."""
+        self.generation += 2
+        _HEADER.pack_into(self.page, 0, MAGIC, VERSION, flags, self.generation, self.pid, len(self.pending))
+
+    def set_pending(self, session_id: str, pending: bool) -> None:
+        """Record whether a session has pending escalations."""
+        if pending == (session_id in self.pending):
+            return
+        bucket = session_bucket(session_id)
+        byte, bit = divmod(bucket, 8)
+
+        # Seqlock: odd generation while the page is inconsistent
+        struct.pack_into("!Q", self.page, _GENERATION_OFFSET, self.generation + 1)
+        if pending:
+            self.pending.add(session_id)
+            self.bucket_counts[bucket] += 1
+            if self.bucket_counts[bucket] == 1:
+                self.page[_HEADER.size + byte] |= 1 << bit
+        else:
+            self.pending.discard(session_id)
+            self.bucket_counts[bucket] -= 1
+            if self.bucket_counts[bucket] == 0:
+                self.page[_HEADER.size + byte] &= ~(1 << bit) & 0xFF
+        self._write_header(FLAG_RUNNING)
+
+    def close(self) -> None:
+        """Mark the service stopped and remove the page."""
+        self.pending.clear()
+        self._write_header(0)
+        self.page.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class StatusSnapshot:
+    """A consistent copy of the status page."""
+
+    def __init__(self, flags: int, generation: int, pid: int, pending_count: int, bitmap: bytes):
+        self.flags = flags
+        self.generation = generation
+        self.pid = pid
+        self.pending_count = pending_count
+        self.bitmap = bitmap
+
+    @property
+    def running(self) -> bool:
+        """Whether the publishing service is still alive."""
+        if not self.flags & FLAG_RUNNING:
+            return False
+        try:
+            os.kill(self.pid, 0)
+            return True
+        except PermissionError:
+            return True
+        except OSError:
+            return False  # Service crashed without clearing the page
+
+    def may_be_pending(self, session_id: str) -> bool:
+        """False if the session certainly has nothing pending."""
+        if not self.pending_count:
+            return False
+        byte, bit = divmod(session_bucket(session_id), 8)
+        return bool(self.bitmap[byte] & (1 << bit))
+
+
+def read_status_page(path: Path, attempts: int = 3) -> StatusSnapshot | None:
+    """Read a consistent snapshot, or None if the page is missing or unreadable."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        for _ in range(attempts):
+            data = os.pread(fd, PAGE_SIZE, 0)
+            if len(data) < PAGE_SIZE:
+                return None
+            magic, version, flags, generation, pid, pending_count = _HEADER.unpack_from(data)
+            if magic != MAGIC or version != VERSION:
+                return None
+            if generation % 2:
+                continue  # Update in progress
+            # Seqlock check: the page must not have changed while we copied it
+            if os.pread(fd, 8, _GENERATION_OFFSET) != data[_GENERATION_OFFSET:_GENERATION_OFFSET + 8]:
+                continue
+            return StatusSnapshot(flags, generation, pid, pending_count, data[_HEADER.size:])
+        return None
+    finally:
+        os.close(fd)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Escalation Timers - Timer queue backends for the escalation scheduler.
+
+A timer queue orders ScheduledEvents by fire time. EscalationScheduler keeps
+the per-escalation bookkeeping and drives one of these backends:
+
+- heap: binary heap. O(log n) insert; cancelled events stay behind as
+  tombstones and are compacted away once they make up COMPACT_RATIO of it.
+- wheel: hierarchical timing wheel with WHEEL_TICK resolution. O(1) insert
+  and cancel; firing costs O(1) amortized per event plus one cascade per
+  level boundary. Events fire up to one tick late.
+
+Every backend provides push(event), discard(event), pop_due(now),
+next_fire_time() and len(). The scheduler marks an event CANCELLED before
+discarding it, and marks popped events FIRED itself.
+"""
+
+import heapq
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+# What EscalationScheduler.add does with an ID that is already pending
+# (shared with escalation_ctl, which should not import the whole service)
+ADD_MODES = ("replace", "if_absent", "extend")
+
+# ScheduledEvent.state values
+PENDING = 0
+FIRED = 1
+CANCELLED = 2
+
+COMPACT_MIN_TOMBSTONES = 1024  # Never compact tiny heaps
+COMPACT_RATIO = 0.5  # Compact once cancelled events make up this share of the heap
+
+WHEEL_TICK = 0.1  # Seconds per tick of the innermost wheel
+WHEEL_BITS = (8, 6, 6, 6)  # Slots per level: 256 ticks, then 64 each (~25s, ~27min, ~29h, ~77d)
+
+
+@dataclass(order=True)
+class ScheduledEvent:
+    """A scheduled notification event."""
+    fire_time: float
+    escalation_id: str = field(compare=False)
+    message: str = field(compare=False)
+    priority: int = field(compare=False)
+    delay: int = field(default=0, compare=False)
+    state: int = field(default=PENDING, compare=False)
+    # Backend bookkeeping: the timing-wheel slot holding the event
+    handle: Any = field(default=None, compare=False, repr=False)
+
+
+class HeapTimerQueue:
+    """Binary heap of events with lazy deletion and tombstone compaction."""
+
+    def __init__(self, now: Optional[float] = None):
+        self.heap: list[ScheduledEvent] = []
+        self.tombstones = 0  # Cancelled events still in the heap
+
+    def __len__(self) -> int:
+        return len(self.heap) - self.tombstones
+
+    def push(self, event: ScheduledEvent) -> None:
+        """Schedule an event."""
+        heapq.heappush(self.heap, event)
+
+    def discard(self, event: ScheduledEvent) -> None:
+        """Forget a cancelled event (it stays in the heap as a tombstone)."""
+        self.tombstones += 1
+        self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        """Rebuild the heap without tombstones once they dominate it.
+
+        Rebuilding is O(n), but it only happens after Θ(n) cancellations,
+        so cancels stay amortized O(log n) and the heap never holds more
+        than about twice the live timers (long-delay tombstones would
+        otherwise linger for up to an hour).
+        """
+        if self.tombstones < COMPACT_MIN_TOMBSTONES or self.tombstones < len(self.heap) * COMPACT_RATIO:
+            return
+        self.heap = [e for e in self.heap if e.state == PENDING]
+        heapq.heapify(self.heap)
+        self.tombstones = 0
+
+    def _drop_tombstones(self) -> None:
+        """Pop cancelled events off the top of the heap."""
+        while self.heap and self.heap[0].state == CANCELLED:
+            heapq.heappop(self.heap)
+            self.tombstones -= 1
+
+    def pop_due(self, now: float) -> Optional[ScheduledEvent]:
+        """Remove and return the earliest event if it is due, else None."""
+        self._drop_tombstones()
+        if self.heap and self.heap[0].fire_time <= now:
+            return heapq.heappop(self.heap)
+        return None
+
+    def next_fire_time(self) -> Optional[float]:
+        """Fire time of the earliest event, or None if the queue is empty."""
+        self._drop_tombstones()
+        return self.heap[0].fire_time if self.heap else None
+
+
+class TimingWheelTimerQueue:
+    """Hierarchical timing wheel (as in the classic Linux kernel timers).
+
+    Level 0 has one slot per tick; each higher level has one slot per full
+    revolution of the level below. An event goes into the lowest level whose
+    span covers its remaining ticks. Whenever the level-0 index wraps, the
+    due slot of the next level is cascaded: its events are re-placed into
+    lower levels. Slots are dicts keyed by id(event), so cancellation is a
+    single dict deletion.
+    """
+
+    def __init__(self, now: float, tick: float = WHEEL_TICK):
+        self.tick = tick
+        self.current = int(now / tick)  # Last tick processed
+        self.shifts = []
+        shift = 0
+        for bits in WHEEL_BITS:
+            self.shifts.append(shift)
+            shift += bits
+        self.span = 1 << shift  # Ticks covered by the whole wheel
+        self.levels = [[{} for _ in range(1 << bits)] for bits in WHEEL_BITS]
+        # Per level: (ticks covered, index shift, index mask, slots) for _place
+        self.placement = [
+            (1 << (shift + bits), shift, (1 << bits) - 1, slots)
+            for shift, bits, slots in zip(self.shifts, WHEEL_BITS, self.levels)
+        ]
+        self.ready: deque[ScheduledEvent] = deque()  # Due events in fire order
+        self.count = 0  # Pending events (slots plus ready)
+        self.in_slots = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def push(self, event: ScheduledEvent) -> None:
+        """Schedule an event."""
+        self.count += 1
+        self._place(event)
+
+    def _place(self, event: ScheduledEvent) -> None:
+        """Put an event in the slot matching its remaining ticks."""
+        expires = -int(-event.fire_time // self.tick)  # Ceiling: never fire early
+        delta = expires - self.current
+        if delta <= 0:
+            event.handle = None
+            self.ready.append(event)
+            return
+        if delta >= self.span:
+            # Beyond the outermost wheel: park it at the far edge and let
+            # cascading re-place it once it is in range
+            expires = self.current + self.span - 1
+            delta = self.span - 1
+        for limit, shift, mask, slots in self.placement:
+            if delta < limit:
+                slot = slots[(expires >> shift) & mask]
+                slot[id(event)] = event
+                event.handle = slot
+                self.in_slots += 1
+                return
+
+    def discard(self, event: ScheduledEvent) -> None:
+        """Remove a cancelled event in O(1) (events already due are skipped later)."""
+        self.count -= 1
+        slot = event.handle
+        if slot is not None:
+            del slot[id(event)]
+            event.handle = None
+            self.in_slots -= 1
+
+    def _cascade(self, level: int) -> int:
+        """Re-place the current slot of a level. Returns that slot's index."""
+        shift, bits = self.shifts[level], WHEEL_BITS[level]
+        index = (self.current >> shift) & ((1 << bits) - 1)
+        slot = self.levels[level][index]
+        if slot:
+            events = list(slot.values())
+            slot.clear()
+            self.in_slots -= len(events)
+            for event in events:
+                self._place(event)
+        return index
+
+    def _advance(self, now: float) -> None:
+        """Process every tick up to now, moving expired events to ready."""
+        # Tolerate rounding so that now == next_fire_time() reaches its tick
+        target = int(now / self.tick + 1e-6)
+        if not self.in_slots:
+            self.current = max(self.current, target)
+            return
+        mask = (1 << WHEEL_BITS[0]) - 1
+        level0 = self.levels[0]
+        while self.current < target and self.in_slots:
+            self.current += 1
+            index = self.current & mask
+            if index == 0:
+                for level in range(1, len(WHEEL_BITS)):
+                    if self._cascade(level) != 0:
+                        break
+            slot = level0[index]
+            if slot:
+                events = sorted(slot.values())
+                slot.clear()
+                self.in_slots -= len(events)
+                for event in events:
+                    event.handle = None
+                self.ready.extend(events)
+        self.current = max(self.current, target)
+
+    def _drop_cancelled(self) -> None:
+        """Skip cancelled events at the head of the ready queue."""
+        while self.ready and self.ready[0].state == CANCELLED:
+            self.ready.popleft()
+
+    def pop_due(self, now: float) -> Optional[ScheduledEvent]:
+        """Remove and return the next due event, or None."""
+        self._drop_cancelled()
+        if not self.ready:
+            self._advance(now)
+            self._drop_cancelled()
+        if self.ready and self.ready[0].fire_time <= now:
+            self.count -= 1
+            return self.ready.popleft()
+        return None
+
+    def next_fire_time(self) -> Optional[float]:
+        """Earliest time at which pop_due() may return an event.
+
+        Exact for events within the innermost wheel; for later events this
+        is the tick at which their slot cascades, so the scheduler wakes
+        once per occupied outer slot rather than once per tick. An outer
+        slot can cascade before the first occupied level-0 slot comes up,
+        so the earliest of both is returned.
+        """
+        self._drop_cancelled()
+        if self.ready:
+            return self.ready[0].fire_time
+        if not self.in_slots:
+            return None
+        earliest = None
+        level0 = self.levels[0]
+        mask = (1 << WHEEL_BITS[0]) - 1
+        for offset in range(1, mask + 2):
+            if level0[(self.current + offset) & mask]:
+                earliest = self.current + offset
+                break
+        for level in range(1, len(WHEEL_BITS)):
+            shift, bits = self.shifts[level], WHEEL_BITS[level]
+            slots = self.levels[level]
+            block = self.current >> shift
+            for offset in range(1, (1 << bits) + 1):
+                if slots[(block + offset) & ((1 << bits) - 1)]:
+                    start = (block + offset) << shift
+                    if earliest is None or start < earliest:
+                        earliest = start
+                    break
+        return None if earliest is None else earliest * self.tick
+
+SCHEDULER_BACKENDS = {
+    "heap": HeapTimerQueue,
+    "wheel": TimingWheelTimerQueue,
+}
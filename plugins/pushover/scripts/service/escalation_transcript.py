@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Escalation Transcript - Reading Claude Code transcripts from the end.
+
+A transcript is a JSON-lines file that grows by one entry per message,
+tool call and tool result; long sessions reach hundreds of megabytes. The
+Stop hook only needs the last assistant text, so instead of parsing the
+file from the start it reads backwards: reverse_lines() seeks from the end
+in TAIL_BLOCK_SIZE blocks and yields complete lines last first, and only
+lines that can hold an assistant text block are parsed.
+
+Memory stays bounded: a line longer than TAIL_MAX_LINE (a huge tool
+result, say) is skipped without being assembled.
+
+The service goes further with TranscriptIndexer: per session it remembers
+the byte offset up to which the transcript was parsed, the last assistant
+text and running counters, and each transcript_summary request parses only
+what was appended since the previous one. A registered session is indexed
+in the background as soon as it registers, so its first Stop is cheap too.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+TAIL_BLOCK_SIZE = 64 * 1024  # Bytes read per backward seek
+TAIL_MAX_LINE = 8 * 1024 * 1024  # Longer lines are skipped, not buffered
+INDEX_CHUNK_SIZE = 1024 * 1024  # Bytes read per step when the index catches up
+INDEX_MAX_SESSIONS = 256  # Indexes kept; the least recently used is dropped
+
+
+def reverse_lines(f: BinaryIO, block_size: int = TAIL_BLOCK_SIZE, max_line: int = TAIL_MAX_LINE) -> Iterator[bytes]:
+    """Non-empty lines of a binary file, last first, without line terminators.
+
+    Lines longer than max_line are skipped.
+    """
+    pos = f.seek(0, os.SEEK_END)
+    parts: list[bytes] = []  # Tail pieces of the line being assembled, last piece first
+    size = 0
+    oversized = False
+    while pos > 0:
+        step = min(block_size, pos)
+        pos -= step
+        f.seek(pos)
+        block = f.read(step)
+        end = len(block)
+        while True:
+            newline = block.rfind(b"\n", 0, end)
+            if newline < 0:
+                break
+            piece = block[newline + 1:end]
+            end = newline
+            if not oversized and size + len(piece) <= max_line:
+                line = piece + b"".join(reversed(parts))
+                if line.strip():
+                    yield line
+            parts, size, oversized = [], 0, False
+        # The rest of the block starts a line that began in an earlier block
+        if not oversized:
+            size += end
+            if size > max_line:
+                parts, oversized = [], True
+            else:
+                parts.append(block[:end])
+    if not oversized:
+        line = b"".join(reversed(parts))
+        if line.strip():
+            yield line
+
+
+def forward_lines(
+    f: BinaryIO, offset: int, chunk_size: int = INDEX_CHUNK_SIZE, max_line: int = TAIL_MAX_LINE
+) -> Iterator[tuple[bytes, int]]:
+    """Complete lines of a binary file from offset on, each with the offset just past it.
+
+    A last line without its newline (still being written) is not yielded.
+    Lines longer than max_line are yielded as b"", without being assembled.
+    """
+    f.seek(offset)
+    partial = b""
+    oversized = False
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        start = 0
+        while True:
+            newline = chunk.find(b"\n", start)
+            if newline < 0:
+                break
+            piece = chunk[start:newline]
+            fits = not oversized and len(partial) + len(piece) <= max_line
+            yield (partial + piece if fits else b""), offset + newline + 1
+            partial, oversized = b"", False
+            start = newline + 1
+        rest = chunk[start:]
+        if not oversized:
+            if len(partial) + len(rest) > max_line:
+                partial, oversized = b"", True
+            else:
+                partial += rest
+        offset += len(chunk)
+
+
+def assistant_text(entry: object) -> str:
+    """The last text block of an assistant transcript entry ("" if it has none)."""
+    if not isinstance(entry, dict):
+        return ""
+    msg = entry.get("message")
+    if not isinstance(msg, dict) or msg.get("role") != "assistant":
+        return ""
+    content = msg.get("content")
+    if not isinstance(content, list):
+        return ""
+    for block in reversed(content):
+        if isinstance(block, dict) and block.get("type") == "text":
+            return block.get("text", "")
+    return ""
+
+
+def last_assistant_text(path: Path) -> str:
+    """The last assistant text in a transcript ("" if there is none). Raises OSError."""
+    with open(path, "rb") as f:
+        for line in reverse_lines(f):
+            # Cheap filter: most lines are tool calls and results
+            if b'"assistant"' not in line or b'"text"' not in line:
+                continue
+            try:
+                text = assistant_text(json.loads(line))
+            except ValueError:
+                continue  # Partially written last line
+            if text:
+                return text
+    return ""
+
+
+class TranscriptIndex:
+    """Running summary of one transcript, advanced over the bytes appended since the last update.
+
+    assistant_turns counts assistant messages (API responses; Claude Code
+    writes each content block of a message as its own line, with the same
+    message id), tool_uses their tool_use blocks.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, inode: Optional[int]) -> None:
+        self.inode = inode
+        self.offset = 0
+        self.last_text = ""
+        self.assistant_turns = 0
+        self.tool_uses = 0
+        self.last_message_id: Optional[str] = None
+
+    def _apply(self, line: bytes) -> None:
+        if b'"assistant"' not in line:
+            return  # Cheap filter: user prompts and tool results
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            return
+        msg = entry.get("message") if isinstance(entry, dict) else None
+        if not isinstance(msg, dict) or msg.get("role") != "assistant":
+            return
+        message_id = msg.get("id")
+        if message_id is None or message_id != self.last_message_id:
+            self.assistant_turns += 1
+        self.last_message_id = message_id
+        content = msg.get("content")
+        if isinstance(content, list):
+            self.tool_uses += sum(1 for b in content if isinstance(b, dict) and b.get("type") == "tool_use")
+        text = assistant_text(entry)
+        if text:
+            self.last_text = text
+
+    def update(self) -> dict:
+        """Parse what was appended since the last update and return the summary. Raises OSError."""
+        with self.lock:
+            with open(self.path, "rb") as f:
+                st = os.fstat(f.fileno())
+                if st.st_ino != self.inode or st.st_size < self.offset:
+                    self._reset(st.st_ino)  # New, replaced or truncated: start over
+                start = self.offset
+                for line, end in forward_lines(f, self.offset):
+                    if line:
+                        self._apply(line)
+                    self.offset = end
+            return {
+                "text": self.last_text,
+                "assistant_turns": self.assistant_turns,
+                "tool_uses": self.tool_uses,
+                "offset": self.offset,
+                "parsed_bytes": self.offset - start,
+            }
+
+
+class TranscriptIndexer:
+    """Transcript indexes by session ID, for the service. Thread-safe."""
+
+    def __init__(self, max_sessions: int = INDEX_MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self.indexes: OrderedDict[str, TranscriptIndex] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _index(self, session_id: str, path: Optional[Path]) -> Optional[TranscriptIndex]:
+        """The session's index, (re)created for path if given and different."""
+        with self.lock:
+            index = self.indexes.get(session_id)
+            if path is not None and (index is None or index.path != path):
+                index = self.indexes[session_id] = TranscriptIndex(path)
+                if len(self.indexes) > self.max_sessions:
+                    self.indexes.popitem(last=False)
+            if index is not None:
+                self.indexes.move_to_end(session_id)
+            return index
+
+    def track(self, session_id: str, path: Path) -> None:
+        """Index a session's transcript, catching up with it in the background."""
+        index = self._index(session_id, path)
+        threading.Thread(target=self._catch_up, args=(index,), name="transcript-index", daemon=True).start()
+
+    @staticmethod
+    def _catch_up(index: TranscriptIndex) -> None:
+        try:
+            index.update()
+        except OSError:
+            pass  # Not written yet; the first summary request indexes it
+
+    def summary(self, session_id: str, path: Optional[Path] = None) -> Optional[dict]:
+        """Bring the session's index up to date and return its summary.
+
+        None if the session has no index and no path was given. Raises OSError.
+        """
+        index = self._index(session_id, path)
+        return index.update() if index else None
+
+    def forget(self, session_id: str) -> None:
+        with self.lock:
+            self.indexes.pop(session_id, None)
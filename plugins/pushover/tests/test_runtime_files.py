@@ -0,0 +1,72 @@
+"""Runtime files next to the socket must not clobber each other's writes."""
+
+import json
+import logging
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "scripts" / "service"))
+sys.path.insert(0, str(ROOT / "tools" / "pushover-notify"))
+
+from escalation_budget import MessageBudget, budget_path
+from escalation_journal import EscalationJournal, journal_paths
+from escalation_outbox import Outbox, append_outbox, outbox_path
+from po_notify import RateLimit
+
+ROUNDS = 300
+
+
+def run_together(*targets) -> None:
+    threads = [threading.Thread(target=t) for t in targets]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def test_snapshot_and_budget_save_concurrently(tmp_path):
+    socket_path = tmp_path / "escalation.sock"
+    journal = EscalationJournal(*journal_paths(socket_path), logging.getLogger("test"))
+    budget = MessageBudget(budget_path(socket_path))
+    state = {"session-1": [[1e10, 0, 60, "Awaiting permission"]]}
+
+    def snapshots():
+        for _ in range(ROUNDS):
+            journal._write_snapshot(state)
+
+    def budget_saves():
+        for i in range(ROUNDS):
+            budget.observe(RateLimit(10000, 10000 - i, 2e9))
+
+    run_together(snapshots, budget_saves)
+    journal.close()
+
+    snapshot = json.loads(journal_paths(socket_path)[1].read_text())
+    assert snapshot["escalations"] == state
+    assert "limit" in json.loads(budget_path(socket_path).read_text())
+    assert EscalationJournal(*journal_paths(socket_path), logging.getLogger("test")).load() == state
+
+
+def test_outbox_compaction_and_budget_save_concurrently(tmp_path):
+    socket_path = tmp_path / "escalation.sock"
+    path = outbox_path(socket_path)
+    append_outbox(path, "session-1", "Claude", "Task completed", 0)
+    outbox = Outbox(path, lambda entry: None, logging.getLogger("test"))
+    budget = MessageBudget(budget_path(socket_path))
+
+    def compactions():
+        for _ in range(ROUNDS):
+            with outbox.condition:
+                outbox._compact()
+
+    def budget_saves():
+        for i in range(ROUNDS):
+            budget.observe(RateLimit(10000, 10000 - i, 2e9))
+
+    run_together(compactions, budget_saves)
+    outbox.close()
+
+    assert [json.loads(line)["escalation_id"] for line in path.read_text().splitlines()] == ["session-1"]
+    assert "limit" in json.loads(budget_path(socket_path).read_text())
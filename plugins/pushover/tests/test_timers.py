@@ -0,0 +1,58 @@
+"""The timing wheel must never wake the scheduler later than the heap would."""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "service"))
+
+from escalation_timers import CANCELLED, WHEEL_TICK, HeapTimerQueue, ScheduledEvent, TimingWheelTimerQueue
+
+DELAYS = (0.5, 5, 20, 60, 300, 3600)  # Short and long, on both sides of the level-0 span
+
+
+def test_wheel_repro_short_event_after_long_one():
+    wheel = TimingWheelTimerQueue(0.0)
+    wheel.push(ScheduledEvent(60.0, "B", "", 0))
+    assert wheel.pop_due(51.1) is None
+    wheel.push(ScheduledEvent(76.1, "A", "", 0))
+    assert wheel.next_fire_time() <= 60.0
+
+
+def test_wheel_next_fire_time_matches_heap():
+    for seed in range(20):
+        rng = random.Random(seed)
+        now = rng.uniform(0, 1000)
+        heap, wheel = HeapTimerQueue(now), TimingWheelTimerQueue(now)
+        pending = []
+        for _ in range(300):
+            action = rng.random()
+            if action < 0.5:
+                event = ScheduledEvent(now + rng.choice(DELAYS) * rng.uniform(0.5, 1.5), "id", "", 0)
+                twin = ScheduledEvent(event.fire_time, "id", "", 0)
+                heap.push(event)
+                wheel.push(twin)
+                pending.append((event, twin))
+            elif action < 0.6 and pending:
+                event, twin = pending.pop(rng.randrange(len(pending)))
+                event.state = twin.state = CANCELLED
+                heap.discard(event)
+                wheel.discard(twin)
+            else:
+                # Sleep as the scheduler does: until the wheel's wake time, or less
+                wake = wheel.next_fire_time()
+                if wake is None:
+                    now += rng.uniform(0, 100)
+                else:
+                    earliest = heap.next_fire_time()
+                    assert earliest is None or wake <= earliest + WHEEL_TICK, (seed, now)
+                    now = max(now, wake if rng.random() < 0.8 else rng.uniform(now, wake))
+                while (event := heap.pop_due(now)) is not None:
+                    pending = [p for p in pending if p[0] is not event]
+                while (twin := wheel.pop_due(now)) is not None:
+                    assert now - twin.fire_time <= WHEEL_TICK + 1e-6, (seed, now, twin.fire_time)
+        # The wheel may lag the heap by a tick, but both end up firing every live event
+        end = now + 2 * max(DELAYS)
+        while heap.pop_due(end) is not None or wheel.pop_due(end) is not None:
+            pass
+        assert len(heap) == len(wheel) == 0
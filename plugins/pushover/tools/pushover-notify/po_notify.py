@@ -1,22 +1,137 @@
 #!/usr/bin/env python3
 """
-Pushover Notification Script for macOS
+Pushover Notification Script
 
-Sends push notifications via Pushover API using credentials stored in macOS Keychain.
-Secrets never appear in command line arguments or process lists.
+Sends push notifications via Pushover API. Secrets never appear in command
+line arguments or process lists; they come from the first credential backend
+that has them:
+
+    env       PUSHOVER_APP_TOKEN and PUSHOVER_USER_KEY
+    file      ~/.config/pushover/credentials (app_token=/user_key= lines, mode 0600)
+    keychain  macOS Keychain (pushover_app_token, pushover_iphone_key)
+    keyring   Linux kernel keyring (pushover_app_token, pushover_user_key user keys)
+
+The default order is env, file, then keychain on macOS or keyring on Linux;
+set PUSHOVER_CREDENTIALS (or --credentials) to a comma-separated list to
+change it. Credentials are cached in memory for CREDENTIALS_TTL seconds and
+dropped early when Pushover rejects them.
+
+Also importable: PushoverClient keeps pooled keep-alive HTTPS connections
+and raises PushoverError instead of exiting, so long-running callers (the
+escalation service, the Stop hook) send in-process with one request round
+trip per notification. The CLI is a thin wrapper around it.
 
 Usage:
     po_notify.py "Title" "Message"
     po_notify.py "Title" "Message" --priority 1
     po_notify.py "Title" "Message" --priority 2 --retry 60 --expire 1800
     po_notify.py "Title" "Message" --url "https://example.com"
+    po_notify.py "Title" "Message" --credentials env,keyring
 """
 
+import abc
 import argparse
+import http.client
+import json
+import os
+import ssl
+import stat
 import subprocess
-import urllib.error
+import sys
+import threading
+import time
 import urllib.parse
-import urllib.request
+from dataclasses import dataclass, field
+from pathlib import Path
+
+API_HOST = "api.pushover.net"
+API_PATH = "/1/messages.json"
+REQUEST_TIMEOUT = 10  # Seconds per connect or read
+POOL_SIZE = 4  # Idle keep-alive connections kept per client
+
+# A reused keep-alive connection may have been closed by the server; these
+# errors on a reused connection mean "reconnect and send again"
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    http.client.BadStatusLine,
+    ConnectionError,
+)
+
+
+@dataclass
+class RateLimit:
+    """The application's monthly message budget, from X-Limit-App-* headers."""
+    limit: int
+    remaining: int
+    reset: float  # Unix time at which remaining goes back to limit
+
+    @classmethod
+    def from_headers(cls, headers: dict) -> "RateLimit | None":
+        """Parse lower-cased response headers; None if they are absent or malformed."""
+        try:
+            return cls(
+                int(headers["x-limit-app-limit"]),
+                int(headers["x-limit-app-remaining"]),
+                float(headers["x-limit-app-reset"]),
+            )
+        except (KeyError, ValueError):
+            return None
+
+
+class PushoverError(Exception):
+    """A notification could not be delivered.
+
+    status is the HTTP status for API errors (None for network errors);
+    retryable is True for network errors and 5xx responses. rate_limit is
+    the budget reported with an API error (notably 429, over the limit).
+    """
+
+    def __init__(
+        self,
+        message: str,
+        status: int | None = None,
+        retryable: bool = False,
+        rate_limit: RateLimit | None = None,
+    ):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+        self.rate_limit = rate_limit
+
+
+class CredentialError(PushoverError):
+    """The Pushover token or user key could not be retrieved."""
+
+
+@dataclass
+class PushoverResponse:
+    """A successful API response."""
+    status: int
+    body: dict
+    headers: dict = field(default_factory=dict)  # Lower-cased header names
+
+    @property
+    def rate_limit(self) -> RateLimit | None:
+        """Remaining monthly budget reported with this response."""
+        return RateLimit.from_headers(self.headers)
+
+
+# Names under which the app token and user key are stored, per backend
+KEYCHAIN_SERVICES = ("pushover_app_token", "pushover_iphone_key")
+KEYRING_KEYS = ("pushover_app_token", "pushover_user_key")
+ENV_VARS = ("PUSHOVER_APP_TOKEN", "PUSHOVER_USER_KEY")
+CREDENTIALS_FILE = Path("~/.config/pushover/credentials").expanduser()
+CREDENTIALS_TTL = 3600  # Seconds a cached secret is trusted in long-running processes
+
+BREAKER_THRESHOLD = 5  # Consecutive failures that open the circuit
+BREAKER_RESET = 30.0  # Seconds the circuit stays open before a probe
+BREAKER_MAX_RESET = 600.0  # Cap on the open period, which doubles after each failed probe
+# Breaker state shared by every process using po_notify (service, hooks, CLI).
+# po_notify is a standalone tool that also runs outside Claude Code, so like
+# its credentials file it keeps state under the XDG directories rather than
+# ~/.claude/run, where only the escalation service's own files live.
+BREAKER_STATE = Path(os.environ.get("XDG_CACHE_HOME") or "~/.cache").expanduser() / "pushover" / "breaker.json"
 
 
 def get_keychain_password(service: str) -> str:
@@ -27,13 +142,515 @@ def get_keychain_password(service: str) -> str:
             text=True,
             stderr=subprocess.DEVNULL,
         ).strip()
-    except subprocess.CalledProcessError:
-        raise SystemExit(
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        raise CredentialError(
             f"Error: Could not find '{service}' in Keychain.\n"
             f"Add it with: security add-generic-password -U -a \"$USER\" -s {service} -w \"YOUR_SECRET\""
         )
 
 
+class CredentialProvider(abc.ABC):
+    """Source of the (app token, user key) pair.
+
+    fetch() raises CredentialError when the backend has no credentials;
+    invalidate() drops anything cached.
+    """
+
+    name = "none"
+
+    @abc.abstractmethod
+    def fetch(self) -> tuple[str, str]:
+        ...
+
+    def invalidate(self) -> None:
+        pass
+
+
+class KeychainCredentials(CredentialProvider):
+    """macOS Keychain generic passwords (see setup-service.sh)."""
+
+    name = "keychain"
+
+    def fetch(self) -> tuple[str, str]:
+        token_service, user_service = KEYCHAIN_SERVICES
+        return get_keychain_password(token_service), get_keychain_password(user_service)
+
+
+class EnvCredentials(CredentialProvider):
+    """PUSHOVER_APP_TOKEN and PUSHOVER_USER_KEY environment variables."""
+
+    name = "env"
+
+    def fetch(self) -> tuple[str, str]:
+        token, user = (os.environ.get(var, "").strip() for var in ENV_VARS)
+        if not token or not user:
+            raise CredentialError(f"Error: {' and '.join(ENV_VARS)} are not both set")
+        return token, user
+
+
+class FileCredentials(CredentialProvider):
+    """A key=value file with app_token and user_key, readable by its owner only."""
+
+    name = "file"
+
+    def __init__(self, path: Path = CREDENTIALS_FILE):
+        self.path = path
+
+    def fetch(self) -> tuple[str, str]:
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except OSError as e:
+            raise CredentialError(f"Error: Cannot open {self.path}: {e.strerror}") from e
+        with os.fdopen(fd, encoding="utf-8") as f:
+            mode = os.fstat(f.fileno()).st_mode
+            if mode & (stat.S_IRWXG | stat.S_IRWXO):
+                raise CredentialError(f"Error: {self.path} must not be accessible by group or others (chmod 600)")
+            values = {}
+            for line in f:
+                key, sep, value = line.partition("=")
+                if sep and not key.lstrip().startswith("#"):
+                    values[key.strip()] = value.strip()
+        token, user = values.get("app_token"), values.get("user_key")
+        if not token or not user:
+            raise CredentialError(f"Error: {self.path} needs app_token=... and user_key=... lines")
+        return token, user
+
+
+class KeyringCredentials(CredentialProvider):
+    """Linux kernel keyring "user" keys, read with keyctl(1).
+
+    Add them with: keyctl add user pushover_app_token "YOUR_TOKEN" @u
+    """
+
+    name = "keyring"
+
+    def fetch(self) -> tuple[str, str]:
+        return tuple(self._read(key) for key in KEYRING_KEYS)
+
+    @staticmethod
+    def _read(key: str) -> str:
+        try:
+            return subprocess.check_output(
+                ["keyctl", "pipe", f"%user:{key}"],
+                text=True,
+                stderr=subprocess.DEVNULL,
+            ).strip()
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            raise CredentialError(
+                f"Error: Could not find '{key}' in the kernel keyring.\n"
+                f"Add it with: keyctl add user {key} \"YOUR_SECRET\" @u"
+            )
+
+
+CREDENTIAL_BACKENDS = {
+    provider.name: provider
+    for provider in (EnvCredentials, FileCredentials, KeychainCredentials, KeyringCredentials)
+}
+
+
+class ChainedCredentials(CredentialProvider):
+    """First backend that has credentials wins."""
+
+    name = "chain"
+
+    def __init__(self, providers: list[CredentialProvider]):
+        self.providers = providers
+
+    def fetch(self) -> tuple[str, str]:
+        errors = []
+        for provider in self.providers:
+            try:
+                return provider.fetch()
+            except CredentialError as e:
+                errors.append(str(e))
+        details = "\n".join(f"  [{p.name}] {e}" for p, e in zip(self.providers, errors))
+        raise CredentialError(f"Error: No Pushover credentials found:\n{details}")
+
+
+class CachedCredentials(CredentialProvider):
+    """Keeps another provider's credentials in memory for ttl seconds."""
+
+    def __init__(self, provider: CredentialProvider, ttl: float = CREDENTIALS_TTL):
+        self.provider = provider
+        self.name = provider.name
+        self.ttl = ttl
+        self._cached: tuple[str, str] | None = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def fetch(self) -> tuple[str, str]:
+        with self._lock:
+            if self._cached is None or time.monotonic() >= self._expires:
+                self._cached = self.provider.fetch()
+                self._expires = time.monotonic() + self.ttl
+            return self._cached
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._cached = None
+            self.provider.invalidate()
+
+
+def default_backends() -> list[str]:
+    """Backend order from PUSHOVER_CREDENTIALS, or env, file, then the platform store."""
+    configured = os.environ.get("PUSHOVER_CREDENTIALS", "")
+    if configured:
+        return [name.strip() for name in configured.split(",") if name.strip()]
+    platform_store = "keychain" if sys.platform == "darwin" else "keyring"
+    return ["env", "file", platform_store]
+
+
+def credential_provider(backends: list[str] | None = None, ttl: float = CREDENTIALS_TTL) -> CredentialProvider:
+    """Cached provider trying the given backends in order."""
+    names = backends or default_backends()
+    unknown = [name for name in names if name not in CREDENTIAL_BACKENDS]
+    if unknown:
+        raise CredentialError(f"Error: Unknown credential backend(s): {', '.join(unknown)}")
+    providers = [CREDENTIAL_BACKENDS[name]() for name in names]
+    provider = providers[0] if len(providers) == 1 else ChainedCredentials(providers)
+    return CachedCredentials(provider, ttl=ttl)
+
+
+class CircuitBreaker:
+    """Stops sending to an unreachable Pushover instead of waiting out every timeout.
+
+    closed: requests go through; threshold consecutive failures (network
+    errors, 5xx) open the circuit. open: requests fail at once until the
+    reset period is over. half_open: one probe request is let through;
+    success closes the circuit, failure reopens it for twice as long.
+
+    With a state_path the open/closed state is shared between processes:
+    transitions are written to that file and picked up by the others.
+    Thread-safe; wait_open() lets a prober sleep until the circuit opens.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        threshold: int = BREAKER_THRESHOLD,
+        reset: float = BREAKER_RESET,
+        max_reset: float = BREAKER_MAX_RESET,
+        state_path: Path | None = None,
+    ):
+        self.threshold = threshold
+        self.base_reset = reset
+        self.max_reset = max_reset
+        self.state_path = state_path
+        self.state = self.CLOSED
+        self.failures = 0  # Consecutive
+        self.reset = reset  # Current open period
+        self.retry_at = 0.0  # Unix time at which an open circuit admits a probe
+        self.probing = False
+        self.opened = 0  # Times the circuit opened in this process
+        self._seen: int | None = None  # mtime_ns of the state file last loaded or written
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)  # Notified when the circuit opens
+
+    def _sync(self) -> None:
+        """Adopt a transition another process wrote to the state file (lock held)."""
+        if self.state_path is None:
+            return
+        try:
+            mtime = os.stat(self.state_path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime == self._seen:
+            return
+        self._seen = mtime
+        if mtime is None:
+            self.state, self.failures, self.reset = self.CLOSED, 0, self.base_reset
+            return
+        try:
+            shared = json.loads(self.state_path.read_text())
+            self.state = self.OPEN
+            self.failures = int(shared["failures"])
+            self.reset = float(shared["reset"])
+            self.retry_at = float(shared["retry_at"])
+            self._changed.notify_all()
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def _publish(self) -> None:
+        """Write (open) or remove (closed) the shared state file (lock held)."""
+        if self.state_path is None:
+            return
+        try:
+            if self.state == self.CLOSED:
+                self.state_path.unlink(missing_ok=True)
+                self._seen = None
+                return
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"failures": self.failures, "reset": self.reset, "retry_at": self.retry_at}))
+            os.replace(tmp, self.state_path)
+            self._seen = os.stat(self.state_path).st_mtime_ns
+        except OSError:
+            pass
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now (taking the probe slot when half-open)."""
+        with self._lock:
+            self._sync()
+            if self.state == self.CLOSED:
+                return True
+            if self.probing or time.time() < self.retry_at:
+                return False
+            self.state = self.HALF_OPEN
+            self.probing = True
+            return True
+
+    def record_success(self) -> None:
+        """Pushover answered: close the circuit."""
+        with self._lock:
+            self.probing = False
+            self.failures = 0
+            if self.state != self.CLOSED:
+                self.state = self.CLOSED
+                self.reset = self.base_reset
+                self._publish()
+
+    def record_failure(self) -> None:
+        """Pushover could not be reached (or failed with 5xx)."""
+        with self._lock:
+            self.failures += 1
+            if self.probing:
+                self.probing = False
+                self.reset = min(self.max_reset, self.reset * 2)
+                self._open()
+            elif self.state == self.CLOSED and self.failures >= self.threshold:
+                self._open()
+
+    def release(self) -> None:
+        """A request failed before reaching Pushover: give the probe slot back."""
+        with self._lock:
+            if self.probing:
+                self.probing = False
+                self.state = self.OPEN
+
+    def _open(self) -> None:
+        """Open the circuit for the current reset period (lock held)."""
+        self.state = self.OPEN
+        self.retry_at = time.time() + self.reset
+        self.opened += 1
+        self._publish()
+        self._changed.notify_all()
+
+    def wait_open(self, timeout: float | None = None) -> bool:
+        """Block until the circuit is open, wake() is called or timeout passes; returns whether it is open.
+
+        An opening written by another process is noticed the next time this
+        process consults the breaker (before its next send).
+        """
+        with self._changed:
+            self._sync()
+            if self.state == self.CLOSED:
+                self._changed.wait(timeout)
+                self._sync()
+            return self.state != self.CLOSED
+
+    def wake(self) -> None:
+        """Release every wait_open() caller (at shutdown)."""
+        with self._changed:
+            self._changed.notify_all()
+
+    def stats(self) -> dict:
+        """Current state for status reporting."""
+        with self._lock:
+            self._sync()
+            stats = {"state": self.state, "failures": self.failures, "opened": self.opened}
+            if self.state != self.CLOSED:
+                stats["retry_in"] = round(max(0.0, self.retry_at - time.time()), 1)
+            return stats
+
+
+class PushoverClient:
+    """Pushover API client with pooled keep-alive HTTPS connections.
+
+    Safe to share between threads: each send() borrows an idle connection
+    (or opens one) and returns it afterwards, so a long-running process pays
+    for the TCP and TLS handshakes once rather than per notification. A
+    pooled connection the server has since closed is replaced and the
+    request sent again.
+
+    With a CircuitBreaker, send() fails fast with a retryable PushoverError
+    while the circuit is open.
+    """
+
+    def __init__(
+        self,
+        credentials: CredentialProvider | None = None,
+        pool_size: int = POOL_SIZE,
+        timeout: float = REQUEST_TIMEOUT,
+        breaker: CircuitBreaker | None = None,
+    ):
+        # Cached after the first fetch, so repeated sends cost no lookups
+        self.credentials = credentials or credential_provider()
+        self.breaker = breaker
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.ssl_context = ssl.create_default_context()
+        self._idle: list[http.client.HTTPSConnection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> http.client.HTTPSConnection:
+        return http.client.HTTPSConnection(API_HOST, timeout=self.timeout, context=self.ssl_context)
+
+    def _acquire(self) -> tuple[http.client.HTTPSConnection, bool]:
+        """An idle pooled connection, or a new one. Returns (connection, reused)."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._connect(), False
+
+    def _release(self, conn: http.client.HTTPSConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def probe(self) -> None:
+        """Check that the API host is reachable (TCP and TLS handshake) without
+        sending a message, reporting the outcome to the breaker. The connection
+        is kept for the next send. Raises PushoverError if unreachable.
+        """
+        conn = self._connect()
+        try:
+            conn.connect()
+        except OSError as e:
+            conn.close()
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            raise PushoverError(f"Pushover unreachable: {e}", retryable=True) from e
+        if self.breaker is not None:
+            self.breaker.record_success()
+        self._release(conn)
+
+    def send(
+        self,
+        title: str,
+        message: str,
+        priority: int = 0,
+        url: str = "",
+        retry: int = 0,
+        expire: int = 0,
+    ) -> PushoverResponse:
+        """Send a notification. Raises PushoverError on failure."""
+        if self.breaker is None:
+            return self._send(title, message, priority, url, retry, expire)
+        if not self.breaker.allow():
+            raise PushoverError("Pushover unreachable, circuit breaker open", retryable=True)
+        try:
+            response = self._send(title, message, priority, url, retry, expire)
+        except PushoverError as e:
+            if e.retryable:
+                self.breaker.record_failure()
+            elif e.status is not None:
+                self.breaker.record_success()  # The API answered
+            else:
+                self.breaker.release()
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return response
+
+    def _send(self, title: str, message: str, priority: int, url: str, retry: int, expire: int) -> PushoverResponse:
+        token, user = self.credentials.fetch()
+        data = {
+            "token": token,
+            "user": user,
+            "title": title,
+            "message": message,
+            "priority": str(priority),
+        }
+
+        # Emergency priority (2) requires retry and expire
+        if priority == 2:
+            if not retry or not expire:
+                raise PushoverError("priority=2 (emergency) requires retry and expire")
+            data["retry"] = str(retry)
+            data["expire"] = str(expire)
+
+        if url:
+            data["url"] = url
+
+        body = urllib.parse.urlencode(data).encode("utf-8")
+        conn, reused = self._acquire()
+        try:
+            status, headers, payload, will_close = self._post(conn, body)
+        except _STALE_CONNECTION_ERRORS as e:
+            conn.close()
+            if not reused:
+                raise PushoverError(f"Pushover send failed: {e}", retryable=True) from e
+            conn = self._connect()
+            try:
+                status, headers, payload, will_close = self._post(conn, body)
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise PushoverError(f"Pushover send failed: {e}", retryable=True) from e
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            raise PushoverError(f"Pushover send failed: {e}", retryable=True) from e
+
+        if will_close:
+            conn.close()
+        else:
+            self._release(conn)
+
+        if status in (400, 401):
+            # Possibly rotated or revoked credentials: fetch them afresh next time
+            self.credentials.invalidate()
+        if status != 200:
+            error_body = payload.decode("utf-8", errors="replace")
+            raise PushoverError(
+                f"Pushover API error ({status}): {error_body}",
+                status=status,
+                retryable=status >= 500,
+                rate_limit=RateLimit.from_headers(headers),
+            )
+        try:
+            parsed = json.loads(payload)
+        except ValueError:
+            parsed = {}
+        return PushoverResponse(status, parsed, headers)
+
+    def _post(self, conn: http.client.HTTPSConnection, body: bytes) -> tuple[int, dict, bytes, bool]:
+        """POST one message. Returns (status, headers, body, will_close)."""
+        conn.request(
+            "POST",
+            API_PATH,
+            body=body,
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        resp = conn.getresponse()
+        payload = resp.read()  # Read fully so the connection can be reused
+        headers = {name.lower(): value for name, value in resp.getheaders()}
+        return resp.status, headers, payload, resp.will_close
+
+
+_default_client: PushoverClient | None = None
+
+
+def get_client() -> PushoverClient:
+    """Shared client for this process."""
+    global _default_client
+    if _default_client is None:
+        _default_client = PushoverClient(breaker=CircuitBreaker(state_path=BREAKER_STATE))
+    return _default_client
+
+
 def send_pushover(
     title: str,
     message: str,
@@ -41,53 +658,23 @@ def send_pushover(
     url: str = "",
     retry: int = 0,
     expire: int = 0,
+    client: PushoverClient | None = None,
 ) -> None:
-    """Send a notification via Pushover API."""
-    # Retrieve credentials from Keychain
-    token = get_keychain_password("pushover_app_token")
-    user = get_keychain_password("pushover_iphone_key")
-
-    data = {
-        "token": token,
-        "user": user,
-        "title": title,
-        "message": message,
-        "priority": str(priority),
-    }
-
-    # Emergency priority (2) requires retry and expire
-    if priority == 2:
-        if not retry or not expire:
-            raise SystemExit(
-                "Error: priority=2 (emergency) requires --retry and --expire.\n"
-                "Example: po_notify.py 'Alert' 'Message' --priority 2 --retry 60 --expire 1800"
-            )
-        data["retry"] = str(retry)
-        data["expire"] = str(expire)
-
-    if url:
-        data["url"] = url
-
-    body = urllib.parse.urlencode(data).encode("utf-8")
-    req = urllib.request.Request(
-        "https://api.pushover.net/1/messages.json",
-        data=body,
-        method="POST",
-    )
-
+    """Send a notification via Pushover API (exits with an error message on failure)."""
+    if priority == 2 and (not retry or not expire):
+        raise SystemExit(
+            "Error: priority=2 (emergency) requires --retry and --expire.\n"
+            "Example: po_notify.py 'Alert' 'Message' --priority 2 --retry 60 --expire 1800"
+        )
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            resp.read()
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode("utf-8", errors="replace")
-        raise SystemExit(f"Pushover API error ({e.code}): {error_body}")
-    except Exception as e:
-        raise SystemExit(f"Pushover send failed: {e}")
+        (client or get_client()).send(title, message, priority=priority, url=url, retry=retry, expire=expire)
+    except PushoverError as e:
+        raise SystemExit(str(e))
 
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Send push notifications via Pushover (credentials from Keychain)",
+        description="Send push notifications via Pushover",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
@@ -130,9 +717,26 @@ Priority levels:
         default=0,
         help="Expiration time in seconds (required for priority 2)",
     )
+    parser.add_argument(
+        "--credentials",
+        default="",
+        help=f"Comma-separated credential backends to try, of: {', '.join(CREDENTIAL_BACKENDS)} "
+        f"(default: $PUSHOVER_CREDENTIALS or {','.join(default_backends())})",
+    )
 
     args = parser.parse_args()
 
+    client = None
+    if args.credentials:
+        try:
+            client = PushoverClient(
+                credential_provider(args.credentials.split(",")),
+                pool_size=0,
+                breaker=CircuitBreaker(state_path=BREAKER_STATE),
+            )
+        except CredentialError as e:
+            raise SystemExit(str(e))
+
     send_pushover(
         title=args.title,
         message=args.message,
@@ -140,6 +744,7 @@ Priority levels:
         url=args.url,
         retry=args.retry,
         expire=args.expire,
+        client=client,
     )
 
     print(f"Notification sent: {args.title}")